@@ -0,0 +1,171 @@
+"""
+Benchmark de extração e transformação conforme o número de campos cresce.
+
+Compara o formato anterior (hp, ataque e defesa lidos com três varreduras de
+``stats``; tabela com 5 colunas preenchida elemento a elemento; análises
+sobre 3 estatísticas) com o atual (todas as estatísticas em uma passagem,
+altura, peso e espécie; tabela com 10 colunas; análises sobre 6 estatísticas
+e 2 medidas). Os payloads são os mesmos do fake_pokeapi.
+
+Tempos são o melhor entre as repetições; ``us/campo`` divide o custo por
+Pokémon pela quantidade de campos numéricos produzidos.
+
+Uso:
+    python benchmarks/bench_campos.py [--tamanhos 1300 10000] [--repeticoes 5] [--json saida.json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+
+import controllers.transformer as transformer_module
+from controllers.data_extractor import DataExtractor
+from controllers.transformer import DataTransformer
+from fake_pokeapi import gerar_pokemon
+from models.pokemon import Pokemon
+from models.pokemon_table import CATEGORIAS, COLUNAS, TIPOS, PokemonTable
+
+# Campos do formato anterior
+COLUNAS_LEGADO = ("id", "experiencia_base", "hp", "ataque", "defesa")
+STATS_LEGADO = ("ataque", "defesa", "hp")
+
+
+def extrair_legado(data: dict) -> dict:
+    """Decodificação anterior: uma varredura de ``stats`` por estatística."""
+    pokemon = Pokemon(
+        id=data['id'],
+        nome=data['name'],
+        experiencia_base=data['base_experience'],
+        tipos=[t['type']['name'] for t in data['types']],
+        hp=next(s['base_stat'] for s in data['stats'] if s['stat']['name'] == 'hp'),
+        ataque=next(s['base_stat'] for s in data['stats'] if s['stat']['name'] == 'attack'),
+        defesa=next(s['base_stat'] for s in data['stats'] if s['stat']['name'] == 'defense'),
+    )
+    return {
+        "id": pokemon.id,
+        "nome": pokemon.nome,
+        "experiencia_base": pokemon.experiencia_base,
+        "tipos": pokemon.tipos,
+        "hp": pokemon.hp,
+        "ataque": pokemon.ataque,
+        "defesa": pokemon.defesa,
+        "categoria": pokemon.categoria,
+    }
+
+
+def tabela_legado(registros: list) -> PokemonTable:
+    """Montagem anterior da tabela: atribuição elemento a elemento, 5 colunas."""
+    n = len(registros)
+    posicao_tipo = {tipo: i for i, tipo in enumerate(TIPOS)}
+    posicao_categoria = {categoria: i for i, categoria in enumerate(CATEGORIAS)}
+    colunas = {coluna: np.empty(n, dtype=np.int64) for coluna in COLUNAS_LEGADO}
+    tipos_bits = np.zeros(n, dtype=np.uint64)
+    categorias = np.empty(n, dtype=np.int8)
+    nomes = []
+    for i, registro in enumerate(registros):
+        for coluna in COLUNAS_LEGADO:
+            colunas[coluna][i] = registro[coluna]
+        nomes.append(registro["nome"])
+        bits = 0
+        for tipo in registro["tipos"]:
+            bits |= 1 << posicao_tipo[tipo]
+        tipos_bits[i] = bits
+        categorias[i] = posicao_categoria[registro["categoria"]]
+    return PokemonTable(colunas, nomes, tipos_bits, categorias)
+
+
+def analisar(transformer: DataTransformer, table: PokemonTable):
+    """As três reduções de ``DataTransformer.transform`` sobre uma tabela pronta."""
+    return (
+        transformer._analise_por_tipo(table),
+        transformer._top_experiencia(table),
+        transformer._estatisticas_gerais(table),
+    )
+
+
+def analisar_legado(transformer: DataTransformer, table: PokemonTable):
+    """As mesmas reduções restritas às estatísticas do formato anterior."""
+    with mock.patch.object(transformer_module, "STATS", STATS_LEGADO), \
+            mock.patch.object(transformer_module, "MEDIDAS", ()):
+        return analisar(transformer, table)
+
+
+def medir(func, repeticoes: int) -> float:
+    """Retorna o melhor tempo (ms) entre as repetições."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1300, 10000])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--json", help="Arquivo para gravar os resultados")
+    args = parser.parse_args()
+
+    # O extrator cria o cache em caminho relativo; só os métodos de
+    # decodificação são usados, então ele fica em um diretório temporário
+    with tempfile.TemporaryDirectory(prefix="bench_campos_") as diretorio:
+        cwd = os.getcwd()
+        os.chdir(diretorio)
+        try:
+            extractor = DataExtractor()
+            extractor.cache.close()
+        finally:
+            os.chdir(cwd)
+    transformer = DataTransformer()
+
+    def extrair(data: dict) -> dict:
+        return extractor._pokemon_to_dict(extractor._create_pokemon_object(data))
+
+    formatos = {
+        "legado": (extrair_legado, tabela_legado, analisar_legado, len(COLUNAS_LEGADO)),
+        "atual": (extrair, PokemonTable.from_records, analisar, len(COLUNAS)),
+    }
+
+    resultados = []
+    print(f"{'linhas':>7} {'formato':>8} {'campos':>7} {'extração (ms)':>14} {'us/campo':>9} "
+          f"{'tabela (ms)':>12} {'análise (ms)':>13} {'Pokémon/s':>11}")
+    for n in args.tamanhos:
+        payloads = [gerar_pokemon(i) for i in range(1, n + 1)]
+        for formato, (extrair_fn, tabela_fn, analisar_fn, campos) in formatos.items():
+            registros = [extrair_fn(data) for data in payloads]
+            table = tabela_fn(registros)
+
+            t_extracao = medir(lambda: [extrair_fn(data) for data in payloads], args.repeticoes)
+            t_tabela = medir(lambda: tabela_fn(registros), args.repeticoes)
+            t_analise = medir(lambda: analisar_fn(transformer, table), args.repeticoes)
+            total = t_extracao + t_tabela + t_analise
+            por_campo = t_extracao * 1000 / n / campos
+
+            resultados.append({
+                "linhas": n,
+                "formato": formato,
+                "campos": campos,
+                "extracao_ms": round(t_extracao, 3),
+                "us_por_campo": round(por_campo, 3),
+                "tabela_ms": round(t_tabela, 3),
+                "analise_ms": round(t_analise, 3),
+                "pokemon_por_s": round(n / total * 1000),
+            })
+            print(f"{n:>7} {formato:>8} {campos:>7} {t_extracao:>14.2f} {por_campo:>9.3f} "
+                  f"{t_tabela:>12.2f} {t_analise:>13.2f} {n / total * 1000:>11.0f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Mede o bloqueio do event loop durante a geração de relatórios.
+
+Compara a geração síncrona no event loop (comportamento original) com
+ReportGenerator.generate, que escreve os CSVs em thread e renderiza o
+gráfico em um processo separado. Um ticker agenda-se a cada intervalo e
+registra o atraso observado (lag).
+
+Uso:
+    python benchmarks/bench_event_loop.py [--repeticoes 3] [--json saida.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_transform import gerar_registros
+from controllers.reporter import ReportGenerator, _renderizar_grafico_tipos
+from controllers.transformer import DataTransformer
+
+INTERVALO = 0.005
+
+
+async def medir_lag(operacao) -> dict:
+    """Executa ``operacao`` enquanto um ticker mede o atraso do event loop."""
+    atrasos = []
+    parar = asyncio.Event()
+
+    async def ticker():
+        while not parar.is_set():
+            inicio = time.perf_counter()
+            await asyncio.sleep(INTERVALO)
+            atrasos.append(max(0.0, time.perf_counter() - inicio - INTERVALO))
+
+    tarefa = asyncio.create_task(ticker())
+    await asyncio.sleep(INTERVALO)
+    inicio = time.perf_counter()
+    await operacao()
+    duracao = time.perf_counter() - inicio
+    parar.set()
+    await tarefa
+
+    atrasos_ms = sorted(a * 1000 for a in atrasos)
+    return {
+        "duracao_ms": round(duracao * 1000, 2),
+        "lag_max_ms": round(atrasos_ms[-1], 2) if atrasos_ms else 0.0,
+        "lag_p99_ms": round(atrasos_ms[int(len(atrasos_ms) * 0.99) - 1], 2) if atrasos_ms else 0.0,
+        "lag_medio_ms": round(statistics.mean(atrasos_ms), 2) if atrasos_ms else 0.0,
+    }
+
+
+async def executar(repeticoes: int) -> dict:
+    analise = await DataTransformer().transform(gerar_registros(1000))
+    reporter = ReportGenerator()
+    reporter.output_dir = tempfile.mkdtemp(prefix="bench_relatorios_")
+
+    async def sincrono():
+        df_tipos = reporter._preparar_df_tipos(analise['tipos_analise'])
+        df_top = reporter._preparar_df_top(analise['top_experiencia'])
+        destino = tempfile.mkdtemp(dir=reporter.output_dir)
+        reporter._gerar_csv(df_tipos, df_top, destino)
+        opcoes = reporter.opcoes_grafico
+        _renderizar_grafico_tipos(df_tipos, os.path.join(destino, f"distribuicao_tipos.{opcoes.formato}"), opcoes)
+
+    async def offload():
+        # Diretório novo a cada execução para não reaproveitar artefatos
+        reporter.output_dir = tempfile.mkdtemp(prefix="bench_relatorios_")
+        await reporter.generate(analise)
+
+    # Aquece o pool de processos antes da medição
+    await offload()
+
+    resultados = {"sincrono": [], "offload": []}
+    for _ in range(repeticoes):
+        resultados["sincrono"].append(await medir_lag(sincrono))
+        resultados["offload"].append(await medir_lag(offload))
+    reporter.close()
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--json", help="Arquivo para gravar os resultados")
+    args = parser.parse_args()
+
+    resultados = asyncio.run(executar(args.repeticoes))
+
+    print(f"{'modo':>10} {'duracao (ms)':>13} {'lag max (ms)':>13} {'lag p99 (ms)':>13}")
+    for modo, medicoes in resultados.items():
+        for m in medicoes:
+            print(f"{modo:>10} {m['duracao_ms']:>13.1f} {m['lag_max_ms']:>13.1f} {m['lag_p99_ms']:>13.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
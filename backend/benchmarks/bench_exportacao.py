@@ -0,0 +1,135 @@
+"""
+Benchmark das exportações: tempo, tamanho do arquivo, pico de memória e leitura.
+
+Cada caso roda em um processo novo, exportando ``n`` Pokémon sintéticos
+gerados sob demanda por um extrator em memória (sem rede). O pico de
+memória é o crescimento do RSS máximo do processo durante a exportação,
+depois das importações. A linha ``pandas`` é a referência que materializa
+todos os registros em um DataFrame antes de gravar um CSV gzip.
+
+A leitura mede 100 linhas do meio do arquivo com ``DataExporter.read``
+(Arrow mapeado em memória, grupos do Parquet, CSV em stream); na linha
+``pandas`` o arquivo inteiro é lido com ``read_csv``.
+
+Uso:
+    python benchmarks/bench_exportacao.py [--tamanhos 1300 20000] [--formatos parquet arrow csv.gz]
+        [--tamanho-grupo 500] [--json saida.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_transform import gerar_registros
+from controllers.exporter import DataExporter
+
+# Registros gerados por vez pelo extrator sintético
+_BLOCO = 1000
+
+
+class ExtratorSintetico:
+    """Extrator com ``extract_stream`` que gera os registros sob demanda."""
+
+    async def extract_stream(self, limit: int = 100, offset: int = 0, erros=None, progress_callback=None, ordenado=False):
+        for inicio in range(offset, offset + limit, _BLOCO):
+            for registro in gerar_registros(min(_BLOCO, offset + limit - inicio), seed=inicio):
+                registro["id"] += inicio
+                yield registro
+            await asyncio.sleep(0)
+
+
+def _rss_maximo_mb() -> float:
+    """RSS máximo do processo (ru_maxrss é em KB no Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def _exportar_pandas(extractor: ExtratorSintetico, n: int, destino: str) -> str:
+    """Referência: todos os registros em memória e um único ``to_csv``."""
+    import pandas as pd
+
+    registros = [registro async for registro in extractor.extract_stream(n)]
+    path = os.path.join(destino, "pokemon.csv.gz")
+    pd.DataFrame(registros).to_csv(path, index=False, compression="gzip")
+    return path
+
+
+def executar_caso(formato: str, n: int, tamanho_grupo: int) -> dict:
+    """Exporta e lê um arquivo no processo atual."""
+    import pandas as pd
+
+    with tempfile.TemporaryDirectory(prefix="bench_exportacao_") as diretorio:
+        extractor = ExtratorSintetico()
+        exporter = DataExporter(extractor, output_dir=diretorio, tamanho_grupo=tamanho_grupo)
+        # Importações e primeira gravação fora da medição
+        asyncio.run(exporter.export(10, formato=formato if formato != "pandas" else "csv.gz"))
+
+        rss_inicial = _rss_maximo_mb()
+        inicio = time.perf_counter()
+        if formato == "pandas":
+            path = asyncio.run(_exportar_pandas(extractor, n, diretorio))
+        else:
+            path = asyncio.run(exporter.export(n, formato=formato))["arquivos"]["pokemon"]
+        exportacao = time.perf_counter() - inicio
+        pico = _rss_maximo_mb() - rss_inicial
+
+        inicio = time.perf_counter()
+        if formato == "pandas":
+            linhas = pd.read_csv(path).iloc[n // 2:n // 2 + 100].to_dict(orient="records")
+        else:
+            linhas = exporter.read(path, offset=n // 2, limite=100)["data"]
+        leitura = time.perf_counter() - inicio
+        assert len(linhas) == min(100, n - n // 2)
+
+        return {
+            "formato": formato,
+            "linhas": n,
+            "exportacao_ms": round(exportacao * 1000, 1),
+            "pico_mb": round(pico, 1),
+            "arquivo_kb": round(os.path.getsize(path) / 1024, 1),
+            "leitura_ms": round(leitura * 1000, 2),
+        }
+
+
+def main():
+    disponiveis = DataExporter(None).formatos_disponiveis
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1300, 20000])
+    parser.add_argument("--formatos", nargs="+", default=[*disponiveis, "pandas"])
+    parser.add_argument("--tamanho-grupo", type=int, default=500)
+    parser.add_argument("--json", help="Arquivo para gravar os resultados")
+    parser.add_argument("--caso", nargs=2, metavar=("FORMATO", "LINHAS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.caso:
+        print(json.dumps(executar_caso(args.caso[0], int(args.caso[1]), args.tamanho_grupo)))
+        return
+
+    resultados = []
+    print(f"{'linhas':>7} {'formato':>8} {'exportação (ms)':>16} {'pico (MB)':>10} "
+          f"{'arquivo (KB)':>13} {'leitura (ms)':>13}")
+    for n in args.tamanhos:
+        for formato in args.formatos:
+            # Processo novo por caso: o RSS máximo não é compartilhado entre casos
+            saida = subprocess.run(
+                [sys.executable, __file__, "--caso", formato, str(n), "--tamanho-grupo", str(args.tamanho_grupo)],
+                capture_output=True, text=True, check=True,
+            )
+            r = json.loads(saida.stdout.strip().splitlines()[-1])
+            resultados.append(r)
+            print(f"{n:>7} {formato:>8} {r['exportacao_ms']:>16.1f} {r['pico_mb']:>10.1f} "
+                  f"{r['arquivo_kb']:>13.1f} {r['leitura_ms']:>13.2f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
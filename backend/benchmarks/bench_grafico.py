@@ -0,0 +1,140 @@
+"""
+Benchmark da renderização do gráfico de tipos por formato e resolução.
+
+Caminhos medidos para cada combinação de formato e dpi:
+
+- ``novo``: figura montada do zero a cada chamada (modelo descartado antes);
+- ``modelo``: figura reaproveitada, trocando só a altura das barras entre
+  duas análises diferentes;
+- ``cache``: médias por tipo já renderizadas; o gráfico é apenas vinculado
+  a partir de ``relatorios/graficos/``.
+
+A linha ``anterior`` reproduz a renderização com pyplot a 300 dpi usada
+antes das opções de gráfico. Tempos são o melhor entre as repetições.
+
+Uso:
+    python benchmarks/bench_grafico.py [--formatos png svg webp] [--dpis 100 150 300] [--repeticoes 5] [--json saida.json]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np
+
+import controllers.reporter as reporter_module
+from bench_transform import gerar_registros
+from controllers.reporter import FORMATOS_GRAFICO, OpcoesGrafico, ReportGenerator
+from controllers.transformer import DataTransformer
+
+
+def renderizar_anterior(df_tipos, grafico_path: str):
+    """Renderização anterior: pyplot, figura nova, legenda em ``best`` e 300 dpi."""
+    import matplotlib.pyplot as plt
+
+    df = df_tipos.T
+    fig, ax = plt.subplots(figsize=(15, 8))
+    x = np.arange(len(df.index))
+    series = [(stat, rotulo) for stat, rotulo in reporter_module._SERIES_GRAFICO if stat in df.columns]
+    width = 0.8 / len(series)
+    for i, (stat, rotulo) in enumerate(series):
+        ax.bar(x + (i - (len(series) - 1) / 2) * width, df[stat], width, label=rotulo)
+    ax.set_title('Média de Estatísticas por Tipo de Pokémon', fontsize=16, pad=20)
+    ax.set_ylabel('Valor Médio', fontsize=12, labelpad=10)
+    ax.set_xlabel('Tipos de Pokémon', fontsize=12, labelpad=10)
+    ax.set_xticks(x)
+    ax.set_xticklabels(df.index.values, rotation=45, ha="right")
+    ax.legend()
+    ax.grid(True, axis='y', linestyle='--', alpha=0.6)
+    plt.tight_layout()
+    plt.savefig(grafico_path, dpi=300, format='png')
+    plt.close(fig)
+
+
+def medir(func, repeticoes: int) -> float:
+    """Retorna o melhor tempo (ms) entre as repetições."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--formatos", nargs="+", choices=FORMATOS_GRAFICO, default=list(FORMATOS_GRAFICO))
+    parser.add_argument("--dpis", type=int, nargs="+", default=[100, 150, 300])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--json", help="Arquivo para gravar os resultados")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_grafico_") as diretorio:
+        # O gerador cria ``relatorios/`` (e o cache de gráficos) no diretório atual
+        cwd = os.getcwd()
+        os.chdir(diretorio)
+        try:
+            reporter = ReportGenerator()
+        finally:
+            os.chdir(cwd)
+        reporter.output_dir = diretorio
+
+        # Duas análises com os mesmos tipos e médias diferentes
+        transformer = DataTransformer()
+        registros = gerar_registros(1000)
+        dfs = [
+            reporter._preparar_df_tipos(asyncio.run(transformer.transform(amostra))["tipos_analise"])
+            for amostra in (registros[:500], registros[500:])
+        ]
+        resultados = []
+
+        def registrar(formato: str, dpi: int, caminho: str, tempo: float, arquivo: str):
+            tamanho = os.path.getsize(arquivo)
+            resultados.append({
+                "formato": formato, "dpi": dpi, "caminho": caminho,
+                "tempo_ms": round(tempo, 3), "tamanho_kb": round(tamanho / 1024, 1),
+            })
+            print(f"{formato:>8} {dpi:>5} {caminho:>9} {tempo:>11.2f} {tamanho / 1024:>13.1f}")
+
+        print(f"{'formato':>8} {'dpi':>5} {'caminho':>9} {'tempo (ms)':>11} {'tamanho (KB)':>13}")
+        arquivo = os.path.join(diretorio, "anterior.png")
+        registrar("png", 300, "anterior", medir(lambda: renderizar_anterior(dfs[0], arquivo), args.repeticoes), arquivo)
+
+        for formato in args.formatos:
+            for dpi in args.dpis:
+                opcoes = OpcoesGrafico(dpi=dpi, formato=formato)
+                arquivo = os.path.join(diretorio, f"grafico.{formato}")
+
+                def novo():
+                    reporter_module._modelo_grafico = None
+                    reporter_module._renderizar_grafico_tipos(dfs[0], arquivo, opcoes)
+
+                alternar = itertools.count()
+
+                def modelo():
+                    reporter_module._renderizar_grafico_tipos(dfs[next(alternar) % 2], arquivo, opcoes)
+
+                def cache():
+                    destino = tempfile.mkdtemp(dir=diretorio)
+                    asyncio.run(reporter._obter_grafico(dfs[0], os.path.join(destino, f"grafico.{formato}"), opcoes))
+
+                registrar(formato, dpi, "novo", medir(novo, args.repeticoes), arquivo)
+                modelo()
+                registrar(formato, dpi, "modelo", medir(modelo, args.repeticoes), arquivo)
+                cache()
+                registrar(formato, dpi, "cache", medir(cache, args.repeticoes), arquivo)
+        reporter.close()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark de gerar_analises_em_lote: análises em série x BatchAnalyzer.
+
+O caminho em série repete o que várias chamadas de gerar_analise fazem:
+extrai a janela de cada especificação, filtra os registros e chama
+``DataTransformer.transform``. O lote une as janelas, extrai cada Pokémon uma
+vez e calcula todas as análises com ``transform_many``. A extração usa um
+extrator em memória (sem rede), que conta os Pokémon entregues; cada análise
+do lote é conferida contra a do caminho em série antes de medir.
+
+Uso:
+    python benchmarks/bench_lote.py [--tamanho 1302] [--repeticoes 5] [--json saida.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_query import varredura
+from bench_transform import gerar_registros
+from controllers.batch_analysis import BatchAnalyzer
+from controllers.transformer import DataTransformer
+
+# Uma análise por geração, mais recortes filtrados sobre as mesmas janelas
+GERACOES = [(151, 0), (100, 151), (135, 251), (107, 386), (156, 493), (72, 649), (88, 721), (96, 809)]
+ESPECIFICACOES = [
+    *({"nome": f"gen{i}", "limit": limit, "offset": offset} for i, (limit, offset) in enumerate(GERACOES, start=1)),
+    {"nome": "fogo_gen1", "limit": 151, "tipos": ["fire"]},
+    {"nome": "fortes_gen1_gen3", "limit": 386, "categorias": ["Forte"]},
+    {"nome": "rapidos", "limit": 1000, "minimos": {"velocidade": 100}},
+    {"nome": "agua_voador", "limit": 1000, "tipos": ["water", "flying"], "todos_os_tipos": True},
+]
+
+
+class ExtratorLocal:
+    """Extrator em memória com a interface usada pelo BatchAnalyzer."""
+
+    def __init__(self, registros: list):
+        self.registros = registros
+        self.entregues = 0
+
+    async def extract(self, limit: int = 100, offset: int = 0) -> dict:
+        data = self.registros[offset:offset + limit]
+        self.entregues += len(data)
+        return {"status": "success", "total": len(data), "limit": limit, "offset": offset, "data": data}
+
+    async def window_ids(self, limit: int, offset: int = 0) -> list:
+        return [registro["id"] for registro in self.registros[offset:offset + limit]]
+
+
+async def em_serie(extractor: ExtratorLocal, transformer: DataTransformer, especificacoes: list) -> list:
+    """Uma extração e uma transformação por especificação."""
+    analises = []
+    for especificacao in especificacoes:
+        extracao = await extractor.extract(especificacao["limit"], especificacao["offset"])
+        filtros = {k: especificacao[k] for k in ("tipos", "todos_os_tipos", "categorias", "minimos", "maximos")}
+        analises.append(await transformer.transform(varredura(extracao["data"], **filtros)))
+    return analises
+
+
+def medir(func, repeticoes: int) -> float:
+    """Retorna o melhor tempo (ms) entre as repetições."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanho", type=int, default=1302)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--json", help="Arquivo para gravar os resultados")
+    args = parser.parse_args()
+
+    registros = gerar_registros(args.tamanho)
+    transformer = DataTransformer()
+    serie = ExtratorLocal(registros)
+    lote = ExtratorLocal(registros)
+    analyzer = BatchAnalyzer(lote, transformer)
+    especificacoes = analyzer.normalizar(ESPECIFICACOES)
+
+    # Confere cada análise do lote contra o caminho em série
+    esperado = asyncio.run(em_serie(serie, transformer, especificacoes))
+    obtido = asyncio.run(analyzer.analyze(especificacoes))
+    for resultado, analise in zip(obtido["resultados"], esperado):
+        assert resultado["analise"] == analise, f"Resultado divergente em {resultado['nome']}"
+
+    serie.entregues = lote.entregues = 0
+    t_serie = medir(lambda: asyncio.run(em_serie(serie, transformer, especificacoes)), args.repeticoes)
+    t_lote = medir(lambda: asyncio.run(analyzer.analyze(especificacoes)), args.repeticoes)
+
+    resultado = {
+        "especificacoes": len(especificacoes),
+        "pokemon_serie": serie.entregues // args.repeticoes,
+        "pokemon_lote": lote.entregues // args.repeticoes,
+        "serie_ms": round(t_serie, 3),
+        "lote_ms": round(t_lote, 3),
+    }
+    print(f"{'caminho':>8} {'Pokémon extraídos':>18} {'tempo (ms)':>11}")
+    print(f"{'série':>8} {resultado['pokemon_serie']:>18} {t_serie:>11.2f}")
+    print(f"{'lote':>8} {resultado['pokemon_lote']:>18} {t_lote:>11.2f}")
+    print(f"{len(especificacoes)} análises; speedup {t_serie / t_lote:.1f}x")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(resultado, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark de consultar_pokemon: PokemonQueryIndex x varredura linear dos registros.
+
+Cada consulta é conferida contra a varredura antes de medir. Os tempos são
+a mediana por consulta, em microssegundos; o tamanho padrão corresponde à
+Pokédex nacional completa.
+
+Uso:
+    python benchmarks/bench_query.py [--tamanhos 1300 10000] [--repeticoes 500] [--json saida.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_transform import gerar_registros
+from models.pokemon_query import PokemonQueryIndex
+from models.pokemon_table import PokemonTable
+
+CONSULTAS = {
+    "fogo_ataque_top10": dict(tipos=["fire"], minimos={"ataque": 101}, ordenar_por="ataque", limite=10),
+    "top10_hp": dict(ordenar_por="hp", limite=10),
+    "fogo_e_voador": dict(tipos=["fire", "flying"], todos_os_tipos=True),
+    "forte_faixa_defesa": dict(categorias=["Forte"], minimos={"defesa": 80}, maximos={"defesa": 120}, limite=50),
+}
+
+
+def varredura(registros: list, tipos=None, todos_os_tipos=False, categorias=None,
+              minimos=None, maximos=None, ordenar_por=None, decrescente=True, limite=None) -> list:
+    """Filtra, ordena e corta os registros em Python puro (referência)."""
+    minimos = minimos or {}
+    maximos = maximos or {}
+    combinar = all if todos_os_tipos else any
+
+    def aceita(registro: dict) -> bool:
+        if tipos and not combinar(tipo in registro["tipos"] for tipo in tipos):
+            return False
+        if categorias and registro["categoria"] not in categorias:
+            return False
+        return all(registro[c] >= v for c, v in minimos.items()) and all(registro[c] <= v for c, v in maximos.items())
+
+    selecionados = [registro for registro in registros if aceita(registro)]
+    if ordenar_por:
+        sinal = -1 if decrescente else 1
+        selecionados.sort(key=lambda registro: (sinal * registro[ordenar_por], registro["id"]))
+    return selecionados[:limite]
+
+
+def mediana_us(func, repeticoes: int) -> float:
+    """Mediana do tempo de uma chamada, em microssegundos."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1300, 10000])
+    parser.add_argument("--repeticoes", type=int, default=500)
+    parser.add_argument("--json", help="Arquivo para gravar os resultados")
+    args = parser.parse_args()
+
+    resultados = []
+    print(f"{'linhas':>7} {'consulta':>20} {'índice (us)':>12} {'+registros (us)':>16} {'varredura (us)':>15}")
+    for n in args.tamanhos:
+        registros = gerar_registros(n)
+        inicio = time.perf_counter()
+        index = PokemonQueryIndex(PokemonTable.from_records(registros))
+        montagem_ms = (time.perf_counter() - inicio) * 1000
+        print(f"{n:>7} {'(montagem)':>20} {montagem_ms * 1000:>12.0f}")
+
+        for nome, filtros in CONSULTAS.items():
+            # Confere o índice contra a varredura antes de medir
+            posicoes, _ = index.query(**filtros)
+            esperado = [registro["id"] for registro in varredura(registros, **filtros)]
+            assert index.table["id"][posicoes].tolist() == esperado, f"Resultado divergente em {nome}"
+
+            t_indice = mediana_us(lambda: index.query(**filtros), args.repeticoes)
+            t_registros = mediana_us(lambda: index.table.to_records(index.query(**filtros)[0]), args.repeticoes)
+            t_varredura = mediana_us(lambda: varredura(registros, **filtros), max(1, args.repeticoes // 10))
+
+            resultados.append({
+                "linhas": n,
+                "consulta": nome,
+                "montagem_ms": round(montagem_ms, 3),
+                "indice_us": round(t_indice, 1),
+                "registros_us": round(t_registros, 1),
+                "varredura_us": round(t_varredura, 1),
+            })
+            print(f"{n:>7} {nome:>20} {t_indice:>12.1f} {t_registros:>16.1f} {t_varredura:>15.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Mede o tempo de inicialização do servidor (importação de server.py).
+
+Executa ``python -X importtime -c "import server"`` em processos novos,
+soma o tempo cumulativo dos módulos de primeiro nível e lista os módulos
+mais caros. Também verifica quais dependências pesadas (numpy, pandas,
+matplotlib, pyarrow) foram de fato executadas na importação: elas devem carregar
+apenas no primeiro uso.
+
+Com --comparar, falha (código de saída 1) se o tempo mediano piorar além
+da tolerância em relação à referência ou se alguma dependência pesada
+voltar a ser carregada na importação. A referência do repositório fica em
+benchmarks/baseline_startup.json e é atualizada com --json.
+
+Uso:
+    python benchmarks/bench_startup.py [--repeticoes 5] [--modulo server]
+        [--json saida.json] [--comparar benchmarks/baseline_startup.json] [--tolerancia 0.25]
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.abspath(os.path.join(BENCH_DIR, "..", "src"))
+
+PESADOS = ("numpy", "pandas", "matplotlib", "pyarrow")
+
+_LINHA = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+# Executado no processo medido: importa o módulo e informa quais dependências
+# pesadas foram realmente executadas (módulos de lazy_import ainda pendentes
+# aparecem em sys.modules como _LazyModule)
+_SCRIPT = """
+import json, sys
+sys.path.insert(0, {src!r})
+import {modulo}
+carregados = [
+    nome for nome in {pesados!r}
+    if nome in sys.modules and type(sys.modules[nome]).__name__ != "_LazyModule"
+]
+print(json.dumps(carregados))
+"""
+
+
+def medir_uma_vez(modulo: str) -> dict:
+    """Importa ``modulo`` em um processo novo e retorna os tempos (ms)."""
+    script = _SCRIPT.format(src=SRC_DIR, modulo=modulo, pesados=PESADOS)
+    # server.py cria cache/ e relatorios/ no diretório atual ao ser importado
+    with tempfile.TemporaryDirectory(prefix="bench_startup_") as cwd:
+        processo = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", script],
+            capture_output=True, text=True, check=True, cwd=cwd,
+        )
+
+    total_us = 0
+    modulos = {}
+    for linha in processo.stderr.splitlines():
+        m = _LINHA.match(linha)
+        if not m:
+            continue
+        cumulativo, indentacao, nome = int(m.group(2)), len(m.group(3)), m.group(4)
+        # Módulos de primeiro nível (sem indentação extra) somam o total
+        if indentacao == 1:
+            total_us += cumulativo
+        modulos[nome] = max(modulos.get(nome, 0), cumulativo)
+
+    return {
+        "total_ms": total_us / 1000,
+        "modulos_ms": {nome: us / 1000 for nome, us in modulos.items()},
+        "pesados_carregados": json.loads(processo.stdout.strip().splitlines()[-1]),
+    }
+
+
+def medir(modulo: str, repeticoes: int, top: int) -> dict:
+    execucoes = [medir_uma_vez(modulo) for _ in range(repeticoes)]
+    totais = [e["total_ms"] for e in execucoes]
+
+    # Mediana por módulo entre as execuções
+    nomes = set().union(*(e["modulos_ms"] for e in execucoes))
+    medianas = {
+        nome: statistics.median(e["modulos_ms"].get(nome, 0.0) for e in execucoes)
+        for nome in nomes
+    }
+    mais_caros = sorted(medianas.items(), key=lambda item: item[1], reverse=True)
+    # Só módulos de primeiro nível de pacote, para a lista não repetir submódulos
+    mais_caros = [(nome, ms) for nome, ms in mais_caros if "." not in nome][:top]
+
+    return {
+        "modulo": modulo,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "repeticoes": repeticoes,
+        "total_mediana_ms": round(statistics.median(totais), 1),
+        "total_min_ms": round(min(totais), 1),
+        "total_max_ms": round(max(totais), 1),
+        "pesados_carregados": execucoes[-1]["pesados_carregados"],
+        "mais_caros_ms": {nome: round(ms, 1) for nome, ms in mais_caros},
+    }
+
+
+def comparar(atual: dict, referencia: dict, tolerancia: float) -> list:
+    """Retorna as regressões encontradas em relação à referência."""
+    problemas = []
+    novos = sorted(set(atual["pesados_carregados"]) - set(referencia["pesados_carregados"]))
+    if novos:
+        problemas.append(f"dependências pesadas carregadas na importação: {', '.join(novos)}")
+
+    limite = referencia["total_mediana_ms"] * (1 + tolerancia)
+    if atual["total_mediana_ms"] > limite:
+        problemas.append(
+            f"importação levou {atual['total_mediana_ms']:.0f} ms "
+            f"(referência {referencia['total_mediana_ms']:.0f} ms, limite {limite:.0f} ms)"
+        )
+    return problemas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modulo", default="server")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Quantidade de módulos mais caros listados")
+    parser.add_argument("--json", help="Arquivo para gravar os resultados")
+    parser.add_argument("--comparar", help="Resultados de referência (JSON)")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Piora relativa aceita no tempo total")
+    args = parser.parse_args()
+
+    resultado = medir(args.modulo, args.repeticoes, args.top)
+
+    print(f"import {args.modulo}: mediana {resultado['total_mediana_ms']:.0f} ms "
+          f"(min {resultado['total_min_ms']:.0f}, max {resultado['total_max_ms']:.0f})")
+    print(f"dependências pesadas carregadas: {', '.join(resultado['pesados_carregados']) or 'nenhuma'}")
+    print(f"\n{'módulo':>30} {'cumulativo (ms)':>16}")
+    for nome, ms in resultado["mais_caros_ms"].items():
+        print(f"{nome:>30} {ms:>16.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(resultado, f, indent=2)
+            f.write("\n")
+
+    if args.comparar:
+        with open(args.comparar) as f:
+            problemas = comparar(resultado, json.load(f), args.tolerancia)
+        for problema in problemas:
+            print(f"REGRESSÃO: {problema}")
+        if problemas:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
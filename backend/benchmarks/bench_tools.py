@@ -0,0 +1,341 @@
+"""
+Benchmark de ponta a ponta das ferramentas MCP contra uma PokeAPI local.
+
+Sobe benchmarks/fake_pokeapi.py em um processo separado, aponta o extrator
+do server.py para ele e chama as ferramentas extrair_dados_pokemon,
+gerar_analise e gerar_relatorio_csv em rodadas de chamadas simultâneas.
+
+Cenários:
+    frio      caches (persistente, memória, análises e relatórios) zerados
+              antes de cada rodada
+    quente    as mesmas chamadas executadas uma vez antes da medição
+    expirado  cache aquecido com TTL curto e medido depois da expiração
+              (com stale-while-revalidate, conforme a configuração do servidor)
+
+Para cada ferramenta, cenário e nível de concorrência são registrados vazão,
+latência p50/p95/p99, RSS de pico do processo, atraso do event loop e
+requisições feitas à API. O RSS de pico é o máximo desde o início do
+processo, portanto só cresce ao longo da execução.
+
+Uso:
+    python benchmarks/bench_tools.py [--ferramentas ...] [--cenarios frio quente expirado]
+        [--concorrencia 1 8 32] [--rodadas 3] [--limite 100]
+        [--tamanho 1300] [--latencia-ms 20] [--taxa-erro 0.0]
+        [--json saida.json] [--comparar anterior.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import aiohttp
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, "..", "src")
+sys.path.insert(0, SRC_DIR)
+
+from bench_event_loop import medir_lag
+
+FERRAMENTAS = ["extrair_dados_pokemon", "gerar_analise", "gerar_relatorio_csv"]
+CENARIOS = ["frio", "quente", "expirado"]
+
+
+def _porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _commit_atual() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _rss_pico_mb() -> float:
+    """RSS de pico do processo e dos filhos (pool de renderização), em MB."""
+    proprio = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    filhos = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(max(proprio, filhos) / divisor, 1)
+
+
+def _percentil(valores: list, p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, round(p / 100 * len(ordenados)) - 1))
+    return round(ordenados[indice], 2)
+
+
+class PokeAPILocal:
+    """Processo com a PokeAPI falsa, iniciado e encerrado pelo benchmark."""
+
+    def __init__(self, tamanho: int, latencia_ms: float, taxa_erro: float, seed: int):
+        self.porta = _porta_livre()
+        self.url = f"http://127.0.0.1:{self.porta}"
+        self._args = [
+            sys.executable, os.path.join(BENCH_DIR, "fake_pokeapi.py"),
+            "--porta", str(self.porta),
+            "--tamanho", str(tamanho),
+            "--latencia-ms", str(latencia_ms),
+            "--taxa-erro", str(taxa_erro),
+            "--seed", str(seed),
+        ]
+        self._processo = None
+
+    async def iniciar(self):
+        self._processo = subprocess.Popen(self._args)
+        async with aiohttp.ClientSession() as session:
+            for _ in range(100):
+                try:
+                    async with session.get(f"{self.url}/_stats"):
+                        return
+                except aiohttp.ClientConnectionError:
+                    await asyncio.sleep(0.05)
+        raise RuntimeError("PokeAPI local não respondeu")
+
+    async def requisicoes(self) -> dict:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{self.url}/_stats") as response:
+                return await response.json()
+
+    def encerrar(self):
+        if self._processo is not None:
+            self._processo.terminate()
+            self._processo.wait()
+
+
+class Bancada:
+    """Controla o estado do server.py entre as rodadas do benchmark."""
+
+    def __init__(self, server, api: PokeAPILocal, diretorio: str):
+        self.server = server
+        self.api = api
+        self.diretorio = diretorio
+        self._rodada = 0
+        self._ttl_original = server.extractor.cache_expiry
+        server.extractor.base_url = f"{api.url}/api/v2"
+
+    def resetar_caches(self, ttl: timedelta = None):
+        """Troca todos os caches por instâncias vazias em um diretório novo."""
+        from controllers.cache_backend import SQLiteCacheBackend, create_cache_backend
+
+        ttl = ttl or self._ttl_original
+        extractor = self.server.extractor
+        self._rodada += 1
+        destino = os.path.join(self.diretorio, f"rodada_{self._rodada}")
+
+        tipo = "sqlite" if isinstance(extractor.cache, SQLiteCacheBackend) else "json"
+        extractor.cache.close()
+        extractor.cache_expiry = ttl
+        extractor.cache = create_cache_backend(tipo, destino, ttl.total_seconds())
+        extractor.memory_cache.ttl = ttl.total_seconds()
+        extractor.memory_cache.clear()
+        extractor._index = None
+        extractor._index_expires_at = 0.0
+
+        self.server.analysis_cache._cache.clear()
+        self.server.reporter.output_dir = os.path.join(destino, "relatorios")
+        os.makedirs(self.server.reporter.output_dir, exist_ok=True)
+
+    async def chamar(self, ferramenta: str, limite: int) -> tuple:
+        """Chama uma ferramenta e retorna (latência em ms, se houve erro)."""
+        inicio = time.perf_counter()
+        try:
+            conteudos = await getattr(self.server, ferramenta)(limit=limite)
+            erro = json.loads(conteudos[0].text).get("status") == "error"
+        except Exception:
+            erro = True
+        return (time.perf_counter() - inicio) * 1000, erro
+
+    async def rodada(self, ferramenta: str, limites: list) -> list:
+        return await asyncio.gather(*(self.chamar(ferramenta, limite) for limite in limites))
+
+
+async def medir(bancada: Bancada, ferramenta: str, cenario: str, concorrencia: int, args) -> dict:
+    """Executa as rodadas de um cenário e consolida as medições."""
+    # Limites distintos por chamada para não medir apenas a coalescência
+    limites = [args.limite + i for i in range(concorrencia)]
+    latencias, erros, duracao, lags = [], 0, 0.0, []
+    ttl_curto = timedelta(seconds=args.ttl_expiracao)
+
+    if cenario == "quente":
+        bancada.resetar_caches()
+        await bancada.rodada(ferramenta, limites)
+
+    requisicoes_api = {}
+    for _ in range(args.rodadas):
+        if cenario == "frio":
+            bancada.resetar_caches()
+        elif cenario == "expirado":
+            bancada.resetar_caches(ttl_curto)
+            await bancada.rodada(ferramenta, limites)
+            await asyncio.sleep(args.ttl_expiracao + 0.2)
+            bancada.server.analysis_cache._cache.clear()
+
+        resultado = {}
+
+        async def operacao():
+            resultado["chamadas"] = await bancada.rodada(ferramenta, limites)
+
+        antes = await bancada.api.requisicoes()
+        lag = await medir_lag(operacao)
+        # Dá tempo para revalidações em segundo plano entrarem na contagem
+        await asyncio.sleep(0.1)
+        depois = await bancada.api.requisicoes()
+        for k, v in depois.items():
+            requisicoes_api[k] = requisicoes_api.get(k, 0) + v - antes.get(k, 0)
+
+        duracao += lag["duracao_ms"] / 1000
+        lags.append(lag)
+        for latencia, erro in resultado["chamadas"]:
+            latencias.append(latencia)
+            erros += erro
+
+    return {
+        "ferramenta": ferramenta,
+        "cenario": cenario,
+        "concorrencia": concorrencia,
+        "chamadas": len(latencias),
+        "erros": erros,
+        "vazao_rps": round(len(latencias) / duracao, 2) if duracao else 0.0,
+        "p50_ms": _percentil(latencias, 50),
+        "p95_ms": _percentil(latencias, 95),
+        "p99_ms": _percentil(latencias, 99),
+        "media_ms": round(statistics.mean(latencias), 2) if latencias else 0.0,
+        "rss_pico_mb": _rss_pico_mb(),
+        "lag_max_ms": max(l["lag_max_ms"] for l in lags),
+        "lag_p99_ms": max(l["lag_p99_ms"] for l in lags),
+        "requisicoes_api": requisicoes_api,
+    }
+
+
+async def executar(args) -> dict:
+    diretorio = tempfile.mkdtemp(prefix="bench_tools_")
+    api = PokeAPILocal(args.tamanho, args.latencia_ms, args.taxa_erro, args.seed)
+    await api.iniciar()
+
+    # server.py usa caminhos relativos (cache/, relatorios/) no import
+    cwd = os.getcwd()
+    os.chdir(diretorio)
+    try:
+        import server
+
+        bancada = Bancada(server, api, diretorio)
+        resultados = []
+        for ferramenta in args.ferramentas:
+            for cenario in args.cenarios:
+                for concorrencia in args.concorrencia:
+                    medicao = await medir(bancada, ferramenta, cenario, concorrencia, args)
+                    resultados.append(medicao)
+                    _imprimir_linha(medicao)
+
+        await server.extractor.close()
+        server.reporter.close()
+    finally:
+        os.chdir(cwd)
+        api.encerrar()
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+    return {
+        "metadados": {
+            "commit": _commit_atual(),
+            "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "parametros": {
+                "tamanho": args.tamanho,
+                "latencia_ms": args.latencia_ms,
+                "taxa_erro": args.taxa_erro,
+                "limite": args.limite,
+                "rodadas": args.rodadas,
+                "ttl_expiracao": args.ttl_expiracao,
+                "seed": args.seed,
+            },
+        },
+        "resultados": resultados,
+    }
+
+
+def _imprimir_cabecalho():
+    print(f"{'ferramenta':>22} {'cenario':>9} {'conc':>5} {'rps':>8} {'p50':>9} {'p95':>9} "
+          f"{'p99':>9} {'rss MB':>7} {'lag max':>8} {'erros':>6}")
+
+
+def _imprimir_linha(m: dict):
+    print(f"{m['ferramenta']:>22} {m['cenario']:>9} {m['concorrencia']:>5} {m['vazao_rps']:>8.1f} "
+          f"{m['p50_ms']:>9.1f} {m['p95_ms']:>9.1f} {m['p99_ms']:>9.1f} {m['rss_pico_mb']:>7.1f} "
+          f"{m['lag_max_ms']:>8.1f} {m['erros']:>6}")
+
+
+def comparar(atual: dict, anterior: dict):
+    """Imprime a variação de vazão e latência em relação a uma execução anterior."""
+    def chave(m):
+        return (m["ferramenta"], m["cenario"], m["concorrencia"])
+
+    base = {chave(m): m for m in anterior["resultados"]}
+    print(f"\nComparação com {anterior['metadados'].get('commit') or 'execução anterior'}:")
+    print(f"{'ferramenta':>22} {'cenario':>9} {'conc':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for m in atual["resultados"]:
+        b = base.get(chave(m))
+        if b is None:
+            continue
+
+        def razao(campo):
+            return m[campo] / b[campo] if b[campo] else float("nan")
+
+        print(f"{m['ferramenta']:>22} {m['cenario']:>9} {m['concorrencia']:>5} "
+              f"{razao('vazao_rps'):>7.2f}x {razao('p50_ms'):>7.2f}x {razao('p95_ms'):>7.2f}x {razao('p99_ms'):>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ferramentas", nargs="+", choices=FERRAMENTAS, default=FERRAMENTAS)
+    parser.add_argument("--cenarios", nargs="+", choices=CENARIOS, default=CENARIOS)
+    parser.add_argument("--concorrencia", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--rodadas", type=int, default=3)
+    parser.add_argument("--limite", type=int, default=100, help="limit da primeira chamada de cada rodada")
+    parser.add_argument("--tamanho", type=int, default=1300, help="Pokémon na PokeAPI local")
+    parser.add_argument("--latencia-ms", type=float, default=20.0)
+    parser.add_argument("--taxa-erro", type=float, default=0.0)
+    parser.add_argument("--ttl-expiracao", type=float, default=1.0, help="TTL (s) do cenário expirado")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Arquivo para gravar os resultados")
+    parser.add_argument("--comparar", help="Resultados anteriores (JSON) para comparação")
+    parser.add_argument("--verbose", action="store_true", help="Mantém os logs do servidor")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    _imprimir_cabecalho()
+    resultados = asyncio.run(executar(args))
+
+    if args.comparar:
+        with open(args.comparar) as f:
+            comparar(resultados, json.load(f))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
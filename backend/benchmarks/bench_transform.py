@@ -0,0 +1,134 @@
+"""
+Benchmark do DataTransformer: caminho pandas original x PokemonTable.
+
+Uso:
+    python benchmarks/bench_transform.py [--tamanhos 1000 10000 100000] [--repeticoes 5] [--json saida.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+
+from controllers.aggregates import MEDIDAS, STATS
+from controllers.transformer import DataTransformer
+from models.pokemon import Pokemon
+from models.pokemon_table import TIPOS, PokemonTable
+
+
+def gerar_registros(n: int, seed: int = 42) -> list:
+    """Gera registros sintéticos no formato de DataExtractor._pokemon_to_dict."""
+    rng = random.Random(seed)
+    registros = []
+    for i in range(1, n + 1):
+        pokemon = Pokemon(
+            id=i,
+            nome=f"pokemon-{i}",
+            experiencia_base=rng.randint(20, 340),
+            tipos=rng.sample(TIPOS, rng.randint(1, 2)),
+            hp=rng.randint(10, 255),
+            ataque=rng.randint(5, 190),
+            defesa=rng.randint(5, 230),
+            ataque_especial=rng.randint(10, 194),
+            defesa_especial=rng.randint(20, 230),
+            velocidade=rng.randint(5, 180),
+            altura=rng.randint(1, 200),
+            peso=rng.randint(1, 9999),
+            especie=f"pokemon-{i}",
+        )
+        registros.append({
+            "id": pokemon.id,
+            "nome": pokemon.nome,
+            "experiencia_base": pokemon.experiencia_base,
+            "tipos": pokemon.tipos,
+            "hp": pokemon.hp,
+            "ataque": pokemon.ataque,
+            "defesa": pokemon.defesa,
+            "ataque_especial": pokemon.ataque_especial,
+            "defesa_especial": pokemon.defesa_especial,
+            "velocidade": pokemon.velocidade,
+            "altura": pokemon.altura,
+            "peso": pokemon.peso,
+            "especie": pokemon.especie,
+            "categoria": pokemon.categoria,
+        })
+    return registros
+
+
+def transform_pandas(pokemon_list: list) -> dict:
+    """Implementação original do DataTransformer, baseada em DataFrame."""
+    df = pd.DataFrame(pokemon_list)
+    tipos_analise = df.explode('tipos').groupby('tipos').agg(
+        {stat: 'mean' for stat in STATS}
+    ).round(2).to_dict()
+    top_experiencia = df.nlargest(5, 'experiencia_base')[['nome', 'experiencia_base']].to_dict('records')
+    estatisticas = {'total_pokemon': len(df)}
+    for campo in STATS + MEDIDAS:
+        estatisticas[f'media_{campo}'] = float(df[campo].mean())
+    estatisticas['distribuicao_categorias'] = df['categoria'].value_counts().to_dict()
+    return {
+        'tipos_analise': tipos_analise,
+        'top_experiencia': top_experiencia,
+        'estatisticas': estatisticas
+    }
+
+
+def medir(func, repeticoes: int) -> float:
+    """Retorna o melhor tempo (ms) entre as repetições."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--json", help="Arquivo para gravar os resultados")
+    args = parser.parse_args()
+
+    transformer = DataTransformer()
+    resultados = []
+
+    print(f"{'linhas':>8} {'pandas (ms)':>12} {'tabela (ms)':>12} {'reducao (ms)':>13} {'speedup':>8}")
+    for n in args.tamanhos:
+        registros = gerar_registros(n)
+        table = PokemonTable.from_records(registros)
+
+        # Confere que os dois caminhos produzem o mesmo resultado
+        esperado = transform_pandas(registros)
+        obtido = asyncio.run(transformer.transform(registros))
+        assert esperado == obtido, f"Resultados divergentes para {n} linhas"
+
+        t_pandas = medir(lambda: transform_pandas(registros), args.repeticoes)
+        t_tabela = medir(lambda: asyncio.run(transformer.transform(registros)), args.repeticoes)
+        t_reducao = medir(lambda: (
+            transformer._analise_por_tipo(table),
+            transformer._top_experiencia(table),
+            transformer._estatisticas_gerais(table),
+        ), args.repeticoes)
+
+        resultados.append({
+            "linhas": n,
+            "pandas_ms": round(t_pandas, 3),
+            "tabela_ms": round(t_tabela, 3),
+            "reducao_ms": round(t_reducao, 3),
+        })
+        print(f"{n:>8} {t_pandas:>12.2f} {t_tabela:>12.2f} {t_reducao:>13.2f} {t_pandas / t_tabela:>7.1f}x")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
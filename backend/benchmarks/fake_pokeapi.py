@@ -0,0 +1,144 @@
+"""
+Servidor local que imita os endpoints da PokeAPI usados pelo DataExtractor.
+
+Os dados são sintéticos e determinísticos (mesma semente, mesmos Pokémon).
+Latência, taxa de erro e tamanho do conjunto são configuráveis. Respostas de
+detalhe trazem ETag e respeitam If-None-Match (304), como a API real.
+
+Uso:
+    python benchmarks/fake_pokeapi.py [--porta 8765] [--tamanho 1300]
+        [--latencia-ms 20] [--jitter 0.2] [--taxa-erro 0.0] [--seed 42]
+"""
+import argparse
+import asyncio
+import random
+
+from aiohttp import web
+
+TIPOS = [
+    "normal", "fire", "water", "grass", "electric", "ice",
+    "fighting", "poison", "ground", "flying", "psychic", "bug",
+    "rock", "ghost", "dragon", "dark", "steel", "fairy",
+]
+
+STATS = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+
+
+def gerar_pokemon(pokemon_id: int, seed: int = 42) -> dict:
+    """Gera o JSON de detalhe de um Pokémon, no formato de /pokemon/{id}."""
+    rng = random.Random(seed * 1_000_003 + pokemon_id)
+    nome = f"pokemon-{pokemon_id}"
+    return {
+        "id": pokemon_id,
+        "name": nome,
+        "base_experience": rng.randint(20, 340),
+        "height": rng.randint(1, 200),
+        "weight": rng.randint(1, 9999),
+        "species": {"name": nome, "url": f"/api/v2/pokemon-species/{pokemon_id}/"},
+        "types": [
+            {"slot": i + 1, "type": {"name": tipo, "url": ""}}
+            for i, tipo in enumerate(rng.sample(TIPOS, rng.randint(1, 2)))
+        ],
+        "stats": [
+            {"base_stat": rng.randint(5, 255), "effort": 0, "stat": {"name": stat, "url": ""}}
+            for stat in STATS
+        ],
+        # A API real devolve payloads grandes; os movimentos simulam esse volume
+        "moves": [{"move": {"name": f"move-{i}", "url": ""}} for i in range(rng.randint(20, 80))],
+    }
+
+
+class FakePokeAPI:
+    """Aplicação aiohttp com os endpoints /pokemon e /pokemon/{id}."""
+
+    def __init__(
+        self,
+        tamanho: int = 1300,
+        latencia_ms: float = 20.0,
+        jitter: float = 0.2,
+        taxa_erro: float = 0.0,
+        seed: int = 42,
+    ):
+        """
+        Args:
+            tamanho: Quantidade de Pokémon do conjunto (IDs 1..tamanho)
+            latencia_ms: Latência média de cada resposta
+            jitter: Variação relativa da latência (0.2 = ±20%)
+            taxa_erro: Fração das requisições de detalhe que retornam 503
+            seed: Semente dos dados e dos sorteios de latência/erro
+        """
+        self.tamanho = tamanho
+        self.latencia_ms = latencia_ms
+        self.jitter = jitter
+        self.taxa_erro = taxa_erro
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self.requisicoes = {"lista": 0, "detalhe": 0, "nao_modificado": 0, "erro": 0}
+
+    async def _latencia(self):
+        if self.latencia_ms > 0:
+            fator = 1 + self.jitter * (2 * self._rng.random() - 1)
+            await asyncio.sleep(self.latencia_ms * fator / 1000)
+
+    async def listar(self, request: web.Request) -> web.Response:
+        self.requisicoes["lista"] += 1
+        limit = int(request.query.get("limit", 20))
+        offset = int(request.query.get("offset", 0))
+        base = f"{request.scheme}://{request.host}/api/v2"
+        fim = min(self.tamanho, offset + limit)
+        await self._latencia()
+        return web.json_response({
+            "count": self.tamanho,
+            "results": [
+                {"name": f"pokemon-{i}", "url": f"{base}/pokemon/{i}/"}
+                for i in range(offset + 1, fim + 1)
+            ],
+        })
+
+    async def detalhe(self, request: web.Request) -> web.Response:
+        pokemon_id = int(request.match_info["id"])
+        if not 1 <= pokemon_id <= self.tamanho:
+            raise web.HTTPNotFound()
+
+        await self._latencia()
+        if self._rng.random() < self.taxa_erro:
+            self.requisicoes["erro"] += 1
+            return web.Response(status=503)
+
+        etag = f'"{self.seed}-{pokemon_id}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.requisicoes["nao_modificado"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+
+        self.requisicoes["detalhe"] += 1
+        return web.json_response(gerar_pokemon(pokemon_id, self.seed), headers={"ETag": etag})
+
+    async def estatisticas(self, request: web.Request) -> web.Response:
+        return web.json_response(self.requisicoes)
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/v2/pokemon", self.listar)
+        app.router.add_get("/api/v2/pokemon/{id}/", self.detalhe)
+        app.router.add_get("/api/v2/pokemon/{id}", self.detalhe)
+        app.router.add_get("/_stats", self.estatisticas)
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--tamanho", type=int, default=1300)
+    parser.add_argument("--latencia-ms", type=float, default=20.0)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--taxa-erro", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    api = FakePokeAPI(args.tamanho, args.latencia_ms, args.jitter, args.taxa_erro, args.seed)
+    web.run_app(api.app(), host=args.host, port=args.porta, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Aplicação ASGI única com o MCP (SSE) e a API de arquivos na mesma porta.
+
+Usada quando o servidor roda com vários workers do uvicorn (``WORKERS`` > 1):
+
+    uvicorn asgi:app --app-dir src --workers 4
+
+Cada worker é um processo com seus próprios caches em memória; o cache
+persistente (SQLite) e os relatórios em disco são compartilhados. Uma sessão
+SSE do MCP vive no processo que recebeu o ``GET /sse``, mas os ``POST
+/messages/`` do cliente podem chegar a qualquer worker: quem não conhece a
+sessão consulta o registro em disco e repassa a mensagem ao dono por um
+socket Unix.
+"""
+import logging
+import os
+from contextlib import asynccontextmanager
+
+import anyio
+from mcp.server.sse import SseServerTransport
+from starlette.applications import Starlette
+from starlette.routing import Mount, Route
+from starlette.types import Receive, Scope, Send
+
+import server
+from controllers.metrics import REGISTRY
+from controllers.session_relay import SessionRelay
+
+logger = logging.getLogger(__name__)
+
+# Diretório compartilhado entre os workers com os sockets e o registro de sessões
+RUNTIME_DIR = os.getenv("RUNTIME_DIR", os.path.join("cache", "runtime"))
+
+class _AsgiEndpoint:
+    """Faz o Starlette tratar uma função como aplicação ASGI, não como handler de Request."""
+
+    def __init__(self, asgi_app):
+        self.asgi_app = asgi_app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await self.asgi_app(scope, receive, send)
+
+
+sse = SseServerTransport("/messages/")
+relay = SessionRelay(sse, RUNTIME_DIR)
+
+async def handle_sse(scope: Scope, receive: Receive, send: Send):
+    """Abre uma sessão SSE do MCP e a registra para os outros workers."""
+    async with anyio.create_task_group() as tg:
+        async def receber():
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                # O cliente fechou o stream: encerra a sessão em vez de mantê-la
+                # registrada até o fim do processo
+                tg.cancel_scope.cancel()
+            return message
+
+        async with relay.connect(scope, receber, send) as streams:
+            # FastMCP não expõe o servidor de baixo nível; versão do mcp fixada no pyproject
+            await server.mcp._mcp_server.run(
+                streams[0],
+                streams[1],
+                server.mcp._mcp_server.create_initialization_options(),
+            )
+
+@asynccontextmanager
+async def lifespan(_app: Starlette):
+    # As métricas são de cada processo: o rótulo worker separa as séries
+    REGISTRY.set_constant_labels(worker=str(os.getpid()))
+    aquecimento = server.iniciar_servicos()
+    await relay.start()
+    try:
+        yield
+    finally:
+        await relay.stop()
+        await server.encerrar_servicos(aquecimento)
+
+app = Starlette(
+    routes=[
+        # Aplicação ASGI pura: a resposta SSE é enviada pelo próprio transporte
+        Route("/sse", endpoint=_AsgiEndpoint(handle_sse)),
+        Mount("/messages/", app=relay.handle_post_message),
+        # /api/* e /metrics
+        Mount("/", app=server.app),
+    ],
+    lifespan=lifespan,
+)
@@ -0,0 +1,43 @@
+"""
+Configuração do cache compartilhada pelos pontos de entrada.
+
+O servidor (``server.py``) e a sincronização avulsa (``warm_cache.py``)
+usam o mesmo cache em disco: ambos criam o extrator a partir das mesmas
+variáveis de ambiente e coordenam migração, limpeza e aquecimento pelos
+mesmos locks em ``<cache_dir>/locks``.
+"""
+import os
+from datetime import timedelta
+
+from controllers.data_extractor import DataExtractor
+from controllers.file_lock import FileLock
+
+
+def criar_extractor() -> DataExtractor:
+    """Cria o DataExtractor com a configuração do ambiente (``POKEAPI_*``, ``CACHE_*``)."""
+    workers = int(os.getenv("WORKERS", "1"))
+    return DataExtractor(
+        max_concurrency=int(os.getenv("POKEAPI_MAX_CONCURRENCY", "20")),
+        limit_per_host=int(os.getenv("POKEAPI_LIMIT_PER_HOST", "20")),
+        max_retries=int(os.getenv("POKEAPI_MAX_RETRIES", "3")),
+        # Espera máxima entre tentativas, inclusive quando a PokeAPI pede mais via Retry-After
+        max_backoff=float(os.getenv("POKEAPI_MAX_BACKOFF", "30")),
+        memory_cache_size=int(os.getenv("MEMORY_CACHE_SIZE", "2048")),
+        cache_backend=os.getenv("CACHE_BACKEND", "sqlite"),
+        stale_while_revalidate=os.getenv("CACHE_STALE_WHILE_REVALIDATE", "true").lower() == "true",
+        hard_expiry=timedelta(hours=float(os.getenv("CACHE_HARD_EXPIRY_HOURS", "168"))),
+        # Com vários workers, uma falta de cache é buscada na PokeAPI por um só processo
+        cross_process_lock=os.getenv("CACHE_CROSS_PROCESS_LOCK", str(workers > 1)).lower() == "true",
+    )
+
+
+def preparar_cache(extractor: DataExtractor):
+    """Migra o cache legado e remove entradas vencidas, um processo por vez."""
+    with FileLock(os.path.join(extractor.cache_dir, "locks", "migrate.lock")):
+        extractor.migrate_legacy_cache()
+        extractor.purge_cache()
+
+
+def lock_aquecimento(extractor: DataExtractor) -> FileLock:
+    """Lock de quem aquece o cache: um processo por vez, servidor ou warm_cache."""
+    return FileLock(os.path.join(extractor.cache_dir, "locks", "warmer.lock"))
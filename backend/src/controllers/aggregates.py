@@ -0,0 +1,127 @@
+import heapq
+from collections import Counter
+from typing import Dict, Iterable, List
+
+from models.pokemon_table import CATEGORIAS
+
+# Estatísticas agregadas por tipo e no geral
+STATS = ('ataque', 'defesa', 'hp', 'ataque_especial', 'defesa_especial', 'velocidade')
+
+# Medidas físicas agregadas apenas no geral
+MEDIDAS = ('altura', 'peso')
+
+def _round2(valor: float) -> float:
+    """Arredonda para 2 casas com a mesma semântica de ``numpy.round``."""
+    return round(valor * 100) / 100
+
+class AggregateState:
+    """
+    Estado incremental das análises do DataTransformer.
+
+    Guarda somas e contagens por tipo, um heap limitado com os maiores
+    valores de experiência base e a contagem por categoria. Pode ser
+    atualizado um registro por vez e combinado com estados de outras
+    partições; ``finalize`` produz o mesmo formato de ``transform``.
+    """
+
+    def __init__(self, top_k: int = 5):
+        """
+        Args:
+            top_k: Quantidade de Pokémon mantidos no ranking de experiência
+        """
+        self.top_k = top_k
+        self.total = 0
+        self.somas = {campo: 0 for campo in STATS + MEDIDAS}
+        # tipo -> [contagem, soma de cada estatística em STATS]
+        self.por_tipo: Dict[str, List[float]] = {}
+        # heap mínimo de (experiencia_base, -id, nome)
+        self.top: List[tuple] = []
+        self.categorias: Counter = Counter()
+
+    def add(self, registro: Dict):
+        """Incorpora um Pokémon (no formato de ``_pokemon_to_dict``)."""
+        self.total += 1
+        valores = [registro[stat] for stat in STATS]
+        for stat, valor in zip(STATS, valores):
+            self.somas[stat] += valor
+        for medida in MEDIDAS:
+            self.somas[medida] += registro[medida]
+
+        for tipo in registro['tipos']:
+            acumulado = self.por_tipo.get(tipo)
+            if acumulado is None:
+                acumulado = self.por_tipo[tipo] = [0] * (len(STATS) + 1)
+            acumulado[0] += 1
+            for i, valor in enumerate(valores, start=1):
+                acumulado[i] += valor
+
+        experiencia = registro['experiencia_base']
+        if experiencia is not None:
+            self._push_top((experiencia, -registro['id'], registro['nome']))
+
+        self.categorias[registro['categoria']] += 1
+
+    def update(self, registros: Iterable[Dict]) -> "AggregateState":
+        """Incorpora vários Pokémon e retorna o próprio estado."""
+        for registro in registros:
+            self.add(registro)
+        return self
+
+    def merge(self, other: "AggregateState") -> "AggregateState":
+        """Combina outro estado a este e retorna o próprio estado."""
+        self.total += other.total
+        for campo, soma in other.somas.items():
+            self.somas[campo] += soma
+
+        for tipo, valores in other.por_tipo.items():
+            acumulado = self.por_tipo.get(tipo)
+            if acumulado is None:
+                self.por_tipo[tipo] = list(valores)
+            else:
+                for i, valor in enumerate(valores):
+                    acumulado[i] += valor
+
+        for item in other.top:
+            self._push_top(item)
+
+        self.categorias.update(other.categorias)
+        return self
+
+    def finalize(self) -> Dict:
+        """Calcula as análises a partir do estado acumulado."""
+        tipos_ordenados = sorted(self.por_tipo)
+        tipos_analise = {
+            stat: {
+                tipo: _round2(self.por_tipo[tipo][i] / self.por_tipo[tipo][0])
+                for tipo in tipos_ordenados
+            }
+            for i, stat in enumerate(STATS, start=1)
+        }
+
+        top_experiencia = [
+            {'nome': nome, 'experiencia_base': experiencia}
+            for experiencia, _, nome in sorted(self.top, reverse=True)
+        ]
+
+        estatisticas = {'total_pokemon': self.total}
+        for campo in STATS + MEDIDAS:
+            estatisticas[f'media_{campo}'] = float(self.somas[campo] / self.total) if self.total else 0.0
+        # Mais frequentes primeiro; empates na ordem de CATEGORIAS, como em DataTransformer
+        posicao = {categoria: i for i, categoria in enumerate(CATEGORIAS)}
+        estatisticas['distribuicao_categorias'] = dict(sorted(
+            self.categorias.items(),
+            key=lambda item: (-item[1], posicao.get(item[0], len(posicao))),
+        ))
+
+        return {
+            'tipos_analise': tipos_analise,
+            'top_experiencia': top_experiencia,
+            'estatisticas': estatisticas
+        }
+
+    def _push_top(self, item: tuple):
+        """Mantém no heap apenas os ``top_k`` maiores itens."""
+        if len(self.top) < self.top_k:
+            heapq.heappush(self.top, item)
+        elif item > self.top[0]:
+            heapq.heapreplace(self.top, item)
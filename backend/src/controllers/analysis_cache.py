@@ -0,0 +1,62 @@
+import logging
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from controllers.memory_cache import MemoryCache
+
+class AnalysisCache:
+    """
+    Memoriza resultados de análise (extração, transformação e relatórios)
+    entre chamadas das ferramentas MCP.
+
+    As entradas são indexadas por (limit, offset) e guardam os IDs da janela
+    e a versão desses Pokémon no extrator. Uma entrada é descartada quando a
+    janela passa a ter outros IDs (índice atualizado) ou quando algum desses
+    Pokémon muda; mudanças em Pokémon fora da janela não a afetam.
+    """
+
+    def __init__(self, extractor, max_size: int = 64):
+        """
+        Args:
+            extractor: DataExtractor cujas versões por Pokémon invalidam as entradas
+            max_size: Quantidade máxima de análises memorizadas
+        """
+        self.extractor = extractor
+        self.logger = logging.getLogger(__name__)
+        self._cache = MemoryCache(max_size=max_size, ttl=extractor.cache_expiry.total_seconds())
+
+    async def get_or_compute(
+        self,
+        limit: int,
+        offset: int,
+        compute: Callable[[], Awaitable[Dict]],
+    ) -> Dict:
+        """
+        Retorna a análise memorizada ou a calcula com ``compute``.
+
+        Chamadas simultâneas com os mesmos parâmetros compartilham o mesmo
+        cálculo. Apenas resultados com status ``success`` são mantidos.
+        """
+        try:
+            ids = await self.extractor.window_ids(limit, offset)
+        except Exception:
+            # Sem o índice não há como validar a entrada; a extração reporta o erro
+            return await compute()
+
+        def valida(memorizada: Tuple[Dict, List[int], int]) -> bool:
+            _, ids_entrada, versao = memorizada
+            return ids_entrada == ids and self.extractor.versao(ids) <= versao
+
+        async def calcular() -> Tuple[Dict, List[int], int]:
+            entrada = await compute()
+            # Depois do cálculo: inclui o que a própria extração trouxe da API
+            return entrada, ids, self.extractor.versao(ids)
+
+        key = (limit, offset)
+        entrada, _, _ = await self._cache.get_or_load(key, calcular, valida)
+        if entrada.get("pokemon_data", {}).get("status") != "success":
+            self._cache.invalidate(key)
+        return entrada
+
+    def stats(self) -> Dict:
+        """Retorna os contadores do cache de análises."""
+        return self._cache.stats()
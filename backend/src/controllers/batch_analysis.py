@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Dict, List, Tuple
+
+from controllers.metrics import stage
+from models.pokemon_table import CATEGORIAS, COLUNAS, PokemonTable
+from utils.lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+# Chaves aceitas em cada especificação e seus valores padrão
+ESPECIFICACAO_PADRAO = {
+    "nome": None,
+    "limit": 100,
+    "offset": 0,
+    "tipos": None,
+    "todos_os_tipos": False,
+    "categorias": None,
+    "minimos": None,
+    "maximos": None,
+}
+
+class BatchAnalyzer:
+    """
+    Executa várias análises (limit, offset e filtros) em uma única chamada.
+
+    As janelas de todas as especificações são unidas antes da extração, de
+    modo que cada Pokémon é buscado uma única vez mesmo quando aparece em
+    várias análises. Os registros extraídos formam uma PokemonTable e cada
+    especificação vira uma linha de uma matriz de pertinência (análises x
+    Pokémon); ``DataTransformer.transform_many`` calcula todas as análises
+    a partir dessa matriz em uma única passada.
+    """
+
+    def __init__(self, extractor, transformer, reporter=None, max_especificacoes: int = 20):
+        """
+        Args:
+            extractor: DataExtractor de onde os Pokémon são obtidos
+            transformer: DataTransformer usado nas análises
+            reporter: ReportGenerator para os relatórios opcionais
+            max_especificacoes: Quantidade máxima de análises por chamada
+        """
+        self.extractor = extractor
+        self.transformer = transformer
+        self.reporter = reporter
+        self.max_especificacoes = max_especificacoes
+        self.logger = logging.getLogger(__name__)
+
+    def normalizar(self, especificacoes: List[Dict]) -> List[Dict]:
+        """
+        Valida as especificações e preenche os valores padrão.
+
+        Raises:
+            ValueError: Lista vazia ou longa demais, chaves desconhecidas,
+                limit/offset inválidos ou categorias e atributos desconhecidos
+        """
+        if not especificacoes:
+            raise ValueError("Informe ao menos uma especificação de análise")
+        if len(especificacoes) > self.max_especificacoes:
+            raise ValueError(f"No máximo {self.max_especificacoes} especificações por chamada")
+
+        normalizadas = []
+        for i, especificacao in enumerate(especificacoes):
+            desconhecidas = [chave for chave in especificacao if chave not in ESPECIFICACAO_PADRAO]
+            if desconhecidas:
+                raise ValueError(f"Especificação {i}: chaves desconhecidas: {', '.join(desconhecidas)}")
+            normalizada = {**ESPECIFICACAO_PADRAO, **especificacao}
+            if not _inteiro(normalizada["limit"]) or normalizada["limit"] < 1:
+                raise ValueError(f"Especificação {i}: limit deve ser um inteiro positivo")
+            if not _inteiro(normalizada["offset"]) or normalizada["offset"] < 0:
+                raise ValueError(f"Especificação {i}: offset deve ser um inteiro não negativo")
+            desconhecidas = [c for c in normalizada["categorias"] or [] if c not in CATEGORIAS]
+            if desconhecidas:
+                raise ValueError(f"Especificação {i}: categorias desconhecidas: {', '.join(desconhecidas)}")
+            atributos = [*(normalizada["minimos"] or {}), *(normalizada["maximos"] or {})]
+            desconhecidos = [c for c in dict.fromkeys(atributos) if c not in COLUNAS]
+            if desconhecidos:
+                raise ValueError(f"Especificação {i}: atributos desconhecidos: {', '.join(desconhecidos)}")
+            if normalizada["nome"] is None:
+                normalizada["nome"] = f"analise_{i + 1}"
+            normalizadas.append(normalizada)
+        return normalizadas
+
+    async def analyze(
+        self,
+        especificacoes: List[Dict],
+        gerar_relatorios: bool = False,
+        aguardar: bool = True,
+    ) -> Dict:
+        """
+        Extrai a união das janelas e calcula todas as análises.
+
+        Args:
+            especificacoes: Especificações já normalizadas por ``normalizar``
+            gerar_relatorios: Gera CSVs e gráfico de cada análise, em paralelo
+            aguardar: Aguarda a gravação dos relatórios antes de retornar
+
+        Returns:
+            Dicionário com as análises por especificação, a análise
+            combinada (união dos Pokémon selecionados) e os contadores de
+            deduplicação
+
+        Raises:
+            ValueError: Filtros com tipos desconhecidos
+        """
+        janelas = _unir_janelas([(e["offset"], e["offset"] + e["limit"]) for e in especificacoes])
+        with stage("extract"):
+            extracoes = await asyncio.gather(*(
+                self.extractor.extract(limit=fim - inicio, offset=inicio) for inicio, fim in janelas
+            ))
+
+        registros, erros = [], []
+        for extracao in extracoes:
+            if extracao["status"] == "error":
+                erros.extend(extracao.get("erros") or [{"erro": extracao.get("message", "")}])
+                continue
+            registros.extend(extracao["data"])
+            erros.extend(extracao.get("erros", []))
+        if not registros:
+            return {"status": "error", "message": "Nenhum Pokémon pôde ser extraído", "erros": erros}
+
+        with stage("transform"):
+            # As janelas são disjuntas; a tabela segue a ordem da API (por ID)
+            registros.sort(key=lambda registro: registro["id"])
+            table = PokemonTable.from_records(registros)
+
+            tipos = table.type_matrix()
+            membros = np.zeros((len(especificacoes) + 1, len(table)), dtype=bool)
+            for i, especificacao in enumerate(especificacoes):
+                membros[i] = await self._membros(table, tipos, especificacao, i)
+            # Última linha: união de todas as seleções
+            membros[-1] = membros[:-1].any(axis=0)
+
+            analises = self.transformer.transform_many(table, membros)
+
+        resultados = [
+            {
+                "nome": especificacao["nome"],
+                "especificacao": {
+                    k: v for k, v in especificacao.items()
+                    if k != "nome" and v is not None and v is not False
+                },
+                "total": int(membros[i].sum()),
+                "analise": analise,
+            }
+            for i, (especificacao, analise) in enumerate(zip(especificacoes, analises))
+        ]
+
+        if gerar_relatorios and self.reporter is not None:
+            # O gerador deduplica análises iguais e renderiza no pool de processos
+            com_dados = [resultado for resultado in resultados if resultado["total"]]
+            with stage("report"):
+                relatorios = await asyncio.gather(*(
+                    self.reporter.generate(resultado["analise"], aguardar=aguardar)
+                    for resultado in com_dados
+                ))
+            for resultado, relatorio in zip(com_dados, relatorios):
+                resultado["relatorio"] = relatorio
+
+        result = {
+            "status": "partial" if erros else "success",
+            "total_especificacoes": len(especificacoes),
+            "pokemon_solicitados": sum(e["limit"] for e in especificacoes),
+            "pokemon_extraidos": len(table),
+            "resultados": resultados,
+            "combinado": {"total": int(membros[-1].sum()), "analise": analises[-1]},
+        }
+        if erros:
+            result["erros"] = erros
+        return result
+
+    async def _membros(self, table: PokemonTable, matriz_tipos: np.ndarray, especificacao: Dict, i: int) -> np.ndarray:
+        """Máscara booleana das linhas da tabela selecionadas por uma especificação."""
+        ids = await self.extractor.window_ids(especificacao["limit"], especificacao["offset"])
+        if not ids:
+            return np.zeros(len(table), dtype=bool)
+
+        # Janela (limit, offset) como faixa de IDs sobre a tabela ordenada
+        coluna_id = table["id"]
+        inicio = np.searchsorted(coluna_id, ids[0], side="left")
+        fim = np.searchsorted(coluna_id, ids[-1], side="right")
+        mascara = np.zeros(len(table), dtype=bool)
+        mascara[inicio:fim] = True
+
+        tipos = especificacao["tipos"]
+        if tipos:
+            desconhecidos = [tipo for tipo in tipos if tipo not in table.vocabulario]
+            if desconhecidos:
+                raise ValueError(f"Especificação {i}: tipos desconhecidos: {', '.join(desconhecidos)}")
+            colunas = matriz_tipos[:, [table.vocabulario.index(tipo) for tipo in tipos]]
+            mascara &= colunas.all(axis=1) if especificacao["todos_os_tipos"] else colunas.any(axis=1)
+
+        categorias = especificacao["categorias"]
+        if categorias:
+            mascara &= np.isin(table.categorias, [CATEGORIAS.index(categoria) for categoria in categorias])
+
+        for limites, comparar in ((especificacao["minimos"], np.greater_equal), (especificacao["maximos"], np.less_equal)):
+            for coluna, valor in (limites or {}).items():
+                mascara &= comparar(table[coluna], valor)
+        return mascara
+
+
+def _inteiro(valor) -> bool:
+    """Inteiro de fato: ``bool`` é subclasse de ``int`` e é recusado."""
+    return isinstance(valor, int) and not isinstance(valor, bool)
+
+
+def _unir_janelas(janelas: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Une janelas [início, fim) sobrepostas ou adjacentes."""
+    unidas: List[List[int]] = []
+    for inicio, fim in sorted(janelas):
+        if unidas and inicio <= unidas[-1][1]:
+            unidas[-1][1] = max(unidas[-1][1], fim)
+        else:
+            unidas.append([inicio, fim])
+    return [(inicio, fim) for inicio, fim in unidas]
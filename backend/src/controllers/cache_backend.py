@@ -0,0 +1,256 @@
+import abc
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Limite de parâmetros por consulta no SQLite (SQLITE_MAX_VARIABLE_NUMBER)
+_SQLITE_BATCH = 900
+
+class CacheBackend(abc.ABC):
+    """Interface dos backends de cache persistente do extrator."""
+
+    def __init__(self, ttl: float):
+        """
+        Args:
+            ttl: Tempo de vida padrão das entradas, em segundos
+        """
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Recupera uma entrada válida, ou None se ausente ou expirada."""
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, value: Dict):
+        """Armazena uma entrada."""
+        self.set_many([(key, value)])
+
+    @abc.abstractmethod
+    def get_many(self, keys: Iterable[str], incluir_expirados: bool = False) -> Dict[str, Dict]:
+        """Recupera várias entradas de uma só vez (por padrão, apenas as válidas)."""
+
+    @abc.abstractmethod
+    def set_many(self, items: Iterable[Tuple[str, Dict]]):
+        """Armazena várias entradas de uma só vez."""
+
+    @abc.abstractmethod
+    def get_entries(self, keys: Iterable[str], tolerancia: float = 0) -> Dict[str, Tuple[Dict, float]]:
+        """
+        Recupera entradas junto com o instante de expiração (epoch).
+
+        Inclui entradas expiradas há no máximo ``tolerancia`` segundos.
+        """
+
+    @abc.abstractmethod
+    def expires_at_many(self, keys: Iterable[str]) -> Dict[str, float]:
+        """Retorna o instante de expiração (epoch) das entradas existentes, mesmo expiradas."""
+
+    @abc.abstractmethod
+    def purge_expired(self, tolerancia: float = 0) -> int:
+        """Remove entradas expiradas há mais de ``tolerancia`` segundos e retorna quantas foram removidas."""
+
+    def close(self):
+        """Libera recursos do backend."""
+
+
+class JsonFileCacheBackend(CacheBackend):
+    """Backend legado: um arquivo JSON por chave, expiração pelo mtime."""
+
+    def __init__(self, cache_dir: str, ttl: float):
+        super().__init__(ttl)
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get_many(self, keys: Iterable[str], incluir_expirados: bool = False) -> Dict[str, Dict]:
+        result = {}
+        now = time.time()
+        for key in keys:
+            cache_file = self._path(key)
+            try:
+                # Verifica se o cache expirou
+                if not incluir_expirados and now - os.path.getmtime(cache_file) >= self.ttl:
+                    continue
+                with open(cache_file, 'r') as f:
+                    result[key] = json.load(f)
+            except (OSError, ValueError):
+                continue
+        return result
+
+    def set_many(self, items: Iterable[Tuple[str, Dict]]):
+        for key, value in items:
+            # Grava em arquivo temporário e renomeia: leitores de outros
+            # processos nunca veem um JSON pela metade
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+
+    def get_entries(self, keys: Iterable[str], tolerancia: float = 0) -> Dict[str, Tuple[Dict, float]]:
+        result = {}
+        now = time.time()
+        for key in keys:
+            cache_file = self._path(key)
+            try:
+                expires_at = os.path.getmtime(cache_file) + self.ttl
+                if expires_at <= now - tolerancia:
+                    continue
+                with open(cache_file, 'r') as f:
+                    result[key] = (json.load(f), expires_at)
+            except (OSError, ValueError):
+                continue
+        return result
+
+    def expires_at_many(self, keys: Iterable[str]) -> Dict[str, float]:
+        result = {}
+        for key in keys:
+            try:
+                result[key] = os.path.getmtime(self._path(key)) + self.ttl
+            except OSError:
+                continue
+        return result
+
+    def purge_expired(self, tolerancia: float = 0) -> int:
+        limite = time.time() - tolerancia - self.ttl
+        removidos = 0
+        for nome in os.listdir(self.cache_dir):
+            if not nome.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, nome)
+            try:
+                if os.path.getmtime(path) <= limite:
+                    os.remove(path)
+                    removidos += 1
+            except OSError:
+                continue
+        return removidos
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Backend em um único banco SQLite (modo WAL) com expiração indexada.
+
+    Cada entrada guarda o JSON serializado e o instante de expiração,
+    permitindo leituras e gravações em lote numa única transação.
+    """
+
+    def __init__(self, db_path: str, ttl: float, busy_timeout: float = 30.0):
+        super().__init__(ttl)
+        self.db_path = db_path
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Vários processos (workers) podem gravar no mesmo banco; o timeout
+        # faz a conexão aguardar o lock de escrita em vez de falhar
+        self._conn = sqlite3.connect(db_path, timeout=busy_timeout, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, "
+            "value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires_at ON cache(expires_at)")
+
+    def get_many(self, keys: Iterable[str], incluir_expirados: bool = False) -> Dict[str, Dict]:
+        keys = list(keys)
+        result = {}
+        now = float("-inf") if incluir_expirados else time.time()
+        with self._lock:
+            for i in range(0, len(keys), _SQLITE_BATCH):
+                chunk = keys[i:i + _SQLITE_BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM cache WHERE key IN ({placeholders}) AND expires_at > ?",
+                    (*chunk, now),
+                ).fetchall()
+                for key, value in rows:
+                    result[key] = json.loads(value)
+        return result
+
+    def set_many(self, items: Iterable[Tuple[str, Dict]]):
+        expires_at = time.time() + self.ttl
+        rows: List[Tuple[str, str, float]] = [
+            (key, json.dumps(value), expires_at) for key, value in items
+        ]
+        if not rows:
+            return
+        with self._lock:
+            # IMMEDIATE reserva a escrita já no início, evitando SQLITE_BUSY
+            # sem espera quando outro processo grava ao mesmo tempo
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_entries(self, keys: Iterable[str], tolerancia: float = 0) -> Dict[str, Tuple[Dict, float]]:
+        keys = list(keys)
+        result = {}
+        limite = time.time() - tolerancia
+        with self._lock:
+            for i in range(0, len(keys), _SQLITE_BATCH):
+                chunk = keys[i:i + _SQLITE_BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value, expires_at FROM cache WHERE key IN ({placeholders}) AND expires_at > ?",
+                    (*chunk, limite),
+                ).fetchall()
+                for key, value, expires_at in rows:
+                    result[key] = (json.loads(value), expires_at)
+        return result
+
+    def expires_at_many(self, keys: Iterable[str]) -> Dict[str, float]:
+        keys = list(keys)
+        result = {}
+        with self._lock:
+            for i in range(0, len(keys), _SQLITE_BATCH):
+                chunk = keys[i:i + _SQLITE_BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, expires_at FROM cache WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                result.update(rows)
+        return result
+
+    def purge_expired(self, tolerancia: float = 0) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time() - tolerancia,))
+            return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_cache_backend(kind: str, cache_dir: str, ttl: float) -> CacheBackend:
+    """
+    Cria o backend de cache configurado.
+
+    Args:
+        kind: ``sqlite`` (padrão) ou ``json``
+        cache_dir: Diretório onde o cache é armazenado
+        ttl: Tempo de vida das entradas, em segundos
+    """
+    if kind == "json":
+        return JsonFileCacheBackend(cache_dir, ttl)
+    if kind == "sqlite":
+        return SQLiteCacheBackend(os.path.join(cache_dir, "cache.db"), ttl)
+    raise ValueError(f"Backend de cache desconhecido: {kind}")
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import time
+from typing import Dict
+
+class CacheWarmer:
+    """
+    Sincroniza todos os Pokémon da PokeAPI para o cache local do extrator.
+
+    Busca apenas as entradas ausentes ou perto de expirar, usando requisições
+    condicionais (If-None-Match/If-Modified-Since) quando o registro tem
+    validadores. O progresso é gravado em lotes no próprio cache, então uma
+    execução interrompida retoma de onde parou.
+    """
+
+    def __init__(self, extractor, refresh_margin: float = 0.25, batch_size: int = 200):
+        """
+        Args:
+            extractor: DataExtractor cujo cache será aquecido
+            refresh_margin: Fração do TTL restante abaixo da qual uma entrada
+                é renovada (0.25 = renova quando falta menos de 1/4 do TTL)
+            batch_size: Pokémon processados e gravados por lote
+        """
+        self.extractor = extractor
+        self.refresh_margin = refresh_margin
+        self.batch_size = batch_size
+        self.logger = logging.getLogger(__name__)
+
+    async def run(self) -> Dict:
+        """
+        Executa uma sincronização completa.
+
+        Returns:
+            Contadores da execução: total, ignorados (ainda válidos),
+            atualizados, nao_modificados, erros e removidos (entradas
+            vencidas apagadas do cache)
+        """
+        extractor = self.extractor
+        inicio = time.perf_counter()
+
+        results = await extractor.full_listing()
+        margem = self.refresh_margin * extractor.cache_expiry.total_seconds()
+        pendentes = extractor.needs_refresh(results, margem)
+
+        stats = {
+            'total': len(results),
+            'ignorados': len(results) - len(pendentes),
+            'atualizados': 0,
+            'nao_modificados': 0,
+            'erros': 0,
+        }
+        self.logger.info(f"Aquecimento do cache: {len(pendentes)} de {len(results)} Pokémon a sincronizar")
+
+        # Cada lote é gravado no cache em uma única operação
+        for i in range(0, len(pendentes), self.batch_size):
+            contadores = await extractor.revalidate_many(pendentes[i:i + self.batch_size])
+            for chave, valor in contadores.items():
+                stats[chave] += valor
+
+        # Entradas vencidas de Pokémon que saíram da listagem não são renovadas
+        stats['removidos'] = extractor.purge_cache()
+
+        stats['duracao_s'] = round(time.perf_counter() - inicio, 2)
+        self.logger.info(f"Aquecimento do cache concluído: {stats}")
+        return stats
+
+    async def run_periodic(self, intervalo: float):
+        """Executa a sincronização continuamente, a cada ``intervalo`` segundos."""
+        while True:
+            try:
+                await self.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Erro no aquecimento do cache: {str(e)}", exc_info=True)
+            await asyncio.sleep(intervalo)
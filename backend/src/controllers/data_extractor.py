@@ -1,27 +1,152 @@
 import logging
 import aiohttp
 import asyncio
-import pandas as pd
-from typing import List, Dict
-from models.pokemon import Pokemon
+import math
+import random
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List, Dict, Optional, Set, Tuple, Union
+from models.pokemon import Pokemon, CACHE_SCHEMA_VERSION, decode_stats
+from models.pokemon_index import PokemonIndex
+from controllers.memory_cache import MemoryCache
+from controllers.cache_backend import JsonFileCacheBackend, create_cache_backend
+from controllers.file_lock import FileLock
+from controllers.metrics import UPSTREAM_DURATION, UPSTREAM_IN_FLIGHT, UPSTREAM_REQUESTS, UPSTREAM_RETRIES
 import json
 import os
-from datetime import datetime, timedelta
+import time
+from datetime import timedelta
+
+# Status HTTP que indicam falha transitória e justificam nova tentativa
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Segundos que uma entrada expirada fica em memória antes de nova revalidação
+_STALE_RETRY = 60
+
+# Chave do índice completo de Pokémon no cache persistente
+_INDEX_KEY = "pokemon_index"
+
+# Limite usado para obter a lista completa de Pokémon em uma requisição
+_LIMITE_LISTA_COMPLETA = 100000
+
+class _SemLock:
+    """Lock assíncrono nulo, usado quando o lock entre processos está desligado."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+_SEM_LOCK = _SemLock()
 
 class DataExtractor:
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: int = 20,
+        limit_per_host: int = 20,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        max_backoff: float = 30.0,
+        request_timeout: float = 30.0,
+        keepalive_timeout: float = 60.0,
+        memory_cache_size: int = 2048,
+        cache_backend: str = "sqlite",
+        stale_while_revalidate: bool = False,
+        hard_expiry: timedelta = timedelta(days=7),
+        cross_process_lock: bool = False,
+    ):
         self.base_url = "https://pokeapi.co/api/v2"
         self.logger = logging.getLogger(__name__)
         self.cache_dir = "cache"
         self.cache_expiry = timedelta(hours=24)
-        
-        # Cria diretório de cache se não existir
-        if not os.path.exists(self.cache_dir):
-            os.makedirs(self.cache_dir)
+
+        # Cache persistente (SQLite por padrão, ou um JSON por chave)
+        self.cache = create_cache_backend(
+            cache_backend,
+            self.cache_dir,
+            self.cache_expiry.total_seconds(),
+        )
+
+        # Camada em memória com objetos Pokemon já processados
+        self.memory_cache = MemoryCache(
+            max_size=memory_cache_size,
+            ttl=self.cache_expiry.total_seconds(),
+        )
+
+        # Stale-while-revalidate: entradas expiradas (até hard_expiry) são
+        # servidas imediatamente enquanto uma atualização roda em segundo plano
+        self.stale_while_revalidate = stale_while_revalidate
+        self.hard_expiry = max(hard_expiry, self.cache_expiry)
+        self._revalidando: Dict[str, asyncio.Future] = {}
+        self.stale_stats = {
+            "stale_served": 0,
+            "revalidations": 0,
+            "revalidation_errors": 0,
+        }
+
+        # Com vários processos (workers) compartilhando o cache, uma falta é
+        # buscada por um só deles; os demais aguardam o lock e leem o cache
+        self.lock_dir = os.path.join(self.cache_dir, "locks") if cross_process_lock else None
+
+        # Índice completo de nomes e IDs, carregado sob demanda
+        self._index: Optional[PokemonIndex] = None
+        self._index_expires_at = 0.0
+        self._index_lock: Optional[asyncio.Lock] = None
+        self._index_refresh: Optional[asyncio.Future] = None
+
+        # Geração do cache: incrementada uma vez por lote de dados que de fato
+        # mudaram (uma extração, uma rajada de revalidações, a troca do
+        # índice), permitindo invalidar resultados derivados. ``_versoes``
+        # guarda a geração da última mudança de cada ID
+        self.generation = 0
+        self._versoes: Dict[int, int] = {}
+        self._alterados: Set[int] = set()
+
+        # Configurações do motor de requisições
+        self.max_concurrency = max_concurrency
+        self.limit_per_host = limit_per_host
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.request_timeout = request_timeout
+        self.keepalive_timeout = keepalive_timeout
+
+        # Sessão e semáforo são criados sob demanda, dentro do event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Retorna a sessão HTTP compartilhada, criando-a se necessário."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            )
+        return self._session
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Retorna o semáforo que limita as requisições simultâneas."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def close(self):
+        """Fecha a sessão HTTP compartilhada."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
         
     async def extract(self, limit: int = 100, offset: int = 0) -> Dict:
         """
         Extrai dados dos Pokémon da PokeAPI.
+
+        Falhas individuais na busca de detalhes não interrompem a extração:
+        os Pokémon obtidos com sucesso são retornados e as falhas são
+        listadas em ``erros`` com status ``partial``.
         
         Args:
             limit: Quantidade de Pokémon para extrair
@@ -31,31 +156,29 @@ class DataExtractor:
             Dicionário com dados dos Pokémon em formato JSON
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                # Obtém lista inicial de Pokémon
-                pokemon_list = await self._get_pokemon_list(session, limit, offset)
-                pokemon_data = []
-                
-                # Cria tasks para buscar detalhes de cada Pokémon
-                tasks = []
-                for pokemon in pokemon_list['results']:
-                    tasks.append(self._get_pokemon_details(session, pokemon['url']))
-                
-                # Executa todas as requisições em paralelo
-                details_list = await asyncio.gather(*tasks)
-                
-                # Processa os detalhes
-                for details in details_list:
-                    pokemon = self._create_pokemon_object(details)
-                    pokemon_data.append(self._pokemon_to_dict(pokemon))
-                
+            pokemon_data = []
+            erros = []
+            async for registro in self.extract_stream(limit, offset, erros=erros, ordenado=True):
+                pokemon_data.append(registro)
+
+            if erros and not pokemon_data:
                 return {
-                    "status": "success",
-                    "total": len(pokemon_data),
-                    "limit": limit,
-                    "offset": offset,
-                    "data": pokemon_data
+                    "status": "error",
+                    "message": "Nenhum Pokémon pôde ser extraído",
+                    "erros": erros,
+                    "data": []
                 }
+
+            result = {
+                "status": "partial" if erros else "success",
+                "total": len(pokemon_data),
+                "limit": limit,
+                "offset": offset,
+                "data": pokemon_data
+            }
+            if erros:
+                result["erros"] = erros
+            return result
                 
         except Exception as e:
             self.logger.error(f"Erro na extração de dados: {str(e)}")
@@ -64,38 +187,621 @@ class DataExtractor:
                 "message": str(e),
                 "data": []
             }
+
+    async def extract_stream(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        erros: Optional[List[Dict]] = None,
+        progress_callback: Optional[Callable[[int, int], Awaitable[None]]] = None,
+        ordenado: bool = False,
+    ) -> AsyncIterator[Dict]:
+        """
+        Extrai dados dos Pokémon entregando cada registro assim que fica pronto.
+
+        Por padrão os registros saem na ordem de conclusão das requisições.
+        Com ``ordenado`` saem na ordem da listagem (crescente por ID): um
+        registro que fica pronto antes dos anteriores aguarda em memória até
+        que eles cheguem ou falhem. Falhas individuais não interrompem o stream.
+
+        Args:
+            limit: Quantidade de Pokémon para extrair
+            offset: Deslocamento para paginação
+            erros: Lista opcional que recebe as falhas individuais
+            progress_callback: Corrotina chamada com (concluídos, total)
+                a cada Pokémon processado
+            ordenado: Entrega os registros na ordem da listagem
+
+        Yields:
+            Dicionário com os dados de um Pokémon
+        """
+        session = await self._get_session()
+
+        # Obtém lista inicial de Pokémon
+        pokemon_list = await self._get_pokemon_list(session, limit, offset)
+        results = pokemon_list['results']
+        total = len(results)
+
+        # Carrega em lote do cache persistente o que não está em memória
+        self._prefetch(results)
+
+        async def buscar(posicao: int, pokemon: Dict):
+            try:
+                return posicao, pokemon, await self._get_pokemon(session, pokemon['url']), None
+            except Exception as e:
+                return posicao, pokemon, None, e
+
+        # As requisições são limitadas pelo semáforo dentro de _fetch_json
+        tasks = [asyncio.ensure_future(buscar(posicao, pokemon)) for posicao, pokemon in enumerate(results)]
+        concluidos = 0
+        # Modo ordenado: registros prontos (None para falhas) aguardando os anteriores
+        pendentes: Dict[int, Optional[Dict]] = {}
+        proxima = 0
+        try:
+            for proximo in asyncio.as_completed(tasks):
+                posicao, pokemon, resultado, erro = await proximo
+                concluidos += 1
+                registro = None
+                if erro is not None:
+                    self.logger.warning(f"Falha ao obter {pokemon['name']}: {str(erro)}")
+                    if erros is not None:
+                        erros.append({"nome": pokemon['name'], "erro": str(erro)})
+                else:
+                    registro = self._pokemon_to_dict(resultado)
+
+                if not ordenado:
+                    if registro is not None:
+                        yield registro
+                else:
+                    pendentes[posicao] = registro
+                    while proxima in pendentes:
+                        registro = pendentes.pop(proxima)
+                        proxima += 1
+                        if registro is not None:
+                            yield registro
+                if progress_callback is not None:
+                    await progress_callback(concluidos, total)
+        finally:
+            # Cancela o que restar se o consumidor encerrar o stream antes do fim
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            self._publicar_alteracoes()
+
+    async def _fetch_json(self, session: aiohttp.ClientSession, url: str) -> Dict:
+        """Faz GET em uma URL com limite de concorrência e retry com backoff exponencial."""
+        _, data, _ = await self._fetch(session, url)
+        return data
+
+    async def _fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[int, Optional[Dict], Dict[str, str]]:
+        """
+        Faz GET com retry e retorna (status, JSON, cabeçalhos de validação).
+
+        Com cabeçalhos condicionais (If-None-Match/If-Modified-Since), uma
+        resposta 304 retorna JSON None. Os cabeçalhos retornados contêm
+        apenas ETag e Last-Modified, quando presentes.
+        """
+        semaphore = self._get_semaphore()
+        tentativa = 0
+        while True:
+            retry_after = None
+            try:
+                async with semaphore:
+                    UPSTREAM_IN_FLIGHT.inc()
+                    inicio = time.perf_counter()
+                    status = "error"
+                    try:
+                        async with session.get(url, headers=headers) as response:
+                            status = str(response.status)
+                            if response.status in RETRY_STATUS and tentativa < self.max_retries:
+                                retry_after = response.headers.get('Retry-After')
+                                self.logger.warning(f"HTTP {response.status} em {url}, tentativa {tentativa + 1}")
+                            else:
+                                validadores = {
+                                    nome: response.headers[nome]
+                                    for nome in ('ETag', 'Last-Modified')
+                                    if nome in response.headers
+                                }
+                                if response.status == 304:
+                                    return 304, None, validadores
+                                response.raise_for_status()
+                                return response.status, await response.json(), validadores
+                    finally:
+                        UPSTREAM_IN_FLIGHT.dec()
+                        UPSTREAM_REQUESTS.inc(status=status)
+                        UPSTREAM_DURATION.observe(time.perf_counter() - inicio)
+                UPSTREAM_RETRIES.inc(reason=status)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if tentativa >= self.max_retries:
+                    raise
+                UPSTREAM_RETRIES.inc(reason="connection")
+                self.logger.warning(f"Erro de conexão em {url}: {str(e)}, tentativa {tentativa + 1}")
+
+            # Aguarda fora do semáforo para não segurar a vaga de outra requisição
+            await asyncio.sleep(self._backoff_delay(tentativa, retry_after))
+            tentativa += 1
+
+    def _backoff_delay(self, tentativa: int, retry_after: Optional[str] = None) -> float:
+        """Calcula o tempo de espera antes da próxima tentativa, limitado a ``max_backoff``."""
+        if retry_after:
+            try:
+                espera = float(retry_after)
+            except ValueError:
+                espera = math.nan
+            # Retry-After negativo, nan ou infinito é ignorado
+            if math.isfinite(espera) and espera >= 0:
+                return min(espera, self.max_backoff)
+        # Backoff exponencial com jitter para evitar rajadas sincronizadas
+        return min(self.backoff_base * (2 ** tentativa) * (0.5 + random.random()), self.max_backoff)
             
     async def _get_pokemon_list(self, session: aiohttp.ClientSession, limit: int, offset: int) -> Dict:
-        """Obtém lista de Pokémon da API."""
-        cache_key = f"pokemon_list_{limit}_{offset}"
-        cached_data = self._get_from_cache(cache_key)
-        
-        if cached_data:
-            return cached_data
-            
-        async with session.get(f"{self.base_url}/pokemon?limit={limit}&offset={offset}") as response:
-            response.raise_for_status()
-            data = await response.json()
-            self._save_to_cache(cache_key, data)
-            return data
-        
-    async def _get_pokemon_details(self, session: aiohttp.ClientSession, url: str) -> Dict:
+        """Obtém uma janela da lista de Pokémon a partir do índice completo."""
+        index = await self._get_pokemon_index(session)
+        return {"count": len(index), "results": index.window(limit, offset)}
+
+    async def _get_pokemon_index(self, session: aiohttp.ClientSession) -> PokemonIndex:
+        """
+        Retorna o índice completo de nomes e IDs.
+
+        A listagem é buscada uma única vez e persistida no cache; qualquer
+        janela (limit, offset) é derivada dele sem novas requisições.
+        """
+        now = time.time()
+        if self._index is not None and self._index_expires_at > now:
+            return self._index
+
+        if self._index_lock is None:
+            self._index_lock = asyncio.Lock()
+        async with self._index_lock:
+            now = time.time()
+            if self._index is None or self._index_expires_at <= now - self._tolerancia_stale():
+                entry = self.cache.get_entries([_INDEX_KEY], self._tolerancia_stale()).get(_INDEX_KEY)
+                index = PokemonIndex.from_record(entry[0]) if entry is not None else None
+                if index is None:
+                    await self._atualizar_indice(session)
+                    return self._index
+                self._index, self._index_expires_at = index, entry[1]
+
+            if self._index_expires_at <= now:
+                # Índice expirado, mas dentro do limite: atualiza em segundo plano
+                self.stale_stats["stale_served"] += 1
+                if self._index_refresh is None or self._index_refresh.done():
+                    self._index_refresh = asyncio.ensure_future(self._revalidar_indice())
+            return self._index
+
+    async def _atualizar_indice(self, session: aiohttp.ClientSession):
+        """Busca a listagem completa e substitui o índice."""
+        async with self._lock_entre_processos(_INDEX_KEY):
+            if self.lock_dir is not None:
+                # Outro processo pode ter atualizado o índice enquanto aguardávamos
+                entry = self.cache.get_entries([_INDEX_KEY]).get(_INDEX_KEY)
+                index = PokemonIndex.from_record(entry[0]) if entry is not None else None
+                if index is not None:
+                    self._trocar_indice(index, entry[1])
+                    return
+            await self._buscar_indice(session)
+
+    async def _buscar_indice(self, session: aiohttp.ClientSession):
+        """Busca a listagem completa na API e grava o índice no cache."""
+        data = await self._fetch_json(session, f"{self.base_url}/pokemon?limit={_LIMITE_LISTA_COMPLETA}&offset=0")
+        index = PokemonIndex.from_results(data['results'])
+        self._save_to_cache(_INDEX_KEY, index.to_record())
+        self._trocar_indice(index, time.time() + self.cache_expiry.total_seconds())
+
+    def _trocar_indice(self, index: PokemonIndex, expires_at: float):
+        """Substitui o índice em uso, invalidando derivados se ele mudou."""
+        if index != self._index:
+            self.generation += 1
+        self._index = index
+        self._index_expires_at = expires_at
+
+    def _publicar_alteracoes(self):
+        """Incrementa a geração uma única vez para os IDs alterados desde a última publicação."""
+        if not self._alterados:
+            return
+        self.generation += 1
+        for pokemon_id in self._alterados:
+            self._versoes[pokemon_id] = self.generation
+        self._alterados.clear()
+
+    def versao(self, ids: Iterable[int]) -> int:
+        """Geração da mudança mais recente entre os Pokémon informados (0 se nenhum mudou)."""
+        versoes = self._versoes
+        return max((versoes.get(pokemon_id, 0) for pokemon_id in ids), default=0)
+
+    def _lock_entre_processos(self, cache_key: str) -> Union[FileLock, _SemLock]:
+        """Lock que serializa entre processos a busca de uma chave na API."""
+        if self.lock_dir is None:
+            return _SEM_LOCK
+        return FileLock(os.path.join(self.lock_dir, f"{cache_key}.lock"))
+
+    async def _revalidar_indice(self):
+        """Atualiza um índice expirado sem bloquear quem o consulta."""
+        self.stale_stats["revalidations"] += 1
+        try:
+            await self._atualizar_indice(await self._get_session())
+        except Exception as e:
+            self.stale_stats["revalidation_errors"] += 1
+            self.logger.warning(f"Falha ao revalidar o índice de Pokémon: {str(e)}")
+
+    async def find_by_name(self, nome: str) -> Optional[Dict]:
+        """Busca um Pokémon no índice pelo nome, sem acessar os detalhes."""
+        index = await self._get_pokemon_index(await self._get_session())
+        return index.by_name(nome)
+
+    async def find_by_id_range(self, inicio: int, fim: int) -> List[Dict]:
+        """Lista os Pokémon do índice com ID entre ``inicio`` e ``fim`` (inclusive)."""
+        index = await self._get_pokemon_index(await self._get_session())
+        return index.id_range(inicio, fim)
+
+    async def window_ids(self, limit: int, offset: int = 0) -> List[int]:
+        """IDs da janela de paginação (limit, offset), sem acessar os detalhes."""
+        index = await self._get_pokemon_index(await self._get_session())
+        offset = max(offset, 0)
+        return index.ids[offset:offset + max(limit, 0)]
+
+    async def total_pokemon(self) -> int:
+        """Quantidade de Pokémon na listagem completa da API."""
+        index = await self._get_pokemon_index(await self._get_session())
+        return len(index)
+
+    async def full_listing(self) -> List[Dict]:
+        """Listagem completa (nome e URL de cada Pokémon), a partir do índice."""
+        index = await self._get_pokemon_index(await self._get_session())
+        return index.window(len(index))
+
+    def needs_refresh(self, results: List[Dict], margem: float = 0) -> List[Dict]:
+        """
+        Filtra os Pokémon da listagem cuja entrada no cache precisa ser renovada.
+
+        Retorna os que não têm entrada, os que expiram em menos de ``margem``
+        segundos (inclusive os já expirados) e os gravados em outra versão do
+        formato compacto.
+        """
+        chaves = [self._chave_detalhes(r['url']) for r in results]
+        entradas = self.cache.get_entries(chaves, float('inf'))
+        limite = time.time() + margem
+
+        def pendente(chave: str) -> bool:
+            entrada = entradas.get(chave)
+            return entrada is None or entrada[1] <= limite or entrada[0].get('v') != CACHE_SCHEMA_VERSION
+
+        return [r for r, chave in zip(results, chaves) if pendente(chave)]
+
+    async def revalidate_many(self, results: List[Dict]) -> Dict[str, int]:
+        """
+        Atualiza as entradas de vários Pokémon a partir da API.
+
+        Usa requisições condicionais (If-None-Match/If-Modified-Since) quando a
+        entrada atual tem validadores; respostas 304 apenas renovam a validade.
+        Tudo é gravado no cache em uma única operação e, se algum registro
+        mudou, a geração avança uma única vez.
+
+        Returns:
+            Contadores: atualizados, nao_modificados e erros
+        """
+        session = await self._get_session()
+        chaves = [self._chave_detalhes(r['url']) for r in results]
+        atuais = self.cache.get_many(chaves, incluir_expirados=True)
+
+        resultados = await asyncio.gather(
+            *(self._fetch_condicional(session, r['url'], atuais.get(chave)) for r, chave in zip(results, chaves)),
+            return_exceptions=True,
+        )
+
+        contadores = {'atualizados': 0, 'nao_modificados': 0, 'erros': 0}
+        gravar = []
+        for r, chave, resultado in zip(results, chaves, resultados):
+            if isinstance(resultado, BaseException):
+                self.logger.warning(f"Falha ao sincronizar {r['name']}: {str(resultado)}")
+                contadores['erros'] += 1
+                continue
+            registro, modificado = resultado
+            gravar.append((chave, registro))
+            if modificado:
+                contadores['atualizados'] += 1
+                if not self._registros_iguais(atuais.get(chave), registro):
+                    self._alterados.add(registro['id'])
+                self.memory_cache.set(str(registro['id']), Pokemon.from_record(registro))
+            else:
+                contadores['nao_modificados'] += 1
+
+        self.cache.set_many(gravar)
+        self._publicar_alteracoes()
+        return contadores
+
+    def _chave_detalhes(self, url: str) -> str:
+        """Chave do cache persistente com os detalhes do Pokémon de uma URL."""
+        return f"pokemon_details_{url.split('/')[-2]}"
+
+    def _prefetch(self, results: List[Dict]):
+        """Popula o cache em memória com uma única leitura em lote do cache persistente."""
+        urls = {r['url'].split('/')[-2]: r['url'] for r in results}
+        faltantes = [pokemon_id for pokemon_id in urls if pokemon_id not in self.memory_cache]
+        if not faltantes:
+            return
+
+        entries = self.cache.get_entries(
+            (f"pokemon_details_{pokemon_id}" for pokemon_id in faltantes),
+            self._tolerancia_stale(),
+        )
+        now = time.time()
+        migrados = []
+        for pokemon_id in faltantes:
+            cache_key = f"pokemon_details_{pokemon_id}"
+            entry = entries.get(cache_key)
+            if entry is None:
+                continue
+            data, expires_at = entry
+            pokemon = self._decode_cached(cache_key, data)
+            if pokemon is None:
+                continue
+            if data.get("v") != CACHE_SCHEMA_VERSION:
+                migrados.append((cache_key, pokemon.to_record()))
+            if expires_at > now:
+                # A memória não deve sobreviver à entrada persistente
+                self.memory_cache.set(pokemon_id, pokemon, ttl=expires_at - now)
+            else:
+                self._servir_stale(pokemon_id, urls[pokemon_id], data, pokemon)
+
+        # Regrava entradas no formato antigo já no formato compacto
+        if migrados:
+            self.cache.set_many(migrados)
+
+    def _tolerancia_stale(self) -> float:
+        """Segundos após a expiração em que uma entrada ainda pode ser servida."""
+        if not self.stale_while_revalidate:
+            return 0.0
+        return (self.hard_expiry - self.cache_expiry).total_seconds()
+
+    def _servir_stale(self, pokemon_id: str, url: str, data: Dict, pokemon: Pokemon):
+        """Mantém uma entrada expirada em uso e agenda sua revalidação."""
+        self.stale_stats["stale_served"] += 1
+        # Validade curta em memória para que falhas de revalidação sejam retentadas
+        self.memory_cache.set(pokemon_id, pokemon, ttl=_STALE_RETRY)
+        self._agendar_revalidacao(pokemon_id, url, data)
+
+    def _agendar_revalidacao(self, pokemon_id: str, url: str, atual: Dict):
+        """Agenda uma revalidação em segundo plano, no máximo uma por Pokémon."""
+        if pokemon_id in self._revalidando:
+            return
+        tarefa = asyncio.ensure_future(self._revalidar(pokemon_id, url, atual))
+        self._revalidando[pokemon_id] = tarefa
+        tarefa.add_done_callback(lambda _: self._fim_revalidacao(pokemon_id))
+
+    def _fim_revalidacao(self, pokemon_id: str):
+        """Publica as mudanças quando a última revalidação em andamento termina."""
+        self._revalidando.pop(pokemon_id, None)
+        if not self._revalidando:
+            self._publicar_alteracoes()
+
+    async def _revalidar(self, pokemon_id: str, url: str, atual: Dict):
+        """Atualiza uma entrada expirada a partir da API."""
+        self.stale_stats["revalidations"] += 1
+        cache_key = f"pokemon_details_{pokemon_id}"
+        try:
+            async with self._lock_entre_processos(cache_key):
+                if self.lock_dir is not None:
+                    # Outro processo pode já ter revalidado a entrada
+                    entry = self.cache.get_entries([cache_key]).get(cache_key)
+                    if entry is not None and entry[0].get("v") == CACHE_SCHEMA_VERSION:
+                        registro, expires_at = entry
+                        self.memory_cache.set(pokemon_id, Pokemon.from_record(registro), ttl=expires_at - time.time())
+                        if not self._registros_iguais(atual, registro):
+                            self._alterados.add(int(pokemon_id))
+                        return
+
+                session = await self._get_session()
+                registro, modificado = await self._fetch_condicional(session, url, atual)
+                self._save_to_cache(cache_key, registro)
+                self.memory_cache.set(pokemon_id, Pokemon.from_record(registro))
+                if modificado and not self._registros_iguais(atual, registro):
+                    self._alterados.add(int(pokemon_id))
+        except Exception as e:
+            self.stale_stats["revalidation_errors"] += 1
+            self.logger.warning(f"Falha ao revalidar {pokemon_id}: {str(e)}")
+
+    async def _fetch_condicional(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        atual: Optional[Dict],
+    ) -> Tuple[Dict, bool]:
+        """
+        Busca um Pokémon, condicionalmente se o registro atual tiver validadores.
+
+        Returns:
+            (registro a gravar, se o conteúdo veio da API)
+        """
+        headers = {}
+        if atual is not None and atual.get('v') == CACHE_SCHEMA_VERSION:
+            if 'etag' in atual:
+                headers['If-None-Match'] = atual['etag']
+            if 'last_modified' in atual:
+                headers['If-Modified-Since'] = atual['last_modified']
+
+        status, data, validadores = await self._fetch(session, url, headers or None)
+        if status == 304:
+            # Conteúdo inalterado: o registro atual é regravado para renovar a validade
+            return atual, False
+
+        return self._registro_cache(self._create_pokemon_object(data), validadores), True
+
+    def _registros_iguais(self, anterior: Optional[Dict], novo: Dict) -> bool:
+        """Compara dois registros do cache ignorando os validadores HTTP."""
+        if anterior is None:
+            return False
+        ignorar = ('etag', 'last_modified')
+        return {k: v for k, v in anterior.items() if k not in ignorar} == \
+            {k: v for k, v in novo.items() if k not in ignorar}
+
+    def _decode_cached(self, cache_key: str, data: Dict) -> Optional[Pokemon]:
+        """
+        Decodifica uma entrada de detalhes do cache.
+
+        Aceita o formato compacto atual e o payload bruto da PokeAPI gravado
+        por versões anteriores. Retorna None para formatos desconhecidos.
+        """
+        try:
+            if data.get("v") == CACHE_SCHEMA_VERSION:
+                return Pokemon.from_record(data)
+            if "v" not in data and "stats" in data:
+                return self._create_pokemon_object(data)
+        except (KeyError, TypeError) as e:
+            self.logger.warning(f"Entrada de cache inválida para {cache_key}: {str(e)}")
+        return None
+
+    def migrate_legacy_cache(self) -> int:
+        """
+        Migra os arquivos ``<chave>.json`` do cache antigo para o backend atual.
+
+        Detalhes são convertidos para o formato compacto; arquivos expirados
+        são descartados. Com o backend SQLite os arquivos migrados são
+        removidos. Retorna a quantidade de entradas migradas.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return 0
+
+        now = time.time()
+        ttl = self.cache_expiry.total_seconds()
+        items = []
+        arquivos = []
+        for nome in os.listdir(self.cache_dir):
+            if not nome.endswith(".json") or not nome.startswith(("pokemon_details_", "pokemon_list_")):
+                continue
+            path = os.path.join(self.cache_dir, nome)
+            cache_key = nome[:-len(".json")]
+            if cache_key.startswith("pokemon_list_"):
+                # Listas por (limit, offset) foram substituídas pelo índice completo
+                arquivos.append(path)
+                continue
+            try:
+                if now - os.path.getmtime(path) >= ttl:
+                    arquivos.append(path)
+                    continue
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            if cache_key.startswith("pokemon_details_"):
+                if data.get("v") == CACHE_SCHEMA_VERSION:
+                    continue
+                pokemon = self._decode_cached(cache_key, data)
+                if pokemon is None:
+                    continue
+                data = pokemon.to_record()
+            items.append((cache_key, data))
+            arquivos.append(path)
+
+        self.cache.set_many(items)
+
+        if not isinstance(self.cache, JsonFileCacheBackend):
+            for path in arquivos:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+        if items:
+            self.logger.info(f"{len(items)} entradas de cache migradas para o formato atual")
+        return len(items)
+
+    def purge_cache(self) -> int:
+        """
+        Remove do cache persistente as entradas que não podem mais ser servidas.
+
+        Entradas expiradas continuam guardadas até ``hard_expiry``: além do
+        stale-while-revalidate, seus validadores permitem revalidação
+        condicional. Retorna a quantidade de entradas removidas.
+        """
+        removidos = self.cache.purge_expired((self.hard_expiry - self.cache_expiry).total_seconds())
+        if removidos:
+            self.logger.info(f"{removidos} entradas vencidas removidas do cache")
+        return removidos
+
+    def cache_stats(self) -> Dict:
+        """Retorna os contadores da camada de cache em memória e de stale-while-revalidate."""
+        return {**self.memory_cache.stats(), **self.stale_stats}
+
+    async def _get_pokemon(self, session: aiohttp.ClientSession, url: str) -> Pokemon:
+        """Obtém um Pokémon, consultando primeiro o cache em memória."""
+        pokemon_id = url.split('/')[-2]
+
+        async def carregar() -> Pokemon:
+            return await self._get_pokemon_details(session, url)
+
+        # _get_pokemon_details guarda o Pokémon na memória com a validade da origem
+        return await self.memory_cache.get_or_load(pokemon_id, carregar, armazenar=False)
+
+    async def _get_pokemon_details(self, session: aiohttp.ClientSession, url: str) -> Pokemon:
         """Obtém detalhes de um Pokémon específico."""
         # Extrai o ID do Pokémon da URL
         pokemon_id = url.split('/')[-2]
         cache_key = f"pokemon_details_{pokemon_id}"
         
-        # Verifica cache
-        cached_data = self._get_from_cache(cache_key)
-        if cached_data:
-            return cached_data
-            
-        # Se não estiver em cache, faz a requisição
-        async with session.get(url) as response:
-            response.raise_for_status()
-            data = await response.json()
-            self._save_to_cache(cache_key, data)
-            return data
+        # Verifica cache (incluindo entradas expiradas servíveis)
+        pokemon = self._detalhes_do_cache(pokemon_id, url)
+        if pokemon is not None:
+            return pokemon
+
+        async with self._lock_entre_processos(cache_key):
+            if self.lock_dir is not None:
+                # Outro processo pode ter buscado o Pokémon enquanto aguardávamos
+                pokemon = self._detalhes_do_cache(pokemon_id, url)
+                if pokemon is not None:
+                    return pokemon
+
+            # Se não estiver em cache, faz a requisição e guarda só os campos projetados
+            _, data, validadores = await self._fetch(session, url)
+            pokemon = self._create_pokemon_object(data)
+            registro = self._registro_cache(pokemon, validadores)
+            anterior = self.cache.get_many([cache_key], incluir_expirados=True).get(cache_key)
+            self._save_to_cache(cache_key, registro)
+            # Publicado ao fim da extração, uma vez para todos os IDs alterados
+            if not self._registros_iguais(anterior, registro):
+                self._alterados.add(int(pokemon_id))
+            self.memory_cache.set(pokemon_id, pokemon)
+            return pokemon
+
+    def _detalhes_do_cache(self, pokemon_id: str, url: str) -> Optional[Pokemon]:
+        """
+        Lê os detalhes do cache persistente, agendando revalidação se expirados.
+
+        O Pokémon encontrado vai para a memória: até a expiração da entrada
+        persistente, ou por ``_STALE_RETRY`` segundos se ela já expirou.
+        """
+        cache_key = f"pokemon_details_{pokemon_id}"
+        entry = self.cache.get_entries([cache_key], self._tolerancia_stale()).get(cache_key)
+        if entry is None:
+            return None
+        cached_data, expires_at = entry
+        pokemon = self._decode_cached(cache_key, cached_data)
+        if pokemon is None:
+            return None
+        if cached_data.get("v") != CACHE_SCHEMA_VERSION:
+            self._save_to_cache(cache_key, pokemon.to_record())
+        agora = time.time()
+        if expires_at > agora:
+            # A memória não deve sobreviver à entrada persistente
+            self.memory_cache.set(pokemon_id, pokemon, ttl=expires_at - agora)
+        else:
+            self._servir_stale(pokemon_id, url, cached_data, pokemon)
+        return pokemon
+
+    def _registro_cache(self, pokemon: Pokemon, validadores: Dict[str, str]) -> Dict:
+        """Monta o registro compacto do cache com os validadores HTTP da resposta."""
+        registro = pokemon.to_record()
+        if 'ETag' in validadores:
+            registro['etag'] = validadores['ETag']
+        if 'Last-Modified' in validadores:
+            registro['last_modified'] = validadores['Last-Modified']
+        return registro
         
     def _create_pokemon_object(self, data: Dict) -> Pokemon:
         """Cria objeto Pokemon a partir dos dados da API."""
@@ -104,9 +810,10 @@ class DataExtractor:
             nome=data['name'],
             experiencia_base=data['base_experience'],
             tipos=[t['type']['name'] for t in data['types']],
-            hp=next(s['base_stat'] for s in data['stats'] if s['stat']['name'] == 'hp'),
-            ataque=next(s['base_stat'] for s in data['stats'] if s['stat']['name'] == 'attack'),
-            defesa=next(s['base_stat'] for s in data['stats'] if s['stat']['name'] == 'defense')
+            altura=data['height'],
+            peso=data['weight'],
+            especie=data['species']['name'],
+            **decode_stats(data['stats'])
         )
         
     def _pokemon_to_dict(self, pokemon: Pokemon) -> Dict:
@@ -119,23 +826,20 @@ class DataExtractor:
             "hp": pokemon.hp,
             "ataque": pokemon.ataque,
             "defesa": pokemon.defesa,
+            "ataque_especial": pokemon.ataque_especial,
+            "defesa_especial": pokemon.defesa_especial,
+            "velocidade": pokemon.velocidade,
+            "altura": pokemon.altura,
+            "peso": pokemon.peso,
+            "especie": pokemon.especie,
             "categoria": pokemon.categoria
         }
         
     def _get_from_cache(self, key: str) -> Dict:
         """Recupera dados do cache."""
-        cache_file = os.path.join(self.cache_dir, f"{key}.json")
-        
-        if os.path.exists(cache_file):
-            # Verifica se o cache expirou
-            file_time = datetime.fromtimestamp(os.path.getmtime(cache_file))
-            if datetime.now() - file_time < self.cache_expiry:
-                with open(cache_file, 'r') as f:
-                    return json.load(f)
-        return None
+        return self.cache.get(key)
         
     def _save_to_cache(self, key: str, data: Dict):
         """Salva dados no cache."""
-        cache_file = os.path.join(self.cache_dir, f"{key}.json")
-        with open(cache_file, 'w') as f:
-            json.dump(data, f) 
\ No newline at end of file
+        self.cache.set(key, data)
+
@@ -0,0 +1,588 @@
+import abc
+import asyncio
+import csv
+import gzip
+import hashlib
+import itertools
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from controllers.aggregates import STATS, AggregateState
+from controllers.metrics import observe_stage
+from utils.lazy_imports import lazy_import
+
+# pyarrow e zstandard são opcionais: sem pyarrow não há Parquet nem Arrow IPC,
+# sem zstandard não há CSV zstd. Ambos só são carregados no primeiro uso.
+try:
+    pa = lazy_import("pyarrow")
+except ImportError:
+    pa = None
+
+try:
+    zstandard = lazy_import("zstandard")
+except ImportError:
+    zstandard = None
+
+# Formatos de exportação; a extensão dos arquivos é o próprio nome do formato
+FORMATOS_EXPORTACAO = ("parquet", "arrow", "csv", "csv.gz", "csv.zst")
+
+# Colunas do conjunto de Pokémon exportado (formato de _pokemon_to_dict). Todas
+# aceitam nulos: experiencia_base é None quando a PokeAPI não a informa
+COLUNAS_POKEMON = (
+    ("id", "int"),
+    ("nome", "str"),
+    ("experiencia_base", "int"),
+    ("tipos", "lista"),
+    ("hp", "int"),
+    ("ataque", "int"),
+    ("defesa", "int"),
+    ("ataque_especial", "int"),
+    ("defesa_especial", "int"),
+    ("velocidade", "int"),
+    ("altura", "int"),
+    ("peso", "int"),
+    ("especie", "str"),
+    ("categoria", "str"),
+)
+
+# Colunas das agregações: médias por tipo e ranking de experiência
+COLUNAS_TIPOS = (("tipo", "str"), ("quantidade", "int"), *((stat, "float") for stat in STATS))
+COLUNAS_TOP = (("posicao", "int"), ("nome", "str"), ("experiencia_base", "int"))
+
+# Arquivos de cada exportação e suas colunas
+_ARQUIVOS = {
+    "pokemon": ("pokemon", COLUNAS_POKEMON),
+    "tipos": ("analise_tipos", COLUNAS_TIPOS),
+    "top": ("top_experiencia", COLUNAS_TOP),
+}
+
+# Tipo de cada coluna conhecida, usado ao converter valores lidos de CSV
+_TIPOS_COLUNAS = dict(COLUNAS_POKEMON + COLUNAS_TIPOS + COLUNAS_TOP)
+
+# Separador dos tipos de um Pokémon nas colunas de lista em CSV
+_SEPARADOR_LISTA = "/"
+
+# Máximo de linhas devolvidas por leitura
+MAX_LINHAS_LEITURA = 1000
+
+# Tamanho do hash usado como nome do diretório de cada exportação (o mesmo
+# dos diretórios de análise do ReportGenerator)
+_HASH_LEN = 16
+
+class DataExporter:
+    """
+    Exporta o conjunto de Pokémon e as agregações para análise externa.
+
+    Os registros de ``DataExtractor.extract_stream`` são gravados em grupos
+    de ``tamanho_grupo`` linhas (row groups no Parquet, record batches no
+    Arrow IPC, blocos de linhas no CSV) à medida que chegam, e as
+    agregações são acumuladas em um AggregateState na mesma passagem. A
+    memória usada fica limitada a dois grupos, independentemente do
+    tamanho do conjunto: enquanto um grupo é gravado em uma thread, o
+    próximo é extraído.
+
+    Cada exportação é publicada em um diretório com o hash do seu conteúdo
+    e nunca é regravada: uma leitura em andamento não vê o arquivo mudar, e
+    a remoção de exportações antigas fica com ``ao_publicar``.
+    """
+
+    def __init__(
+        self,
+        extractor,
+        output_dir: str = os.path.join("relatorios", "exportacoes"),
+        tamanho_grupo: int = 500,
+        compressao_parquet: str = "zstd",
+        ao_publicar: Optional[Callable[[str], None]] = None,
+    ):
+        """
+        Args:
+            extractor: DataExtractor de onde os Pokémon são obtidos
+            output_dir: Diretório das exportações
+            tamanho_grupo: Linhas por grupo gravado
+            compressao_parquet: Codec do Parquet (zstd, snappy, gzip ou none)
+            ao_publicar: Chamada em uma thread com o diretório de cada
+                exportação publicada (ex.: ``ReportGenerator.purge``)
+        """
+        if tamanho_grupo < 1:
+            raise ValueError("tamanho_grupo deve ser positivo")
+        self.extractor = extractor
+        self.output_dir = output_dir
+        self.tamanho_grupo = tamanho_grupo
+        self.compressao_parquet = compressao_parquet
+        self.ao_publicar = ao_publicar
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def formatos_disponiveis(self) -> List[str]:
+        """Formatos cujas dependências opcionais estão instaladas."""
+        return [formato for formato in FORMATOS_EXPORTACAO if _dependencia_ausente(formato) is None]
+
+    @property
+    def formato_padrao(self) -> str:
+        """Parquet quando o pyarrow está instalado; CSV gzip caso contrário."""
+        return "parquet" if pa is not None else "csv.gz"
+
+    async def export(self, limit: int = 100, offset: int = 0, formato: Optional[str] = None) -> Dict:
+        """
+        Extrai os Pokémon e grava o conjunto completo e as agregações.
+
+        Os arquivos são gravados em um diretório privado e publicados
+        juntos, renomeando-o para ``<output_dir>/<hash>/``, em que o hash
+        cobre as linhas exportadas, o formato e as opções de gravação. Se a
+        mesma exportação já existe, ela é reaproveitada sem ser regravada.
+        As linhas do conjunto de Pokémon seguem a ordem da listagem
+        (crescente por ID).
+
+        Args:
+            limit: Quantidade de Pokémon para exportar
+            offset: Posição do primeiro Pokémon na listagem
+            formato: Um de FORMATOS_EXPORTACAO; sem valor, ``formato_padrao``
+
+        Returns:
+            Dicionário com os caminhos gravados, o total de linhas, a
+            quantidade de grupos e as estatísticas gerais
+
+        Raises:
+            ValueError: limit/offset inválidos, formato desconhecido ou sem a
+                dependência instalada
+        """
+        formato = self._validar_formato(formato or self.formato_padrao)
+        if limit < 1:
+            raise ValueError("limit deve ser positivo")
+        if offset < 0:
+            raise ValueError("offset não pode ser negativo")
+
+        # Diretórios em preparo começam com ponto; a remoção de antigos só os
+        # descarta depois de max_age (preparo abandonado)
+        preparo = os.path.join(self.output_dir, f".{uuid.uuid4().hex}.tmp")
+        os.makedirs(preparo)
+        arquivos = {nome: f"{arquivo}.{formato}" for nome, (arquivo, _) in _ARQUIVOS.items()}
+        caminhos = {nome: os.path.join(preparo, arquivo) for nome, arquivo in arquivos.items()}
+        # Opções que mudam o conteúdo dos arquivos entram no hash
+        resumo = hashlib.sha256(json.dumps([formato, self.compressao_parquet, self.tamanho_grupo]).encode())
+
+        estado = AggregateState()
+        erros: List[Dict] = []
+        try:
+            # A primeira criação carrega o pyarrow; fica fora do event loop
+            escritor = await asyncio.to_thread(
+                _criar_escritor, formato, caminhos["pokemon"], COLUNAS_POKEMON, self.compressao_parquet
+            )
+            try:
+                gravacao = await self._gravar_stream(escritor, estado, erros, resumo, limit, offset)
+                if estado.total == 0:
+                    escritor.descartar()
+                    return {"status": "error", "message": "Nenhum Pokémon pôde ser extraído", "erros": erros}
+
+                inicio = time.perf_counter()
+                await asyncio.to_thread(escritor.fechar)
+                analise = estado.finalize()
+                await asyncio.to_thread(self._gravar_agregados, formato, caminhos, estado, analise)
+                destino = await asyncio.to_thread(self._publicar, preparo, resumo.hexdigest()[:_HASH_LEN])
+                observe_stage("export", gravacao + time.perf_counter() - inicio)
+            except BaseException:
+                escritor.descartar()
+                raise
+        finally:
+            # Depois da publicação o diretório em preparo já não existe
+            shutil.rmtree(preparo, ignore_errors=True)
+
+        if self.ao_publicar is not None:
+            await asyncio.to_thread(self.ao_publicar, destino)
+
+        result = {
+            "status": "partial" if erros else "success",
+            "formato": formato,
+            "total": estado.total,
+            "grupos": escritor.grupos,
+            "arquivos": {nome: os.path.join(destino, arquivo) for nome, arquivo in arquivos.items()},
+            "estatisticas": analise["estatisticas"],
+        }
+        if erros:
+            result["erros"] = erros
+        return result
+
+    def read(
+        self,
+        path: str,
+        colunas: Optional[Sequence[str]] = None,
+        offset: int = 0,
+        limite: int = 100,
+    ) -> Dict:
+        """
+        Lê uma faixa de linhas de um arquivo exportado.
+
+        Arrow IPC é mapeado em memória e lido sem cópia; no Parquet só os
+        grupos que cobrem a faixa e as colunas pedidas são lidos; o CSV é
+        percorrido em stream até o fim da faixa. Nenhum dos caminhos carrega
+        o arquivo inteiro.
+
+        Args:
+            path: Caminho do arquivo, dentro de ``output_dir``
+            colunas: Colunas retornadas; sem valor, todas
+            offset: Primeira linha retornada
+            limite: Quantidade máxima de linhas (até MAX_LINHAS_LEITURA)
+
+        Returns:
+            Dicionário com as linhas em ``data``, ``mais`` indicando se há
+            linhas depois da faixa e ``total`` quando o formato o informa
+
+        Raises:
+            ValueError: Arquivo fora de ``output_dir`` ou inexistente, formato
+                sem dependência instalada, faixa ou colunas inválidas
+        """
+        base = os.path.abspath(self.output_dir)
+        if not os.path.abspath(path).startswith(base + os.sep) or not os.path.isfile(path):
+            raise ValueError("Arquivo de exportação não encontrado")
+        try:
+            # Marca o uso recente para a política de remoção
+            os.utime(os.path.dirname(path))
+        except OSError:
+            pass
+        formato = next((f for f in sorted(FORMATOS_EXPORTACAO, key=len, reverse=True) if path.endswith(f".{f}")), None)
+        if formato is None:
+            raise ValueError("Arquivo de exportação não encontrado")
+        self._validar_formato(formato)
+        if offset < 0:
+            raise ValueError("offset não pode ser negativo")
+        if not 1 <= limite <= MAX_LINHAS_LEITURA:
+            raise ValueError(f"limite deve estar entre 1 e {MAX_LINHAS_LEITURA}")
+
+        colunas = list(colunas) if colunas else None
+        data, mais, total = _LEITORES[formato](path, colunas, offset, limite)
+        result = {"status": "success", "formato": formato, "offset": offset, "mais": mais, "data": data}
+        if total is not None:
+            result["total"] = total
+        return result
+
+    # --- MÉTODOS PRIVADOS (AUXILIARES) ---
+
+    def _validar_formato(self, formato: str) -> str:
+        """Confere se o formato existe e se sua dependência está instalada."""
+        if formato not in FORMATOS_EXPORTACAO:
+            raise ValueError(f"Formato de exportação inválido: {formato} (use {', '.join(FORMATOS_EXPORTACAO)})")
+        ausente = _dependencia_ausente(formato)
+        if ausente is not None:
+            raise ValueError(
+                f"Formato {formato} requer o pacote {ausente}; "
+                f"disponíveis: {', '.join(self.formatos_disponiveis)}"
+            )
+        return formato
+
+    async def _gravar_stream(
+        self,
+        escritor: "_Escritor",
+        estado: AggregateState,
+        erros: List[Dict],
+        resumo,
+        limit: int,
+        offset: int,
+    ) -> float:
+        """
+        Grava os registros do stream em grupos, com no máximo um em gravação.
+
+        Cada grupo também é incluído em ``resumo`` (um hash), na ordem da
+        listagem. Retorna o tempo (s) em que o event loop esperou pela
+        gravação; o restante é registrado na etapa extract.
+        """
+        lote: List[Dict] = []
+        pendente: Optional[asyncio.Future] = None
+        espera = 0.0
+        inicio = time.perf_counter()
+        try:
+            async for registro in self.extractor.extract_stream(limit, offset, erros=erros, ordenado=True):
+                estado.add(registro)
+                lote.append(registro)
+                if len(lote) >= self.tamanho_grupo:
+                    if pendente is not None:
+                        inicio_espera = time.perf_counter()
+                        await pendente
+                        espera += time.perf_counter() - inicio_espera
+                    pendente = asyncio.ensure_future(asyncio.to_thread(_gravar_grupo, escritor, resumo, lote))
+                    lote = []
+
+            inicio_espera = time.perf_counter()
+            if pendente is not None:
+                await pendente
+            if lote:
+                await asyncio.to_thread(_gravar_grupo, escritor, resumo, lote)
+            espera += time.perf_counter() - inicio_espera
+        except BaseException:
+            # A thread não é interrompida; espera terminar antes de descartar
+            if pendente is not None:
+                await asyncio.wait([pendente])
+            raise
+        finally:
+            observe_stage("extract", time.perf_counter() - inicio - espera)
+        return espera
+
+    def _publicar(self, preparo: str, nome: str) -> str:
+        """Renomeia o diretório em preparo para ``<output_dir>/<nome>`` e retorna o caminho."""
+        destino = os.path.join(self.output_dir, nome)
+        try:
+            os.rename(preparo, destino)
+        except OSError:
+            if not os.path.isdir(destino):
+                raise
+            # Mesmo conteúdo já publicado: os arquivos existentes podem estar
+            # em leitura e não são substituídos
+            os.utime(destino)
+        return destino
+
+    def _gravar_agregados(self, formato: str, caminhos: Dict[str, str], estado: AggregateState, analise: Dict):
+        """Grava as médias por tipo e o ranking de experiência."""
+        linhas_tipos = [
+            {
+                "tipo": tipo,
+                "quantidade": estado.por_tipo[tipo][0],
+                **{stat: analise["tipos_analise"][stat][tipo] for stat in STATS},
+            }
+            for tipo in sorted(estado.por_tipo)
+        ]
+        linhas_top = [{"posicao": i, **item} for i, item in enumerate(analise["top_experiencia"], start=1)]
+
+        for nome, linhas in (("tipos", linhas_tipos), ("top", linhas_top)):
+            escritor = _criar_escritor(formato, caminhos[nome], _ARQUIVOS[nome][1], self.compressao_parquet)
+            try:
+                if linhas:
+                    escritor.escrever(linhas)
+                escritor.fechar()
+            except BaseException:
+                escritor.descartar()
+                raise
+
+
+def _gravar_grupo(escritor: "_Escritor", resumo, registros: List[Dict]):
+    """Inclui as colunas exportadas de ``registros`` em ``resumo`` e grava o grupo."""
+    linhas = [[registro[nome] for nome, _ in COLUNAS_POKEMON] for registro in registros]
+    resumo.update(json.dumps(linhas, ensure_ascii=False).encode("utf-8"))
+    escritor.escrever(registros)
+
+
+def _dependencia_ausente(formato: str) -> Optional[str]:
+    """Nome do pacote opcional que falta para ``formato``, se houver."""
+    if formato in ("parquet", "arrow") and pa is None:
+        return "pyarrow"
+    if formato == "csv.zst" and zstandard is None:
+        return "zstandard"
+    return None
+
+
+def _schema(colunas: Sequence[Tuple[str, str]]):
+    """Schema Arrow das colunas."""
+    tipos = {"int": pa.int64(), "float": pa.float64(), "str": pa.string(), "lista": pa.list_(pa.string())}
+    return pa.schema([(nome, tipos[tipo]) for nome, tipo in colunas])
+
+
+def _abrir_csv(path: str, modo: str, nome: Optional[str] = None):
+    """Abre um CSV em modo texto, comprimido conforme a extensão de ``nome`` (ou de ``path``)."""
+    nome = nome or path
+    if nome.endswith(".gz"):
+        return gzip.open(path, modo, compresslevel=6, encoding="utf-8", newline="")
+    if nome.endswith(".zst"):
+        return zstandard.open(path, modo, encoding="utf-8", newline="")
+    return open(path, modo, encoding="utf-8", newline="")
+
+
+class _Escritor(abc.ABC):
+    """Grava grupos de registros em um arquivo temporário, publicado ao fechar."""
+
+    def __init__(self, path: str, colunas: Sequence[Tuple[str, str]]):
+        self.path = path
+        self.colunas = colunas
+        self.tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        self.grupos = 0
+        self._aberto = True
+
+    def escrever(self, registros: List[Dict]):
+        """Grava um grupo de registros."""
+        self._gravar(registros)
+        self.grupos += 1
+
+    def fechar(self):
+        """Finaliza o arquivo e o move para ``path``."""
+        self._aberto = False
+        self._encerrar()
+        os.replace(self.tmp, self.path)
+
+    def descartar(self):
+        """Fecha e remove o arquivo temporário, sem publicar."""
+        if self._aberto:
+            self._aberto = False
+            try:
+                self._encerrar()
+            except Exception:
+                pass
+        if os.path.exists(self.tmp):
+            os.remove(self.tmp)
+
+    @abc.abstractmethod
+    def _gravar(self, registros: List[Dict]):
+        """Grava um grupo de registros no arquivo temporário."""
+
+    @abc.abstractmethod
+    def _encerrar(self):
+        """Finaliza e fecha o arquivo temporário."""
+
+
+class _EscritorParquet(_Escritor):
+    """Um row group por grupo de registros."""
+
+    def __init__(self, path: str, colunas: Sequence[Tuple[str, str]], compressao: str):
+        import pyarrow.parquet as pq
+
+        super().__init__(path, colunas)
+        self.schema = _schema(colunas)
+        self._writer = pq.ParquetWriter(self.tmp, self.schema, compression=compressao)
+
+    def _gravar(self, registros: List[Dict]):
+        tabela = pa.Table.from_pylist(registros, schema=self.schema)
+        self._writer.write_table(tabela, row_group_size=len(registros))
+
+    def _encerrar(self):
+        self._writer.close()
+
+
+class _EscritorArrow(_Escritor):
+    """
+    Arquivo Arrow IPC com um record batch por grupo.
+
+    Sem compressão: os buffers ficam prontos para leitura mapeada em memória.
+    """
+
+    def __init__(self, path: str, colunas: Sequence[Tuple[str, str]]):
+        super().__init__(path, colunas)
+        self.schema = _schema(colunas)
+        self._sink = pa.OSFile(self.tmp, "wb")
+        self._writer = pa.ipc.new_file(self._sink, self.schema)
+
+    def _gravar(self, registros: List[Dict]):
+        self._writer.write_batch(pa.RecordBatch.from_pylist(registros, schema=self.schema))
+
+    def _encerrar(self):
+        try:
+            self._writer.close()
+        finally:
+            self._sink.close()
+
+
+class _EscritorCsv(_Escritor):
+    """CSV com cabeçalho, comprimido em stream conforme a extensão."""
+
+    def __init__(self, path: str, colunas: Sequence[Tuple[str, str]]):
+        super().__init__(path, colunas)
+        self._arquivo = _abrir_csv(self.tmp, "wt", nome=path)
+        self._writer = csv.writer(self._arquivo)
+        self._writer.writerow([nome for nome, _ in colunas])
+        self._listas = [tipo == "lista" for _, tipo in colunas]
+
+    def _gravar(self, registros: List[Dict]):
+        nomes = [nome for nome, _ in self.colunas]
+        self._writer.writerows(
+            [
+                _SEPARADOR_LISTA.join(valor) if lista else valor
+                for valor, lista in zip((registro[nome] for nome in nomes), self._listas)
+            ]
+            for registro in registros
+        )
+
+    def _encerrar(self):
+        self._arquivo.close()
+
+
+def _criar_escritor(formato: str, path: str, colunas: Sequence[Tuple[str, str]], compressao_parquet: str) -> _Escritor:
+    """Cria o escritor do formato."""
+    if formato == "parquet":
+        return _EscritorParquet(path, colunas, compressao_parquet)
+    if formato == "arrow":
+        return _EscritorArrow(path, colunas)
+    return _EscritorCsv(path, colunas)
+
+
+def _validar_colunas(disponiveis: List[str], colunas: Optional[List[str]]):
+    """Garante que as colunas pedidas existem no arquivo."""
+    desconhecidas = [coluna for coluna in colunas or [] if coluna not in disponiveis]
+    if desconhecidas:
+        raise ValueError(
+            f"Colunas desconhecidas: {', '.join(desconhecidas)}; disponíveis: {', '.join(disponiveis)}"
+        )
+
+
+def _ler_arrow(path: str, colunas: Optional[List[str]], offset: int, limite: int) -> Tuple[List[Dict], bool, int]:
+    """Lê uma faixa de um Arrow IPC mapeado em memória, sem copiar os buffers."""
+    with pa.memory_map(path) as fonte:
+        tabela = pa.ipc.open_file(fonte).read_all()
+        _validar_colunas(tabela.schema.names, colunas)
+        if colunas:
+            tabela = tabela.select(colunas)
+        total = tabela.num_rows
+        # Só as linhas da faixa são convertidas em objetos Python
+        return tabela.slice(offset, limite).to_pylist(), offset + limite < total, total
+
+
+def _ler_parquet(path: str, colunas: Optional[List[str]], offset: int, limite: int) -> Tuple[List[Dict], bool, int]:
+    """Lê uma faixa de um Parquet decodificando só os grupos e colunas necessários."""
+    import pyarrow.parquet as pq
+
+    arquivo = pq.ParquetFile(path, memory_map=True)
+    _validar_colunas(arquivo.schema_arrow.names, colunas)
+    total = arquivo.metadata.num_rows
+
+    grupos, pular, inicio_grupo = [], 0, 0
+    for i in range(arquivo.num_row_groups):
+        linhas = arquivo.metadata.row_group(i).num_rows
+        if inicio_grupo + linhas > offset and inicio_grupo < offset + limite:
+            if not grupos:
+                pular = offset - inicio_grupo
+            grupos.append(i)
+        inicio_grupo += linhas
+    if not grupos:
+        return [], False, total
+
+    tabela = arquivo.read_row_groups(grupos, columns=colunas)
+    return tabela.slice(pular, limite).to_pylist(), offset + limite < total, total
+
+
+def _ler_csv(path: str, colunas: Optional[List[str]], offset: int, limite: int) -> Tuple[List[Dict], bool, None]:
+    """Lê uma faixa de um CSV (comprimido ou não) em stream, até o fim da faixa."""
+    with _abrir_csv(path, "rt") as arquivo:
+        leitor = csv.reader(arquivo)
+        cabecalho = next(leitor, [])
+        _validar_colunas(cabecalho, colunas)
+        indices = [cabecalho.index(coluna) for coluna in colunas] if colunas else list(range(len(cabecalho)))
+        tipos = [_TIPOS_COLUNAS.get(cabecalho[i], "str") for i in indices]
+
+        # Uma linha além da faixa indica se há mais linhas
+        linhas = list(itertools.islice(leitor, offset, offset + limite + 1))
+    mais = len(linhas) > limite
+    data = [
+        {cabecalho[i]: _converter(linha[i], tipo) for i, tipo in zip(indices, tipos)}
+        for linha in linhas[:limite]
+    ]
+    return data, mais, None
+
+
+def _converter(valor: str, tipo: str):
+    """Converte um valor de CSV para o tipo da coluna."""
+    if tipo == "lista":
+        return valor.split(_SEPARADOR_LISTA) if valor else []
+    if tipo == "str":
+        return valor
+    if valor == "":
+        return None
+    return int(valor) if tipo == "int" else float(valor)
+
+
+# Leitor de cada formato: (path, colunas, offset, limite) -> (linhas, mais, total)
+_LEITORES = {
+    "parquet": _ler_parquet,
+    "arrow": _ler_arrow,
+    "csv": _ler_csv,
+    "csv.gz": _ler_csv,
+    "csv.zst": _ler_csv,
+}
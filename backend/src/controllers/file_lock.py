@@ -0,0 +1,96 @@
+import asyncio
+import os
+import time
+from typing import Optional
+
+# fcntl só existe em POSIX; sem ele os locks viram no-op (um único processo)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+class FileLock:
+    """
+    Lock exclusivo entre processos baseado em ``flock`` sobre um arquivo.
+
+    Pode ser usado de forma síncrona (``with``), bloqueando a thread, ou
+    assíncrona (``async with``), tentando sem bloquear e cedendo o event loop
+    entre as tentativas. O lock é liberado automaticamente se o processo
+    morrer, então não há locks órfãos.
+    """
+
+    def __init__(self, path: str, poll_interval: float = 0.02, timeout: Optional[float] = None):
+        """
+        Args:
+            path: Arquivo usado como lock (criado se não existir)
+            poll_interval: Intervalo entre tentativas no modo assíncrono, em segundos
+            timeout: Tempo máximo de espera; None espera indefinidamente
+        """
+        self.path = path
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._fd: Optional[int] = None
+
+    def _abrir(self) -> int:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def try_acquire(self) -> bool:
+        """Tenta obter o lock sem esperar."""
+        if fcntl is None:
+            return True
+        fd = self._abrir()
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def acquire(self):
+        """Obtém o lock, bloqueando a thread atual."""
+        if fcntl is None:
+            return
+        fd = self._abrir()
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        self._fd = fd
+
+    async def acquire_async(self):
+        """Obtém o lock sem bloquear o event loop."""
+        limite = None if self.timeout is None else time.monotonic() + self.timeout
+        while not self.try_acquire():
+            if limite is not None and time.monotonic() >= limite:
+                raise TimeoutError(f"Tempo esgotado aguardando o lock {self.path}")
+            await asyncio.sleep(self.poll_interval)
+
+    def release(self):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+    def locked_elsewhere(self) -> bool:
+        """Indica se outro processo (ou outra instância) detém o lock agora."""
+        if self._fd is not None:
+            return False
+        if not self.try_acquire():
+            return True
+        self.release()
+        return False
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    async def __aenter__(self) -> "FileLock":
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.release()
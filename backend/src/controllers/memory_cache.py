@@ -0,0 +1,151 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+class MemoryCache:
+    """
+    Cache em memória com política LRU, expiração por TTL e coalescência
+    de requisições (single-flight).
+
+    Vários ``get_or_load`` simultâneos para a mesma chave ausente executam
+    o carregador apenas uma vez; os demais aguardam o mesmo resultado.
+    """
+
+    def __init__(self, max_size: int = 2048, ttl: float = 24 * 3600):
+        """
+        Args:
+            max_size: Quantidade máxima de entradas mantidas em memória
+            ttl: Tempo de vida de cada entrada, em segundos
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+        # Contadores
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Indica se há entrada válida para a chave, sem alterar contadores."""
+        entry = self._data.get(key)
+        return entry is not None and entry[1] > time.monotonic()
+
+    def get(self, key: Hashable, validar: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        """
+        Recupera um valor, ou None se ausente ou expirado.
+
+        Se ``validar`` for informado e rejeitar o valor, a entrada é
+        descartada e a consulta conta como falta.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        if validar is not None and not validar(value):
+            del self._data[key]
+            self.invalidations += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Armazena um valor, removendo o menos usado se o limite for atingido.
+
+        ``ttl`` substitui o tempo de vida padrão para esta entrada.
+        """
+        self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """Remove uma entrada do cache."""
+        self._data.pop(key, None)
+
+    def clear(self):
+        """Remove todas as entradas do cache."""
+        self._data.clear()
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        validar: Optional[Callable[[Any], bool]] = None,
+        armazenar: bool = True,
+    ) -> Any:
+        """
+        Retorna o valor em cache ou o carrega com ``loader``.
+
+        Chamadas concorrentes para a mesma chave compartilham um único
+        carregamento. O carregador roda em uma tarefa própria: cancelar
+        qualquer chamador, inclusive o que iniciou a carga, não interrompe
+        o carregamento nem afeta os demais chamadores. Um valor em cache
+        rejeitado por ``validar`` é recarregado. Com ``armazenar=False`` o
+        valor carregado não é guardado com o TTL padrão: o carregador o
+        guarda com ``set`` e o tempo de vida adequado, se for o caso.
+        """
+        value = self.get(key, validar)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._load(key, loader, armazenar))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        # shield: o cancelamento de um chamador cancela só a sua espera
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], armazenar: bool = True) -> Any:
+        """Executa o carregador e armazena o resultado, se houver."""
+        value = await loader()
+        if armazenar and value is not None:
+            self.set(key, value)
+        return value
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        """Encerra uma carga em andamento."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Marca a exceção como lida caso nenhum chamador esteja aguardando
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict:
+        """Retorna os contadores do cache."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "coalesced": self.coalesced,
+        }
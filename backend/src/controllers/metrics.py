@@ -0,0 +1,328 @@
+import abc
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# OpenTelemetry é opcional: sem o pacote, apenas as métricas são registradas
+try:
+    from opentelemetry import trace as _otel_trace
+except ImportError:
+    _otel_trace = None
+
+# Limites padrão dos histogramas de latência, em segundos
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _formatar_rotulos(nomes: Sequence[str], valores: Sequence[str]) -> str:
+    if not nomes:
+        return ""
+    pares = []
+    for nome, valor in zip(nomes, valores):
+        valor = str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pares.append(f'{nome}="{valor}"')
+    return "{" + ",".join(pares) + "}"
+
+
+def _formatar_valor(valor: float) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if not float(valor).is_integer() else str(int(valor))
+
+
+class _Metric(abc.ABC):
+    """Base das métricas: valores indexados pelos valores dos rótulos."""
+
+    tipo = ""
+
+    def __init__(self, nome: str, descricao: str, rotulos: Sequence[str] = ()):
+        self.nome = nome
+        self.descricao = descricao
+        self.rotulos = tuple(rotulos)
+        self._lock = threading.Lock()
+
+    def _chave(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(nome, "")) for nome in self.rotulos)
+
+    @abc.abstractmethod
+    def _amostras(self) -> List[Tuple[str, LabelValues, float]]:
+        """Amostras atuais: (sufixo do nome, valores dos rótulos, valor)."""
+
+    def render(self, fixos: Sequence[Tuple[str, str]] = ()) -> List[str]:
+        """Linhas no formato texto do Prometheus; ``fixos`` são rótulos incluídos em todas as séries."""
+        nomes_fixos = tuple(nome for nome, _ in fixos)
+        valores_fixos = tuple(valor for _, valor in fixos)
+        linhas = [f"# HELP {self.nome} {self.descricao}", f"# TYPE {self.nome} {self.tipo}"]
+        for sufixo, valores, valor in self._amostras():
+            nomes = nomes_fixos + self.rotulos + (("le",) if len(valores) > len(self.rotulos) else ())
+            rotulos = _formatar_rotulos(nomes, valores_fixos + valores)
+            linhas.append(f"{self.nome}{sufixo}{rotulos} {_formatar_valor(valor)}")
+        return linhas
+
+
+class Counter(_Metric):
+    """Contador monotônico."""
+
+    tipo = "counter"
+
+    def __init__(self, nome: str, descricao: str, rotulos: Sequence[str] = ()):
+        super().__init__(nome, descricao, rotulos)
+        self._valores: Dict[LabelValues, float] = {}
+
+    def inc(self, valor: float = 1, **labels):
+        chave = self._chave(labels)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def _amostras(self):
+        with self._lock:
+            return [("", chave, valor) for chave, valor in sorted(self._valores.items())]
+
+
+class Gauge(_Metric):
+    """Valor que pode subir e descer (ex.: requisições em andamento)."""
+
+    tipo = "gauge"
+
+    def __init__(self, nome: str, descricao: str, rotulos: Sequence[str] = ()):
+        super().__init__(nome, descricao, rotulos)
+        self._valores: Dict[LabelValues, float] = {}
+
+    def inc(self, valor: float = 1, **labels):
+        chave = self._chave(labels)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def dec(self, valor: float = 1, **labels):
+        self.inc(-valor, **labels)
+
+    def set(self, valor: float, **labels):
+        with self._lock:
+            self._valores[self._chave(labels)] = valor
+
+    def _amostras(self):
+        with self._lock:
+            return [("", chave, valor) for chave, valor in sorted(self._valores.items())]
+
+
+class Histogram(_Metric):
+    """Histograma cumulativo com contagem e soma, no formato do Prometheus."""
+
+    tipo = "histogram"
+
+    def __init__(
+        self,
+        nome: str,
+        descricao: str,
+        rotulos: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(nome, descricao, rotulos)
+        self.buckets = tuple(sorted(buckets))
+        # Por série: contagens por bucket (o último é +Inf), soma e total
+        self._series: Dict[LabelValues, List] = {}
+
+    def observe(self, valor: float, **labels):
+        chave = self._chave(labels)
+        i = bisect.bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            serie[0][i] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def _amostras(self):
+        amostras = []
+        with self._lock:
+            for chave, (contagens, soma, total) in sorted(self._series.items()):
+                acumulado = 0
+                for limite, contagem in zip(self.buckets + (float("inf"),), contagens):
+                    acumulado += contagem
+                    amostras.append(("_bucket", chave + (_formatar_valor(limite),), acumulado))
+                amostras.append(("_sum", chave, soma))
+                amostras.append(("_count", chave, total))
+        return amostras
+
+
+class MetricsRegistry:
+    """
+    Registro das métricas do processo, exportadas no formato texto do
+    Prometheus.
+
+    Além das métricas registradas, aceita coletores: funções chamadas a cada
+    exportação que retornam métricas calculadas na hora (ex.: contadores dos
+    caches, que já são mantidos pelos próprios caches).
+    """
+
+    def __init__(self):
+        self._metricas: Dict[str, _Metric] = {}
+        self._coletores: List[Callable[[], Iterable[_Metric]]] = []
+        self._caches: List[Tuple[str, Callable[[], Dict]]] = []
+        self._fixos: Tuple[Tuple[str, str], ...] = ()
+
+    def set_constant_labels(self, **labels: str):
+        """Define rótulos incluídos em todas as séries (ex.: o worker com vários processos)."""
+        self._fixos = tuple(labels.items())
+
+    def _registrar(self, metrica: _Metric) -> _Metric:
+        existente = self._metricas.get(metrica.nome)
+        if existente is not None:
+            return existente
+        self._metricas[metrica.nome] = metrica
+        return metrica
+
+    def counter(self, nome: str, descricao: str, rotulos: Sequence[str] = ()) -> Counter:
+        return self._registrar(Counter(nome, descricao, rotulos))
+
+    def gauge(self, nome: str, descricao: str, rotulos: Sequence[str] = ()) -> Gauge:
+        return self._registrar(Gauge(nome, descricao, rotulos))
+
+    def histogram(
+        self,
+        nome: str,
+        descricao: str,
+        rotulos: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._registrar(Histogram(nome, descricao, rotulos, buckets))
+
+    def register_collector(self, coletor: Callable[[], Iterable[_Metric]]):
+        """Registra uma função que produz métricas no momento da exportação."""
+        self._coletores.append(coletor)
+
+    def register_cache(self, nome: str, stats: Callable[[], Dict]):
+        """Exporta os contadores e a taxa de acerto de um cache com ``stats()``."""
+        if not self._caches:
+            self.register_collector(self._coletar_caches)
+        self._caches.append((nome, stats))
+
+    def _coletar_caches(self) -> List[_Metric]:
+        hit_ratio = Gauge("pokemon_cache_hit_ratio", "Taxa de acerto do cache", ("cache",))
+        tamanho = Gauge("pokemon_cache_entries", "Entradas no cache", ("cache",))
+        eventos = Counter("pokemon_cache_events_total", "Eventos do cache por tipo", ("cache", "event"))
+        for nome, stats in self._caches:
+            valores = stats()
+            hit_ratio.set(valores.get("hit_ratio", 0.0), cache=nome)
+            tamanho.set(valores.get("size", 0), cache=nome)
+            for evento, valor in valores.items():
+                if evento not in ("hit_ratio", "size", "max_size"):
+                    eventos.inc(valor, cache=nome, event=evento)
+        return [hit_ratio, tamanho, eventos]
+
+    def render(self) -> str:
+        """Exporta todas as métricas no formato texto do Prometheus."""
+        linhas = []
+        for metrica in list(self._metricas.values()):
+            linhas.extend(metrica.render(self._fixos))
+        for coletor in list(self._coletores):
+            for metrica in coletor():
+                linhas.extend(metrica.render(self._fixos))
+        return "\n".join(linhas) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+TOOL_REQUESTS = REGISTRY.counter(
+    "pokemon_tool_requests_total", "Chamadas das ferramentas MCP", ("tool", "outcome"))
+TOOL_DURATION = REGISTRY.histogram(
+    "pokemon_tool_duration_seconds", "Latência das ferramentas MCP", ("tool",))
+TOOL_IN_FLIGHT = REGISTRY.gauge(
+    "pokemon_tool_in_flight", "Chamadas de ferramentas MCP em andamento", ("tool",))
+STAGE_DURATION = REGISTRY.histogram(
+    "pokemon_stage_duration_seconds",
+    "Latência por etapa (extract, transform, report, serialize)",
+    ("tool", "stage"),
+)
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    "pokemon_upstream_requests_total", "Requisições à PokeAPI por status HTTP", ("status",))
+UPSTREAM_DURATION = REGISTRY.histogram(
+    "pokemon_upstream_request_duration_seconds", "Latência das requisições à PokeAPI")
+UPSTREAM_RETRIES = REGISTRY.counter(
+    "pokemon_upstream_retries_total", "Novas tentativas de requisições à PokeAPI", ("reason",))
+UPSTREAM_IN_FLIGHT = REGISTRY.gauge(
+    "pokemon_upstream_in_flight", "Requisições à PokeAPI em andamento")
+
+# Ferramenta MCP em execução no contexto atual, usada como rótulo das etapas
+_ferramenta_atual: contextvars.ContextVar[str] = contextvars.ContextVar("ferramenta_atual", default="")
+
+# Status da resposta da ferramenta atual, informado por ``record_status``
+_status_atual: contextvars.ContextVar[str] = contextvars.ContextVar("status_atual", default="")
+
+# Resultado registrado em pokemon_tool_requests_total para cada status da resposta
+_OUTCOMES = {"error": "error", "partial": "partial"}
+
+_tracer = _otel_trace.get_tracer("pokemon-analysis") if _otel_trace is not None else None
+
+
+@contextmanager
+def _span(nome: str, **atributos):
+    """Abre um span do OpenTelemetry quando o pacote está disponível."""
+    if _tracer is None:
+        yield
+        return
+    with _tracer.start_as_current_span(nome, attributes=atributos):
+        yield
+
+
+def record_status(status: str):
+    """Informa o status da resposta da ferramenta MCP atual (ex.: ``success``, ``error``)."""
+    _status_atual.set(status)
+
+
+def observe_stage(etapa: str, segundos: float):
+    """Registra a duração de uma etapa medida externamente."""
+    STAGE_DURATION.observe(segundos, tool=_ferramenta_atual.get(), stage=etapa)
+
+
+@contextmanager
+def stage(etapa: str):
+    """Mede uma etapa do pipeline dentro da ferramenta MCP atual."""
+    inicio = time.perf_counter()
+    with _span(f"pokemon.{etapa}", stage=etapa, tool=_ferramenta_atual.get()):
+        try:
+            yield
+        finally:
+            observe_stage(etapa, time.perf_counter() - inicio)
+
+
+def track_tool(func: Callable) -> Callable:
+    """
+    Instrumenta uma ferramenta MCP assíncrona: latência, chamadas por
+    resultado, chamadas em andamento e um span por chamada.
+
+    O resultado vem do status informado com ``record_status``: ``error`` e
+    ``partial`` são registrados como tal, os demais como ``ok``; exceções
+    não tratadas contam como ``exception``.
+
+    ``functools.wraps`` preserva a assinatura usada pelo FastMCP para gerar
+    o esquema da ferramenta.
+    """
+    nome = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = _ferramenta_atual.set(nome)
+        token_status = _status_atual.set("")
+        TOOL_IN_FLIGHT.inc(tool=nome)
+        inicio = time.perf_counter()
+        outcome = "exception"
+        try:
+            with _span(f"tool.{nome}", tool=nome):
+                resultado = await func(*args, **kwargs)
+            outcome = _OUTCOMES.get(_status_atual.get(), "ok")
+            return resultado
+        finally:
+            TOOL_DURATION.observe(time.perf_counter() - inicio, tool=nome)
+            TOOL_REQUESTS.inc(tool=nome, outcome=outcome)
+            TOOL_IN_FLIGHT.dec(tool=nome)
+            _status_atual.reset(token_status)
+            _ferramenta_atual.reset(token)
+
+    return wrapper
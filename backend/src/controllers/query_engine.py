@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+from models.pokemon_query import PokemonQueryIndex
+from models.pokemon_table import PokemonTable
+
+class QueryEngine:
+    """
+    Consultas com filtros sobre todos os Pokémon do cache do extrator.
+
+    O conjunto completo é extraído uma vez (do cache, quando aquecido) e
+    carregado em uma PokemonTable com um PokemonQueryIndex. Os índices são
+    reconstruídos quando a geração do cache do extrator muda, ou seja,
+    quando dados de algum Pokémon mudam ou o índice é atualizado; a
+    geração avança uma vez por extração, não a cada Pokémon buscado.
+
+    Um índice montado de uma extração parcial (com ``erros``) também é
+    reconstruído, após uma espera que dobra a cada nova falha: os Pokémon
+    já em cache vêm da memória e só os que falharam voltam à API.
+    """
+
+    def __init__(
+        self,
+        extractor,
+        max_pokemon: Optional[int] = None,
+        espera_erros: float = 30.0,
+        espera_erros_max: float = 600.0,
+    ):
+        """
+        Args:
+            extractor: DataExtractor de onde os Pokémon são obtidos
+            max_pokemon: Limita o conjunto indexado aos primeiros N Pokémon;
+                None indexa a listagem completa
+            espera_erros: Segundos até reconstruir um índice parcial
+            espera_erros_max: Limite da espera após falhas seguidas
+        """
+        self.extractor = extractor
+        self.max_pokemon = max_pokemon
+        self.espera_erros = espera_erros
+        self.espera_erros_max = espera_erros_max
+        self.logger = logging.getLogger(__name__)
+        self._index: Optional[PokemonQueryIndex] = None
+        self._erros: List[Dict] = []
+        self._generation: Optional[int] = None
+        self._lock: Optional[asyncio.Lock] = None
+        # Espera atual e instante da próxima tentativa para um índice parcial
+        self._espera = 0.0
+        self._nova_tentativa = 0.0
+
+    async def get_index(self) -> PokemonQueryIndex:
+        """
+        Retorna o índice atual, reconstruindo-o se o cache do extrator mudou
+        ou se o índice é parcial e a espera desde a última tentativa passou.
+        """
+        if self._atual():
+            return self._index
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._atual():
+                await self._reconstruir()
+            return self._index
+
+    async def query(self, **filtros) -> Dict:
+        """
+        Executa uma consulta e monta a resposta da ferramenta.
+
+        Args:
+            **filtros: Argumentos de ``PokemonQueryIndex.query``
+
+        Raises:
+            ValueError: Filtros com tipos, categorias ou colunas desconhecidos
+        """
+        index = await self.get_index()
+        posicoes, total = index.query(**filtros)
+        registros = index.table.to_records(posicoes)
+
+        result = {
+            "status": "partial" if self._erros else "success",
+            "total": total,
+            "retornados": len(registros),
+            "indexados": len(index),
+            "data": registros,
+        }
+        if self._erros:
+            result["erros"] = self._erros
+        return result
+
+    def opcoes(self) -> Dict:
+        """Valores aceitos nos filtros, segundo o índice atual."""
+        if self._index is None:
+            return {}
+        return {
+            "tipos_disponiveis": sorted(tipo for tipo, posicoes in self._index.por_tipo.items() if len(posicoes)),
+            "categorias_disponiveis": list(self._index.por_categoria),
+            "atributos_disponiveis": self._index.colunas,
+        }
+
+    def _atual(self) -> bool:
+        """Indica se o índice pode ser usado sem reconstrução."""
+        if self._index is None or self._generation != self.extractor.generation:
+            return False
+        return not self._erros or time.monotonic() < self._nova_tentativa
+
+    async def _reconstruir(self):
+        """Extrai o conjunto completo e monta a tabela e os índices."""
+        limit = self.max_pokemon or await self.extractor.total_pokemon()
+        pokemon_data = await self.extractor.extract(limit=limit)
+        if pokemon_data["status"] == "error":
+            raise RuntimeError(pokemon_data.get("message", "Falha na extração dos Pokémon"))
+
+        # A própria extração pode ter avançado a geração (dados novos da API)
+        self._generation = self.extractor.generation
+        self._index = PokemonQueryIndex(PokemonTable.from_records(pokemon_data["data"]))
+        self._erros = pokemon_data.get("erros", [])
+        if self._erros:
+            self._espera = min(self._espera * 2 or self.espera_erros, self.espera_erros_max)
+            self._nova_tentativa = time.monotonic() + self._espera
+            self.logger.warning(
+                f"Índice de consultas parcial: {len(self._erros)} Pokémon com erro, "
+                f"nova tentativa em {self._espera:.0f}s"
+            )
+        else:
+            self._espera = 0.0
+        self.logger.info(f"Índice de consultas montado com {len(self._index)} Pokémon")
@@ -1,15 +1,131 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import json
 import logging
-from typing import Dict, List
+import multiprocessing
+import shutil
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
 import os
-import numpy as np
+
+from controllers.file_lock import FileLock
+from utils.lazy_imports import lazy_import
+
+try:
+    from multiprocessing import forkserver, popen_forkserver, reduction, spawn, util
+    from multiprocessing.context import ForkServerContext, ForkServerProcess, set_spawning_popen
+except ImportError:
+    # Sem envio de descritores entre processos (Windows) não há forkserver
+    popen_forkserver = None
+
+# pandas e numpy só são carregados na primeira geração de relatório
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+# Quantidade de status de jobs mantidos em memória
+_MAX_JOBS = 256
+
+# Tamanho do hash usado como nome do diretório de cada análise
+_HASH_LEN = 16
+
+# Arquivo de lock dentro do diretório de cada análise, usado para que apenas
+# um processo gere os artefatos quando há vários workers
+_LOCK_NAME = ".lock"
+
+# Séries do gráfico de tipos: estatística e rótulo da legenda
+_SERIES_GRAFICO = (
+    ('ataque', 'Ataque'),
+    ('defesa', 'Defesa'),
+    ('hp', 'HP'),
+    ('ataque_especial', 'Ataque Especial'),
+    ('defesa_especial', 'Defesa Especial'),
+    ('velocidade', 'Velocidade'),
+)
+
+# Formatos aceitos para o gráfico de tipos
+FORMATOS_GRAFICO = ("png", "svg", "webp")
+
+# Diretório, dentro de output_dir, com os gráficos indexados pelo conteúdo
+_GRAFICOS_DIR = "graficos"
+
+# Diretório, dentro de output_dir, das exportações do DataExporter (uma por
+# hash de conteúdo), removidas pela mesma política dos demais artefatos
+_EXPORTACOES_DIR = "exportacoes"
+
+@dataclass(frozen=True)
+class OpcoesGrafico:
+    """Opções de renderização do gráfico de tipos."""
+
+    dpi: int = 150
+    largura: float = 15.0
+    altura: float = 8.0
+    formato: str = "png"
+
+    def __post_init__(self):
+        if self.formato not in FORMATOS_GRAFICO:
+            raise ValueError(f"Formato de gráfico inválido: {self.formato} (use {', '.join(FORMATOS_GRAFICO)})")
+        if not 20 <= self.dpi <= 600:
+            raise ValueError("dpi do gráfico deve estar entre 20 e 600")
+        if not (1 <= self.largura <= 50 and 1 <= self.altura <= 50):
+            raise ValueError("Largura e altura do gráfico devem estar entre 1 e 50 polegadas")
+
+    @classmethod
+    def from_tamanho(cls, tamanho: str, **kwargs) -> "OpcoesGrafico":
+        """Cria as opções a partir de um tamanho no formato ``<largura>x<altura>``."""
+        try:
+            largura, altura = (float(valor) for valor in tamanho.lower().split("x"))
+        except ValueError:
+            raise ValueError(f"Tamanho de gráfico inválido: {tamanho} (use <largura>x<altura>, ex.: 15x8)")
+        return cls(largura=largura, altura=altura, **kwargs)
 
 class ReportGenerator:
-    def __init__(self):
-        """Inicializa o gerador de relatórios."""
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_bytes: int = 500 * 1024 * 1024,
+        max_age_hours: float = 168,
+        opcoes_grafico: Optional[OpcoesGrafico] = None,
+    ):
+        """
+        Inicializa o gerador de relatórios.
+
+        Args:
+            max_workers: Processos usados para renderizar gráficos
+            max_bytes: Tamanho máximo ocupado pelos artefatos gerados
+            max_age_hours: Idade máxima de um artefato sem uso, em horas
+            opcoes_grafico: Opções padrão de renderização do gráfico de tipos
+        """
         self.logger = logging.getLogger(__name__)
         self.output_dir = os.path.join("relatorios")
+
+        # O matplotlib não é thread-safe: a renderização roda em processos
+        # separados, criados sob demanda
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+        # Status das gerações disparadas sem aguardar a conclusão
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+
+        # Gerações em andamento, por hash da análise
+        self._em_andamento: Dict[str, asyncio.Future] = {}
+
+        # Gráficos são reaproveitados entre análises com as mesmas médias por tipo
+        self.opcoes_grafico = opcoes_grafico or OpcoesGrafico()
+        self._graficos_stats = {"hits": 0, "misses": 0}
+
+        # Limites para remoção de artefatos antigos
+        self.max_bytes = max_bytes
+        self.max_age = max_age_hours * 3600
         
         # Cria o diretório de saída se ele não existir
         if not os.path.exists(self.output_dir):
@@ -18,37 +134,333 @@ class ReportGenerator:
 
     # --- MÉTODOS PÚBLICOS ---
 
-    async def generate(self, data: Dict) -> Dict:
+    async def generate(self, data: Dict, aguardar: bool = True, opcoes_grafico: Optional[OpcoesGrafico] = None) -> Dict:
         """
         Gera relatórios e visualizações a partir dos dados transformados.
+
+        Os arquivos ficam em ``relatorios/<hash da análise>/`` e são gravados
+        de forma atômica. Se os artefatos desta análise já existem, nada é
+        regenerado. A escrita dos CSVs roda em uma thread e a renderização do
+        gráfico em um processo separado, em paralelo, sem bloquear o event loop.
+        O gráfico só é renderizado quando as médias por tipo (ou as opções)
+        ainda não têm um gráfico em ``relatorios/graficos/``.
         
         Args:
             data: Dicionário com dados transformados.
+            aguardar: Se False, retorna os caminhos imediatamente junto com
+                um ``job_id`` cujo andamento pode ser consultado em ``status``.
+            opcoes_grafico: Opções de renderização; sem valor, usa as padrão
             
         Returns:
             Dicionário com caminhos dos arquivos gerados.
         """
-        try:
+        opcoes = opcoes_grafico or self.opcoes_grafico
+        analise_hash = self._hash_analise(data, opcoes)
+        destino = os.path.join(self.output_dir, analise_hash)
+        resultado = self._caminhos(destino, data, opcoes)
+
+        if self._artefatos_prontos(resultado):
+            # Marca o uso recente para a política de remoção
+            os.utime(destino)
+            if aguardar:
+                return resultado
+            self._guardar_job({'job_id': analise_hash, 'status': 'concluido', 'arquivos': resultado})
+            return {**resultado, 'job_id': analise_hash}
+
+        tarefa = self._em_andamento.get(analise_hash)
+        if tarefa is None:
             self.logger.info("Iniciando a geração de relatórios...")
             
             # Prepara os DataFrames que serão usados em múltiplos locais
             df_tipos = self._preparar_df_tipos(data.get('tipos_analise', {}))
             df_top = self._preparar_df_top(data.get('top_experiencia', []))
 
-            # Gera relatórios a partir dos DataFrames preparados
-            csv_paths = self._gerar_csv(df_tipos, df_top)
-            grafico_path = self._gerar_grafico_tipos(df_tipos)
-            
+            tarefa = asyncio.ensure_future(
+                self._gerar_arquivos(analise_hash, destino, resultado, df_tipos, df_top, opcoes)
+            )
+            self._em_andamento[analise_hash] = tarefa
+            tarefa.add_done_callback(lambda _: self._em_andamento.pop(analise_hash, None))
+
+        if aguardar:
+            return await asyncio.shield(tarefa)
+
+        # Caminhos são conhecidos antes da escrita; o job acompanha a conclusão
+        self._registrar_job(analise_hash, tarefa)
+        return {**resultado, 'job_id': analise_hash}
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """
+        Retorna o status de uma geração disparada com ``aguardar=False``.
+
+        Jobs de outros processos (ou anteriores a um reinício) são resolvidos
+        pelo diretório da análise: ``em_andamento`` enquanto o lock de geração
+        estiver ocupado e ``concluido`` quando houver artefatos gravados.
+        """
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return dict(job)
+
+        # O job_id é o hash da análise; qualquer outro valor não é um diretório válido
+        if len(job_id) != _HASH_LEN or any(c not in "0123456789abcdef" for c in job_id):
+            return None
+        destino = os.path.join(self.output_dir, job_id)
+        if not os.path.isdir(destino):
+            return None
+        if FileLock(os.path.join(destino, _LOCK_NAME)).locked_elsewhere():
+            return {'job_id': job_id, 'status': 'em_andamento'}
+
+        resultado = self._caminhos_existentes(destino)
+        if not any([*resultado['csv_path'].values(), resultado['graficos_path']]):
+            return None
+        return {'job_id': job_id, 'status': 'concluido', 'arquivos': resultado}
+
+    def graficos_stats(self) -> Dict:
+        """Acertos, renderizações e gráficos guardados no cache de gráficos."""
+        total = self._graficos_stats["hits"] + self._graficos_stats["misses"]
+        try:
+            tamanho = len(os.listdir(os.path.join(self.output_dir, _GRAFICOS_DIR)))
+        except FileNotFoundError:
+            tamanho = 0
+        return {
+            **self._graficos_stats,
+            "hit_ratio": round(self._graficos_stats["hits"] / total, 4) if total else 0.0,
+            "size": tamanho,
+        }
+
+    def purge(self, manter: Optional[str] = None):
+        """
+        Remove análises, gráficos em cache e exportações antigos.
+
+        Args:
+            manter: Diretório preservado, como o de uma exportação recém-publicada
+        """
+        self._limpar_artefatos(manter)
+
+    def close(self):
+        """Encerra o pool de processos de renderização."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # --- MÉTODOS PRIVADOS (AUXILIARES) ---
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Retorna o pool de processos, criando-o se necessário."""
+        if self._pool is None:
+            # O servidor tem threads (to_thread, executores), então fork
+            # copiaria locks que elas podem estar segurando. Com forkserver os
+            # processos nascem de um servidor de fork com uma única thread, que
+            # já carregou este módulo, e não reexecutam o __main__ do pai (ver
+            # _ContextoGrafico); spawn fica para plataformas sem forkserver
+            if popen_forkserver is not None and "forkserver" in multiprocessing.get_all_start_methods():
+                contexto = _ContextoGrafico()
+                contexto.set_forkserver_preload([__name__])
+            else:
+                contexto = multiprocessing.get_context("spawn")
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=contexto)
+        return self._pool
+
+    def _hash_analise(self, data: Dict, opcoes: OpcoesGrafico) -> str:
+        """Calcula o identificador de conteúdo de uma análise com as opções do gráfico."""
+        conteudo = json.dumps([data, asdict(opcoes)], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()[:_HASH_LEN]
+
+    def _caminhos(self, destino: str, data: Dict, opcoes: OpcoesGrafico) -> Dict:
+        """Caminhos dos artefatos de uma análise (vazios quando não há dados)."""
+        tem_tipos = bool(data.get('tipos_analise'))
+        tem_top = bool(data.get('top_experiencia'))
+        return {
+            'csv_path': {  # Mantendo compatibilidade com o código existente
+                'tipos': os.path.join(destino, 'analise_tipos.csv') if tem_tipos else '',
+                'top': os.path.join(destino, 'top_experiencia.csv') if tem_top else ''
+            },
+            'graficos_path': os.path.join(destino, f'distribuicao_tipos.{opcoes.formato}') if tem_tipos else ''
+        }
+
+    def _caminhos_existentes(self, destino: str) -> Dict:
+        """Caminhos dos artefatos presentes em disco (vazios quando ausentes)."""
+        def existente(nome: str) -> str:
+            path = os.path.join(destino, nome)
+            return path if os.path.isfile(path) else ''
+
+        return {
+            'csv_path': {
+                'tipos': existente('analise_tipos.csv'),
+                'top': existente('top_experiencia.csv')
+            },
+            'graficos_path': next(
+                (path for path in (existente(f'distribuicao_tipos.{formato}') for formato in FORMATOS_GRAFICO) if path),
+                ''
+            )
+        }
+
+    def _artefatos_prontos(self, resultado: Dict) -> bool:
+        """Indica se todos os artefatos esperados já foram gravados."""
+        caminhos = [*resultado['csv_path'].values(), resultado['graficos_path']]
+        return all(os.path.exists(path) for path in caminhos if path)
+
+    async def _gerar_arquivos(
+        self,
+        analise_hash: str,
+        destino: str,
+        esperado: Dict,
+        df_tipos: pd.DataFrame,
+        df_top: pd.DataFrame,
+        opcoes: OpcoesGrafico,
+    ) -> Dict:
+        """Escreve os CSVs e obtém o gráfico em paralelo, fora do event loop."""
+        try:
+            os.makedirs(destino, exist_ok=True)
+            grafico_path = os.path.join(destino, f'distribuicao_tipos.{opcoes.formato}')
+
+            # Outros processos que pedirem a mesma análise aguardam este lock
+            # e reaproveitam os arquivos em vez de gerá-los de novo
+            async with FileLock(os.path.join(destino, _LOCK_NAME)):
+                if self._artefatos_prontos(esperado):
+                    return esperado
+
+                # Gera relatórios a partir dos DataFrames preparados
+                grafico_path, csv_paths = await asyncio.gather(
+                    self._obter_grafico(df_tipos, grafico_path, opcoes),
+                    asyncio.to_thread(self._gerar_csv, df_tipos, df_top, destino),
+                )
+
             self.logger.info("Relatórios gerados com sucesso!")
+
+            # Remove artefatos antigos sem bloquear o event loop
+            await asyncio.to_thread(self._limpar_artefatos, destino)
+
             return {
                 'csv_path': csv_paths,  # Mantendo compatibilidade com o código existente
                 'graficos_path': grafico_path
             }
+        except BrokenProcessPool as e:
+            # Um processo morreu; o pool é recriado na próxima geração
+            self.logger.error(f"Pool de renderização interrompido: {e}", exc_info=True)
+            self._pool = None
+            raise
         except Exception as e:
             self.logger.error(f"Erro fatal na geração de relatórios: {e}", exc_info=True)
             raise
 
-    # --- MÉTODOS PRIVADOS (AUXILIARES) ---
+    async def _obter_grafico(self, df_tipos: pd.DataFrame, grafico_path: str, opcoes: OpcoesGrafico) -> str:
+        """
+        Grava o gráfico em ``grafico_path`` a partir do cache de gráficos.
+
+        O cache é indexado pelo conteúdo de ``df_tipos`` e pelas opções; só
+        conteúdos novos são renderizados, no pool de processos.
+        """
+        if df_tipos.empty:
+            return ""
+        cache_path = os.path.join(
+            self.output_dir, _GRAFICOS_DIR, f"{_chave_grafico(df_tipos, opcoes)}.{opcoes.formato}"
+        )
+        try:
+            # Marca o uso recente para a política de remoção
+            os.utime(cache_path)
+            self._graficos_stats["hits"] += 1
+        except FileNotFoundError:
+            self._graficos_stats["misses"] += 1
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._get_pool(), _renderizar_grafico_tipos, df_tipos, cache_path, opcoes)
+        _escrita_atomica(grafico_path, lambda tmp: _vincular(cache_path, tmp))
+        return grafico_path
+
+    def _limpar_artefatos(self, manter: Optional[str]):
+        """
+        Remove diretórios de análises e exportações e gráficos em cache antigos.
+
+        Primeiro descarta os mais velhos que ``max_age``; depois, enquanto o
+        total exceder ``max_bytes``, remove os usados há mais tempo.
+        """
+        artefatos = []
+        agora = time.time()
+        graficos_dir = os.path.join(self.output_dir, _GRAFICOS_DIR)
+        if os.path.isdir(graficos_dir):
+            for entry in os.scandir(graficos_dir):
+                try:
+                    info = entry.stat()
+                except OSError:
+                    continue
+                if agora - info.st_mtime > self.max_age:
+                    _remover(entry.path)
+                    continue
+                artefatos.append((info.st_mtime, info.st_size, entry.path))
+
+        manter = os.path.abspath(manter) if manter else None
+        for path in self._diretorios_artefatos():
+            if path == manter or os.path.basename(path) in self._em_andamento:
+                continue
+            # Análise sendo gerada por outro processo (exportações não têm lock)
+            lock_path = os.path.join(path, _LOCK_NAME)
+            if os.path.exists(lock_path) and FileLock(lock_path).locked_elsewhere():
+                continue
+            try:
+                mtime = os.path.getmtime(path)
+                # Gráficos vinculados ao cache já são contados lá
+                tamanho = sum(
+                    info.st_size
+                    for info in (entry.stat() for entry in os.scandir(path) if entry.is_file())
+                    if info.st_nlink == 1
+                )
+            except OSError:
+                continue
+            if agora - mtime > self.max_age:
+                _remover(path)
+                continue
+            # Exportação em preparo: só é removida quando abandonada
+            if os.path.basename(path).startswith("."):
+                continue
+            artefatos.append((mtime, tamanho, path))
+
+        total = sum(tamanho for _, tamanho, _ in artefatos)
+        for mtime, tamanho, path in sorted(artefatos):
+            if total <= self.max_bytes:
+                break
+            _remover(path)
+            total -= tamanho
+
+    def _diretorios_artefatos(self) -> List[str]:
+        """Diretórios de análises (hash) e de exportações, em caminho absoluto."""
+        diretorios = []
+        for nome in os.listdir(self.output_dir):
+            path = os.path.join(self.output_dir, nome)
+            if len(nome) == _HASH_LEN and os.path.isdir(path):
+                diretorios.append(os.path.abspath(path))
+
+        exportacoes_dir = os.path.join(self.output_dir, _EXPORTACOES_DIR)
+        if os.path.isdir(exportacoes_dir):
+            for entry in os.scandir(exportacoes_dir):
+                if entry.is_dir():
+                    diretorios.append(os.path.abspath(entry.path))
+        return diretorios
+
+    def _guardar_job(self, job: Dict):
+        """Guarda o status de um job, descartando os mais antigos acima de _MAX_JOBS."""
+        self._jobs[job['job_id']] = job
+        self._jobs.move_to_end(job['job_id'])
+        while len(self._jobs) > _MAX_JOBS:
+            self._jobs.popitem(last=False)
+
+    def _registrar_job(self, job_id: str, tarefa: asyncio.Future):
+        """Registra um job e atualiza seu status quando a tarefa terminar."""
+        self._guardar_job({'job_id': job_id, 'status': 'em_andamento'})
+
+        def concluir(t: asyncio.Future):
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            if t.cancelled():
+                job['status'] = 'cancelado'
+            elif t.exception() is not None:
+                job['status'] = 'erro'
+                job['erro'] = str(t.exception())
+            else:
+                job['status'] = 'concluido'
+                job['arquivos'] = t.result()
+
+        tarefa.add_done_callback(concluir)
 
     def _preparar_df_tipos(self, tipos_data: Dict) -> pd.DataFrame:
         """Prepara e limpa o DataFrame de análise por tipo."""
@@ -80,8 +492,9 @@ class ReportGenerator:
             'hp': 'hp'
         })
         
-        self.logger.info(f"DataFrame preparado:\n{df}")
-        self.logger.info(f"Colunas disponíveis: {df.columns.tolist()}")
+        # Formatar o DataFrame tem custo; só é feito com DEBUG habilitado
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"DataFrame preparado:\n{df}")
         
         return df
 
@@ -96,18 +509,18 @@ class ReportGenerator:
         df = df.sort_values('Experiência Base', ascending=False)
         return df
 
-    def _gerar_csv(self, df_tipos: pd.DataFrame, df_top: pd.DataFrame) -> Dict[str, str]:
+    def _gerar_csv(self, df_tipos: pd.DataFrame, df_top: pd.DataFrame, destino: str) -> Dict[str, str]:
         """Gera arquivos CSV com as análises."""
         try:
             paths = {}
             if not df_tipos.empty:
-                path_tipos = os.path.join(self.output_dir, 'analise_tipos.csv')
-                df_tipos.to_csv(path_tipos, encoding='utf-8', index=True)
+                path_tipos = os.path.join(destino, 'analise_tipos.csv')
+                _escrita_atomica(path_tipos, lambda tmp: df_tipos.to_csv(tmp, encoding='utf-8', index=True))
                 paths['tipos'] = path_tipos
 
             if not df_top.empty:
-                path_top = os.path.join(self.output_dir, 'top_experiencia.csv')
-                df_top.to_csv(path_top, encoding='utf-8', index=False)
+                path_top = os.path.join(destino, 'top_experiencia.csv')
+                _escrita_atomica(path_top, lambda tmp: df_top.to_csv(tmp, encoding='utf-8', index=False))
                 paths['top'] = path_top
 
             # Retorna um dicionário com os caminhos dos arquivos
@@ -119,49 +532,192 @@ class ReportGenerator:
             self.logger.error(f"Erro ao gerar arquivos CSV: {e}", exc_info=True)
             raise
 
-    def _gerar_grafico_tipos(self, df_tipos_original: pd.DataFrame) -> str:
-        """Gera um gráfico de barras a partir do DataFrame de tipos."""
-        if df_tipos_original.empty:
-            self.logger.info("DataFrame de tipos vazio, pulando geração de gráfico.")
-            return ""
-            
+
+if popen_forkserver is not None:
+    class _PopenGrafico(popen_forkserver.Popen):
+        """
+        Inicia o processo pelo forkserver sem os dados do ``__main__`` do pai.
+
+        O multiprocessing manda o caminho (ou o nome) do script principal para
+        cada processo novo, que o reexecuta como ``__mp_main__``: com
+        ``python src/server.py`` cada worker de renderização refaria toda a
+        inicialização do servidor. A renderização só precisa deste módulo,
+        então o processo não importa o script. Mesmo corpo de
+        ``popen_forkserver.Popen._launch`` (CPython 3.10 a 3.13), exceto pela
+        remoção das chaves ``init_main_*``.
+        """
+
+        def _launch(self, process_obj):
+            prep_data = spawn.get_preparation_data(process_obj._name)
+            prep_data.pop('init_main_from_path', None)
+            prep_data.pop('init_main_from_name', None)
+            buf = io.BytesIO()
+            set_spawning_popen(self)
+            try:
+                reduction.dump(prep_data, buf)
+                reduction.dump(process_obj, buf)
+            finally:
+                set_spawning_popen(None)
+
+            self.sentinel, w = forkserver.connect_to_new_process(self._fds)
+            # Cópia do descritor de escrita usada pelo filho como sentinela do pai
+            _parent_w = os.dup(w)
+            self.finalizer = util.Finalize(self, util.close_fds, (_parent_w, self.sentinel))
+            with open(w, 'wb', closefd=True) as f:
+                f.write(buf.getbuffer())
+            self.pid = forkserver.read_signed(self.sentinel)
+
+    class _ProcessoGrafico(ForkServerProcess):
+        """Processo do pool de renderização, iniciado por ``_PopenGrafico``."""
+
+        @staticmethod
+        def _Popen(process_obj):
+            return _PopenGrafico(process_obj)
+
+    class _ContextoGrafico(ForkServerContext):
+        """Contexto forkserver cujos processos não importam o ``__main__`` do pai."""
+
+        Process = _ProcessoGrafico
+
+
+def _escrita_atomica(path: str, escrever: Callable[[str], None]):
+    """Grava em um arquivo temporário e o renomeia para ``path``."""
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        escrever(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _vincular(origem: str, destino: str):
+    """Cria ``destino`` como hard link de ``origem``, ou cópia onde não há suporte."""
+    try:
+        os.link(origem, destino)
+    except OSError:
+        shutil.copyfile(origem, destino)
+
+
+def _remover(path: str):
+    """Remove um diretório de análise ou um gráfico em cache."""
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
         try:
-            # Transpõe o DataFrame para que 'ataque', 'defesa', 'hp' se tornem COLUNAS
-            df = df_tipos_original.T
-            
-            # Log do DataFrame para debug
-            self.logger.info(f"DataFrame após transposição:\n{df}")
-            self.logger.info(f"Colunas disponíveis: {df.columns.tolist()}")
-
-            plt.style.use('default')
-            fig, ax = plt.subplots(figsize=(15, 8))
-
-            tipos = df.index.values
-            x = np.arange(len(tipos))
-            width = 0.25
-
-            # Plota as barras para cada estatística
-            ax.bar(x - width, df['ataque'], width, label='Ataque')
-            ax.bar(x, df['defesa'], width, label='Defesa')
-            ax.bar(x + width, df['hp'], width, label='HP')
-
-            # Configurações do gráfico
-            ax.set_title('Média de Estatísticas por Tipo de Pokémon', fontsize=16, pad=20)
-            ax.set_ylabel('Valor Médio', fontsize=12, labelpad=10)
-            ax.set_xlabel('Tipos de Pokémon', fontsize=12, labelpad=10)
-            ax.set_xticks(x)
-            ax.set_xticklabels(tipos, rotation=45, ha="right")
-            ax.legend()
-            ax.grid(True, axis='y', linestyle='--', alpha=0.6)
-
-            plt.tight_layout()
-
-            # Salva o gráfico
-            grafico_path = os.path.join(self.output_dir, 'distribuicao_tipos.png')
-            plt.savefig(grafico_path, dpi=300)
-            plt.close(fig)
-
-            return grafico_path
-        except Exception as e:
-            self.logger.error(f"Erro ao gerar gráfico de tipos: {e}\nDataFrame no momento do erro:\n{df.head()}", exc_info=True)
-            raise
\ No newline at end of file
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _chave_grafico(df_tipos: pd.DataFrame, opcoes: OpcoesGrafico) -> str:
+    """Identificador do gráfico: conteúdo de ``df_tipos`` e opções de renderização."""
+    conteudo = json.dumps(
+        [df_tipos.to_dict(orient='split'), asdict(opcoes)], sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()[:_HASH_LEN]
+
+
+class _ModeloGrafico:
+    """
+    Figura do gráfico de tipos montada uma vez por processo e reaproveitada.
+
+    Enquanto tipos, séries e tamanho forem os mesmos, uma nova renderização
+    só troca a altura das barras e reajusta o eixo y.
+    """
+
+    def __init__(self, chave: Tuple, tipos: List[str], series: List[Tuple[str, str]], opcoes: OpcoesGrafico):
+        # Figure sem pyplot: nada fica registrado no gerenciador global de figuras
+        from matplotlib.figure import Figure
+
+        self.chave = chave
+        self.stats = [stat for stat, _ in series]
+        self.figura = Figure(figsize=(opcoes.largura, opcoes.altura))
+        ax = self.eixo = self.figura.add_subplot()
+
+        x = np.arange(len(tipos))
+        width = 0.8 / max(len(series), 1)
+
+        # Barras de cada estatística, centradas em cada tipo; alturas em render()
+        self.barras = [
+            ax.bar(x + (i - (len(series) - 1) / 2) * width, np.zeros(len(tipos)), width, label=rotulo)
+            for i, (_, rotulo) in enumerate(series)
+        ]
+
+        # Configurações do gráfico
+        ax.set_title('Média de Estatísticas por Tipo de Pokémon', fontsize=16, pad=20)
+        ax.set_ylabel('Valor Médio', fontsize=12, labelpad=10)
+        ax.set_xlabel('Tipos de Pokémon', fontsize=12, labelpad=10)
+        ax.set_xticks(x)
+        ax.set_xticklabels(tipos, rotation=45, ha="right")
+        # Posição fixa: ``loc='best'`` reavalia todas as barras a cada gravação
+        ax.legend(loc='upper left', bbox_to_anchor=(1.01, 1.0))
+        ax.grid(True, axis='y', linestyle='--', alpha=0.6)
+        self._layout_pronto = False
+
+    def render(self, df: pd.DataFrame, grafico_path: str, opcoes: OpcoesGrafico):
+        """Atualiza as alturas das barras e grava a figura em ``grafico_path``."""
+        maximo = 0.0
+        for stat, barras in zip(self.stats, self.barras):
+            valores = df[stat].tolist()
+            for barra, valor in zip(barras, valores):
+                barra.set_height(valor)
+            maximo = max(maximo, *valores)
+        # Mesmo limite do autoscale (margem de 5% acima da maior barra), sem
+        # percorrer todas as barras com relim()
+        self.eixo.set_ylim(0, maximo * 1.05 or 1)
+        if not self._layout_pronto:
+            # As margens dependem só dos rótulos, fixos neste modelo
+            self.figura.tight_layout()
+            self._layout_pronto = True
+        _escrita_atomica(
+            grafico_path,
+            lambda tmp: self.figura.savefig(tmp, dpi=opcoes.dpi, format=opcoes.formato),
+        )
+
+
+# Modelo de figura do processo atual (cada worker do pool mantém o seu)
+_modelo_grafico: Optional[_ModeloGrafico] = None
+
+
+def _renderizar_grafico_tipos(
+    df_tipos_original: pd.DataFrame,
+    grafico_path: str,
+    opcoes: Optional[OpcoesGrafico] = None,
+) -> str:
+    """
+    Renderiza o gráfico de barras de estatísticas por tipo.
+
+    Função de módulo para poder ser executada no pool de processos. Reaproveita
+    o modelo de figura do processo quando tipos, séries e tamanho coincidem.
+    """
+    global _modelo_grafico
+
+    if df_tipos_original.empty:
+        logger.info("DataFrame de tipos vazio, pulando geração de gráfico.")
+        return ""
+
+    opcoes = opcoes or OpcoesGrafico()
+    df = df_tipos_original
+    try:
+        # Transpõe o DataFrame para que as estatísticas se tornem COLUNAS
+        df = df_tipos_original.T
+
+        # Log do DataFrame para debug
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"DataFrame após transposição:\n{df}")
+
+        tipos = [str(tipo) for tipo in df.index]
+        series = [(stat, rotulo) for stat, rotulo in _SERIES_GRAFICO if stat in df.columns]
+        chave = (tuple(tipos), tuple(series), opcoes.largura, opcoes.altura)
+        if _modelo_grafico is None or _modelo_grafico.chave != chave:
+            _modelo_grafico = _ModeloGrafico(chave, tipos, series, opcoes)
+
+        _modelo_grafico.render(df, grafico_path, opcoes)
+        return grafico_path
+    except Exception as e:
+        # Um modelo em estado parcial não deve ser reaproveitado
+        _modelo_grafico = None
+        logger.error(f"Erro ao gerar gráfico de tipos: {e}\nDataFrame no momento do erro:\n{df.head()}", exc_info=True)
+        raise
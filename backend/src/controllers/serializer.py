@@ -0,0 +1,90 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# orjson é opcional: sem o pacote, usa o json da biblioteca padrão
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class JsonSerializer:
+    """
+    Serializa as respostas das ferramentas MCP.
+
+    Usa orjson quando disponível (ou exigido) e o json da biblioteca padrão
+    caso contrário. Em ambos os casos caracteres não ASCII não são escapados.
+    """
+
+    def __init__(self, backend: str = "auto", compacto: bool = False):
+        """
+        Args:
+            backend: ``auto`` (orjson se instalado), ``orjson`` ou ``json``
+            compacto: Saída sem indentação nem espaços por padrão
+        """
+        if backend not in ("auto", "orjson", "json"):
+            raise ValueError(f"Serializador JSON desconhecido: {backend}")
+        if backend == "orjson" and orjson is None:
+            raise ValueError("Serializador orjson pedido, mas o pacote não está instalado")
+        self.usar_orjson = orjson is not None and backend != "json"
+        self.compacto = compacto
+
+    @property
+    def backend(self) -> str:
+        return "orjson" if self.usar_orjson else "json"
+
+    def dumps(self, obj: Any, compacto: Optional[bool] = None) -> str:
+        """
+        Serializa ``obj`` para JSON.
+
+        Args:
+            obj: Objeto a serializar
+            compacto: Sem indentação nem espaços; None usa o padrão da instância
+        """
+        if compacto is None:
+            compacto = self.compacto
+
+        if self.usar_orjson:
+            opcoes = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            if not compacto:
+                opcoes |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, option=opcoes).decode("utf-8")
+
+        if compacto:
+            return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def campos_invalidos(campos: Optional[Sequence[str]], disponiveis: Iterable[str]) -> List[str]:
+    """Retorna os campos pedidos que não existem nos registros."""
+    if not campos:
+        return []
+    disponiveis = set(disponiveis)
+    return [campo for campo in campos if campo not in disponiveis]
+
+
+def selecionar_campos(registros: List[Dict], campos: Optional[Sequence[str]]) -> List[Dict]:
+    """Mantém apenas ``campos`` em cada registro, na ordem pedida."""
+    if not campos:
+        return registros
+    return [{campo: registro[campo] for campo in campos if campo in registro} for registro in registros]
+
+
+def paginar(registros: List[Dict], pagina: int, tamanho_pagina: Optional[int]) -> Dict:
+    """
+    Retorna uma página de ``registros`` com os metadados de paginação.
+
+    Sem ``tamanho_pagina`` todos os registros formam uma única página.
+    """
+    total = len(registros)
+    if not tamanho_pagina or tamanho_pagina <= 0:
+        return {"pagina": 1, "tamanho_pagina": total, "total_paginas": 1, "data": registros}
+
+    total_paginas = max(1, -(-total // tamanho_pagina))
+    pagina = min(max(pagina, 1), total_paginas)
+    inicio = (pagina - 1) * tamanho_pagina
+    return {
+        "pagina": pagina,
+        "tamanho_pagina": tamanho_pagina,
+        "total_paginas": total_paginas,
+        "data": registros[inicio:inicio + tamanho_pagina],
+    }
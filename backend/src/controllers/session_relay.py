@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import os
+import re
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Set
+from uuid import UUID
+
+import aiohttp
+from aiohttp import web
+from mcp.server.sse import SseServerTransport
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import Message, Receive, Scope, Send
+
+# ID da sessão no evento ``endpoint`` do SSE (``/messages/?session_id=<hex>``)
+_SESSION_ID = re.compile(rb"session_id=([0-9a-f]{32})")
+
+class SessionRelay:
+    """
+    Encaminha mensagens do MCP para o worker dono da sessão SSE.
+
+    Cada sessão aberta neste processo é registrada em
+    ``<runtime_dir>/sessions/<id>`` com o caminho do socket Unix do worker.
+    O socket recebe apenas mensagens repassadas por outros workers, que são
+    entregues ao transporte local pelo seu ``handle_post_message``.
+
+    O ID da sessão é lido do evento ``endpoint`` que o transporte envia ao
+    cliente (definido pelo protocolo SSE do MCP), e a sessão é registrada
+    antes que o cliente receba esse evento.
+    """
+
+    def __init__(self, sse: SseServerTransport, runtime_dir: str, nome: Optional[str] = None):
+        """
+        Args:
+            sse: Transporte SSE deste processo
+            runtime_dir: Diretório compartilhado entre os workers
+            nome: Nome do socket deste worker; o padrão é o PID
+        """
+        self.sse = sse
+        self.sessions_dir = os.path.join(runtime_dir, "sessions")
+        self.socket_path = os.path.join(runtime_dir, "workers", f"{nome or os.getpid()}.sock")
+        self.logger = logging.getLogger(__name__)
+        self._runner: Optional[web.AppRunner] = None
+        self._clientes: Dict[str, aiohttp.ClientSession] = {}
+        self._locais: Set[UUID] = set()
+        self._entregas: Set[asyncio.Task] = set()
+
+    async def start(self):
+        """Abre o socket Unix que recebe mensagens de outros workers."""
+        os.makedirs(self.sessions_dir, exist_ok=True)
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        # Um socket com o mesmo PID só pode ter sobrado de um processo morto
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        relay_app = web.Application()
+        relay_app.router.add_post("/messages/", self._receber)
+        self._runner = web.AppRunner(relay_app, access_log=None)
+        await self._runner.setup()
+        await web.UnixSite(self._runner, self.socket_path).start()
+
+    async def stop(self):
+        """Fecha o socket, as conexões com outros workers e as sessões registradas."""
+        for session_id in list(self._locais):
+            self.unregister(session_id)
+        for cliente in self._clientes.values():
+            await cliente.close()
+        self._clientes.clear()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    @asynccontextmanager
+    async def connect(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Abre uma sessão SSE com ``sse.connect_sse`` e a registra para os outros workers.
+
+        Produz os streams de leitura e escrita do transporte; ao sair, a
+        sessão é removida do registro.
+        """
+        sessoes = []
+
+        async def enviar(message: Message):
+            if not sessoes and message["type"] == "http.response.body":
+                encontrado = _SESSION_ID.search(message.get("body", b""))
+                if encontrado is not None:
+                    session_id = UUID(hex=encontrado.group(1).decode())
+                    sessoes.append(session_id)
+                    self.register(session_id)
+            await send(message)
+
+        try:
+            async with self.sse.connect_sse(scope, receive, enviar) as streams:
+                yield streams
+        finally:
+            for session_id in sessoes:
+                self.unregister(session_id)
+
+    def register(self, session_id: UUID):
+        """Anuncia aos outros workers que a sessão pertence a este processo."""
+        self._locais.add(session_id)
+        path = os.path.join(self.sessions_dir, session_id.hex)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.socket_path)
+        os.replace(tmp_path, path)
+
+    def unregister(self, session_id: UUID):
+        """Remove a sessão do registro compartilhado e do transporte."""
+        self._locais.discard(session_id)
+        # O transporte do mcp 1.6 não descarta sessões encerradas (versão fixada no pyproject)
+        self.sse._read_stream_writers.pop(session_id, None)
+        try:
+            os.remove(os.path.join(self.sessions_dir, session_id.hex))
+        except OSError:
+            pass
+
+    async def handle_post_message(self, scope: Scope, receive: Receive, send: Send):
+        """Aplicação ASGI de ``POST /messages/``: trata localmente ou repassa ao dono."""
+        request = Request(scope, receive)
+        try:
+            session_id = UUID(hex=request.query_params.get("session_id", ""))
+        except ValueError:
+            session_id = None
+
+        # Sessão local (ou parâmetro inválido, tratado pelo próprio transporte)
+        if session_id is None or session_id in self._locais:
+            return await self.sse.handle_post_message(scope, receive, send)
+
+        socket_path = self._dono(session_id)
+        if socket_path is None:
+            response = Response("Could not find session", status_code=404)
+            return await response(scope, receive, send)
+
+        body = await request.body()
+        try:
+            status, texto = await self._repassar(socket_path, session_id, body)
+        except (aiohttp.ClientError, OSError) as e:
+            # O worker dono morreu: a sessão não existe mais
+            self.logger.warning(f"Falha ao repassar mensagem da sessão {session_id.hex}: {str(e)}")
+            self.unregister(session_id)
+            status, texto = 404, "Could not find session"
+
+        response = Response(texto, status_code=status)
+        await response(scope, receive, send)
+
+    def _dono(self, session_id: UUID) -> Optional[str]:
+        """Socket do worker dono da sessão, segundo o registro compartilhado."""
+        try:
+            with open(os.path.join(self.sessions_dir, session_id.hex)) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    async def _repassar(self, socket_path: str, session_id: UUID, body: bytes):
+        """Envia a mensagem ao worker dono e retorna (status, corpo) da resposta."""
+        cliente = self._clientes.get(socket_path)
+        if cliente is None or cliente.closed:
+            cliente = aiohttp.ClientSession(connector=aiohttp.UnixConnector(path=socket_path))
+            self._clientes[socket_path] = cliente
+        async with cliente.post(
+            "http://relay/messages/",
+            params={"session_id": session_id.hex},
+            data=body,
+            headers={"Content-Type": "application/json"},
+        ) as response:
+            return response.status, await response.text()
+
+    async def _receber(self, request: web.Request) -> web.StreamResponse:
+        """Entrega ao transporte local uma mensagem repassada por outro worker."""
+        body = await request.read()
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": request.path,
+            "raw_path": request.raw_path.encode(),
+            "query_string": request.query_string.encode(),
+            "headers": [(k.lower().encode(), v.encode()) for k, v in request.headers.items()],
+        }
+        resposta = {"status": 500, "body": []}
+        pronta = asyncio.Event()
+
+        async def receive() -> Message:
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message: Message):
+            if message["type"] == "http.response.start":
+                resposta["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                resposta["body"].append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    pronta.set()
+
+        # O transporte responde 202 antes de entregar a mensagem à sessão;
+        # a entrega continua em segundo plano, como numa requisição direta
+        entrega = asyncio.ensure_future(self.sse.handle_post_message(scope, receive, send))
+        self._entregas.add(entrega)
+        entrega.add_done_callback(self._entregas.discard)
+        espera = asyncio.ensure_future(pronta.wait())
+        await asyncio.wait([entrega, espera], return_when=asyncio.FIRST_COMPLETED)
+        espera.cancel()
+        if entrega.done() and not pronta.is_set():
+            entrega.result()
+        return web.Response(status=resposta["status"], body=b"".join(resposta["body"]))
@@ -1,70 +1,189 @@
-import pandas as pd
+from __future__ import annotations
+
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional
 from models.pokemon import Pokemon
+from models.pokemon_table import CATEGORIAS, PokemonTable
+from controllers.aggregates import MEDIDAS, STATS, AggregateState
+from utils.lazy_imports import lazy_import
+
+np = lazy_import("numpy")
 
 class DataTransformer:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        
-    async def transform(self, pokemon_list: List[Dict]) -> Dict:
+
+    async def transform(self, pokemon_list: List[Dict], estado: Optional[AggregateState] = None) -> Dict:
         """
         Transforma os dados dos Pokémon em análises e estatísticas.
-        
+
+        Sem ``estado``, os registros são carregados em uma PokemonTable e as
+        análises são calculadas por reduções vetorizadas. Se ``estado`` for
+        informado, os novos registros são incorporados a ele antes da
+        finalização, permitindo reanalisar um conjunto crescente sem
+        reprocessar os registros anteriores.
+
         Args:
             pokemon_list: Lista de dicionários com dados dos Pokémon
-            
+            estado: Estado agregado existente a ser atualizado (opcional)
+
         Returns:
             Dicionário com análises e estatísticas
         """
         try:
-            # Converte para DataFrame
-            df = pd.DataFrame(pokemon_list)
-            
-            # Análises por tipo
-            tipos_analise = self._analise_por_tipo(df)
-            
-            # Top 5 por experiência
-            top_experiencia = self._top_experiencia(df)
-            
-            # Estatísticas gerais
-            estatisticas = self._estatisticas_gerais(df)
-            
+            if estado is not None:
+                return estado.update(pokemon_list).finalize()
+
+            # Converte para o armazenamento colunar
+            table = PokemonTable.from_records(pokemon_list)
+
             return {
-                'tipos_analise': tipos_analise,
-                'top_experiencia': top_experiencia,
-                'estatisticas': estatisticas
+                'tipos_analise': self._analise_por_tipo(table),
+                'top_experiencia': self._top_experiencia(table),
+                'estatisticas': self._estatisticas_gerais(table)
             }
-            
+
         except Exception as e:
             self.logger.error(f"Erro na transformação de dados: {str(e)}")
             raise
-            
-    def _analise_por_tipo(self, df: pd.DataFrame) -> Dict:
+
+    def transform_many(self, table: PokemonTable, membros: np.ndarray) -> List[Dict]:
+        """
+        Calcula as análises de vários subconjuntos da mesma tabela de uma vez.
+
+        As reduções de todos os subconjuntos saem das mesmas multiplicações
+        de matrizes, sem montar uma tabela por subconjunto.
+
+        Args:
+            table: Tabela com a união dos Pokémon de todos os subconjuntos
+            membros: Matriz booleana (subconjuntos, linhas da tabela); a
+                linha i marca os Pokémon do i-ésimo subconjunto
+
+        Returns:
+            Uma análise por subconjunto, no formato de ``transform`` sobre
+            os mesmos registros na ordem da tabela
+        """
+        pesos = membros.astype(np.float64)
+        tipos_analise = self._analise_por_tipo_lote(table, pesos)
+        top_experiencia = self._top_experiencia_lote(table, membros)
+        estatisticas = self._estatisticas_gerais_lote(table, pesos)
+        return [
+            {
+                'tipos_analise': tipos_analise[i],
+                'top_experiencia': top_experiencia[i],
+                'estatisticas': estatisticas[i]
+            }
+            for i in range(len(membros))
+        ]
+
+    def _analise_por_tipo(self, table: PokemonTable) -> Dict:
         """Analisa estatísticas por tipo de Pokémon."""
-        # Explode a lista de tipos
-        df_tipos = df.explode('tipos')
-        
-        # Agrupa por tipo e calcula médias
-        analise = df_tipos.groupby('tipos').agg({
-            'ataque': 'mean',
-            'defesa': 'mean',
-            'hp': 'mean'
-        }).round(2)
-        
-        return analise.to_dict()
-        
-    def _top_experiencia(self, df: pd.DataFrame) -> List[Dict]:
+        # Matriz (n, tipos) multiplicada pelas estatísticas (n, stats)
+        matriz = table.type_matrix().astype(np.float64)
+        valores = np.column_stack([table[stat] for stat in STATS]).astype(np.float64)
+        contagens = matriz.sum(axis=0)
+        somas = matriz.T @ valores
+
+        presentes = [i for i in np.argsort(table.vocabulario, kind='stable') if contagens[i] > 0]
+        medias = np.round(somas[presentes] / contagens[presentes, None], 2)
+        tipos = [table.vocabulario[i] for i in presentes]
+
+        return {
+            stat: dict(zip(tipos, medias[:, j].tolist()))
+            for j, stat in enumerate(STATS)
+        }
+
+    def _top_experiencia(self, table: PokemonTable, k: int = 5) -> List[Dict]:
         """Retorna os 5 Pokémon com maior experiência base."""
-        top_5 = df.nlargest(5, 'experiencia_base')[['nome', 'experiencia_base']]
-        return top_5.to_dict('records')
-        
-    def _estatisticas_gerais(self, df: pd.DataFrame) -> Dict:
+        experiencia = table['experiencia_base']
+        # Pokémon sem experiência base (NaN) ficam fora do ranking
+        validos = np.flatnonzero(~np.isnan(experiencia))
+        if len(validos) > k:
+            # Candidatos com valor >= k-ésimo maior; empates mantêm a ordem original
+            valores = experiencia[validos]
+            limite = np.partition(valores, len(valores) - k)[len(valores) - k]
+            candidatos = validos[valores >= limite]
+        else:
+            candidatos = validos
+        ordem = candidatos[np.lexsort((candidatos, -experiencia[candidatos]))][:k]
+
+        return [
+            {'nome': table.nomes[i], 'experiencia_base': int(experiencia[i])}
+            for i in ordem.tolist()
+        ]
+
+    def _estatisticas_gerais(self, table: PokemonTable) -> Dict:
         """Calcula estatísticas gerais dos Pokémon."""
-        return {
-            'total_pokemon': len(df),
-            'media_ataque': float(df['ataque'].mean()),
-            'media_defesa': float(df['defesa'].mean()),
-            'media_hp': float(df['hp'].mean()),
-            'distribuicao_categorias': df['categoria'].value_counts().to_dict()
-        } 
\ No newline at end of file
+        contagens = np.bincount(table.categorias, minlength=len(CATEGORIAS))
+        ordem = np.argsort(-contagens, kind='stable')
+
+        estatisticas = {'total_pokemon': len(table)}
+        for campo in STATS + MEDIDAS:
+            estatisticas[f'media_{campo}'] = float(table[campo].mean()) if len(table) else 0.0
+        estatisticas['distribuicao_categorias'] = {
+            CATEGORIAS[i]: int(contagens[i]) for i in ordem if contagens[i] > 0
+        }
+        return estatisticas
+
+    def _analise_por_tipo_lote(self, table: PokemonTable, pesos: np.ndarray) -> List[Dict]:
+        """``_analise_por_tipo`` de cada linha de ``pesos`` (subconjuntos, linhas)."""
+        matriz = table.type_matrix().astype(np.float64)
+        contagens = pesos @ matriz
+        # (subconjuntos, tipos, stats), uma multiplicação por estatística
+        somas = np.stack(
+            [(pesos * table[stat].astype(np.float64)) @ matriz for stat in STATS],
+            axis=2,
+        )
+        ordem_tipos = np.argsort(table.vocabulario, kind='stable')
+
+        resultados = []
+        for i in range(len(pesos)):
+            presentes = [j for j in ordem_tipos if contagens[i, j] > 0]
+            medias = np.round(somas[i, presentes] / contagens[i, presentes, None], 2)
+            tipos = [table.vocabulario[j] for j in presentes]
+            resultados.append({
+                stat: dict(zip(tipos, medias[:, k].tolist()))
+                for k, stat in enumerate(STATS)
+            })
+        return resultados
+
+    def _top_experiencia_lote(self, table: PokemonTable, membros: np.ndarray, k: int = 5) -> List[List[Dict]]:
+        """``_top_experiencia`` de cada linha de ``membros`` (subconjuntos, linhas)."""
+        experiencia = table['experiencia_base']
+        if not len(experiencia):
+            return [[] for _ in range(len(membros))]
+        # Não membros e Pokémon sem experiência base ficam depois de qualquer
+        # candidato; a ordenação estável mantém a ordem da tabela nos empates
+        candidatos = membros & ~np.isnan(experiencia)
+        chave = np.where(candidatos, -experiencia, np.inf)
+        ordem = np.argsort(chave, axis=1, kind='stable')[:, :k]
+
+        return [
+            [
+                {'nome': table.nomes[j], 'experiencia_base': int(experiencia[j])}
+                for j in ordem[i].tolist() if candidatos[i, j]
+            ]
+            for i in range(len(membros))
+        ]
+
+    def _estatisticas_gerais_lote(self, table: PokemonTable, pesos: np.ndarray) -> List[Dict]:
+        """``_estatisticas_gerais`` de cada linha de ``pesos`` (subconjuntos, linhas)."""
+        campos = STATS + MEDIDAS
+        totais = pesos.sum(axis=1)
+        valores = np.column_stack([table[campo] for campo in campos]).astype(np.float64)
+        somas = pesos @ valores
+        categorias = np.eye(len(CATEGORIAS))[table.categorias]
+        contagens = (pesos @ categorias).astype(np.int64)
+
+        resultados = []
+        for i in range(len(pesos)):
+            total = int(totais[i])
+            estatisticas = {'total_pokemon': total}
+            for j, campo in enumerate(campos):
+                estatisticas[f'media_{campo}'] = float(somas[i, j] / total) if total else 0.0
+            ordem = np.argsort(-contagens[i], kind='stable')
+            estatisticas['distribuicao_categorias'] = {
+                CATEGORIAS[j]: int(contagens[i, j]) for j in ordem if contagens[i, j] > 0
+            }
+            resultados.append(estatisticas)
+        return resultados
@@ -1,26 +1,101 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
-@dataclass
+# Versão do formato compacto gravado no cache. Registros com outra versão
+# são tratados como ausentes e buscados novamente.
+CACHE_SCHEMA_VERSION = 2
+
+# Estatísticas base da PokeAPI e o campo correspondente em Pokemon
+STAT_FIELDS = {
+    "hp": "hp",
+    "attack": "ataque",
+    "defense": "defesa",
+    "special-attack": "ataque_especial",
+    "special-defense": "defesa_especial",
+    "speed": "velocidade",
+}
+
+def decode_stats(stats: Iterable[Dict]) -> Dict[str, int]:
+    """
+    Decodifica a lista ``stats`` da PokeAPI em uma única passagem.
+
+    Retorna ``{campo: valor}`` para as estatísticas de ``STAT_FIELDS``;
+    estatísticas desconhecidas são ignoradas.
+    """
+    valores = {}
+    for stat in stats:
+        campo = STAT_FIELDS.get(stat['stat']['name'])
+        if campo is not None:
+            valores[campo] = stat['base_stat']
+    return valores
+
+@dataclass(slots=True)
 class Pokemon:
     id: int
     nome: str
-    experiencia_base: int
+    experiencia_base: Optional[int]
     tipos: List[str]
     hp: int
     ataque: int
     defesa: int
+    ataque_especial: int = 0
+    defesa_especial: int = 0
+    velocidade: int = 0
+    altura: int = 0
+    peso: int = 0
+    especie: str = ""
     categoria: Optional[str] = None
 
     def __post_init__(self):
         # Normaliza o nome para título
         self.nome = self.nome.title()
-        
-        # Categoriza o Pokémon baseado na experiência
+
+        # Categoriza o Pokémon baseado na experiência; a PokeAPI devolve
+        # base_experience null para algumas formas
         if self.categoria is None:
-            if self.experiencia_base < 50:
+            if self.experiencia_base is None:
+                self.categoria = "Desconhecido"
+            elif self.experiencia_base < 50:
                 self.categoria = "Fraco"
             elif self.experiencia_base <= 100:
                 self.categoria = "Médio"
             else:
-                self.categoria = "Forte" 
\ No newline at end of file
+                self.categoria = "Forte"
+
+    def to_record(self) -> Dict:
+        """Serializa apenas os campos projetados, no formato compacto do cache."""
+        return {
+            "v": CACHE_SCHEMA_VERSION,
+            "id": self.id,
+            "nome": self.nome,
+            "experiencia_base": self.experiencia_base,
+            "tipos": self.tipos,
+            "hp": self.hp,
+            "ataque": self.ataque,
+            "defesa": self.defesa,
+            "ataque_especial": self.ataque_especial,
+            "defesa_especial": self.defesa_especial,
+            "velocidade": self.velocidade,
+            "altura": self.altura,
+            "peso": self.peso,
+            "especie": self.especie,
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict) -> "Pokemon":
+        """Reconstrói um Pokemon a partir de um registro compacto do cache."""
+        return cls(
+            id=record["id"],
+            nome=record["nome"],
+            experiencia_base=record["experiencia_base"],
+            tipos=record["tipos"],
+            hp=record["hp"],
+            ataque=record["ataque"],
+            defesa=record["defesa"],
+            ataque_especial=record["ataque_especial"],
+            defesa_especial=record["defesa_especial"],
+            velocidade=record["velocidade"],
+            altura=record["altura"],
+            peso=record["peso"],
+            especie=record["especie"],
+        )
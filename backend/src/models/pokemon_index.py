@@ -0,0 +1,92 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional
+
+# Versão do formato persistido do índice
+INDEX_SCHEMA_VERSION = 1
+
+class PokemonIndex:
+    """
+    Índice completo de nomes e IDs da PokeAPI, ordenado por ID.
+
+    Janelas de paginação (limit, offset) são fatias da lista ordenada, como
+    na própria API. Buscas por ID usam bisseção sobre os IDs e buscas por
+    nome usam bisseção sobre uma cópia ordenada dos nomes, ambas em O(log n).
+    """
+
+    def __init__(self, ids: List[int], nomes: List[str], urls: List[str]):
+        """
+        Args:
+            ids: IDs em ordem crescente
+            nomes: Nomes na mesma ordem dos IDs
+            urls: URLs de detalhe na mesma ordem dos IDs
+        """
+        self.ids = ids
+        self.nomes = nomes
+        self.urls = urls
+
+        # Nomes ordenados e a posição correspondente na lista por ID
+        ordem = sorted(range(len(nomes)), key=nomes.__getitem__)
+        self._nomes_ordenados = [nomes[i] for i in ordem]
+        self._posicao_nome = ordem
+
+    @classmethod
+    def from_results(cls, results: Iterable[Dict]) -> "PokemonIndex":
+        """Cria o índice a partir dos ``results`` do endpoint de listagem."""
+        entradas = sorted(
+            (int(r['url'].rstrip('/').split('/')[-1]), r['name'], r['url'])
+            for r in results
+        )
+        return cls(
+            [e[0] for e in entradas],
+            [e[1] for e in entradas],
+            [e[2] for e in entradas],
+        )
+
+    def to_record(self) -> Dict:
+        """Serializa o índice para o cache persistente."""
+        return {"v": INDEX_SCHEMA_VERSION, "ids": self.ids, "nomes": self.nomes, "urls": self.urls}
+
+    @classmethod
+    def from_record(cls, record: Dict) -> Optional["PokemonIndex"]:
+        """Reconstrói o índice a partir de ``to_record``; None se o formato for outro."""
+        if record.get("v") != INDEX_SCHEMA_VERSION:
+            return None
+        return cls(record["ids"], record["nomes"], record["urls"])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PokemonIndex):
+            return NotImplemented
+        return self.ids == other.ids and self.nomes == other.nomes and self.urls == other.urls
+
+    def _entrada(self, i: int) -> Dict:
+        return {"name": self.nomes[i], "url": self.urls[i]}
+
+    def window(self, limit: int, offset: int = 0) -> List[Dict]:
+        """Retorna a janela de paginação no formato de ``results`` da API."""
+        offset = max(offset, 0)
+        fim = min(offset + max(limit, 0), len(self.ids))
+        return [self._entrada(i) for i in range(offset, fim)]
+
+    def by_id(self, pokemon_id: int) -> Optional[Dict]:
+        """Busca um Pokémon pelo ID."""
+        i = bisect_left(self.ids, pokemon_id)
+        if i < len(self.ids) and self.ids[i] == pokemon_id:
+            return self._entrada(i)
+        return None
+
+    def by_name(self, nome: str) -> Optional[Dict]:
+        """Busca um Pokémon pelo nome exato (sem diferenciar maiúsculas)."""
+        nome = nome.lower()
+        i = bisect_left(self._nomes_ordenados, nome)
+        if i < len(self._nomes_ordenados) and self._nomes_ordenados[i] == nome:
+            return self._entrada(self._posicao_nome[i])
+        return None
+
+    def id_range(self, inicio: int, fim: int) -> List[Dict]:
+        """Retorna os Pokémon com ID no intervalo fechado [inicio, fim]."""
+        i = bisect_left(self.ids, inicio)
+        j = bisect_right(self.ids, fim)
+        return [self._entrada(k) for k in range(i, j)]
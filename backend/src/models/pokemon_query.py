@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from models.pokemon_table import CATEGORIAS, PokemonTable
+from utils.lazy_imports import lazy_import
+
+# numpy só é carregado quando o primeiro índice é montado
+np = lazy_import("numpy")
+
+class PokemonQueryIndex:
+    """
+    Índices em memória sobre uma PokemonTable para consultas com filtros.
+
+    - Índice invertido por tipo e por categoria: posições (crescentes) das
+      linhas de cada valor.
+    - Por coluna numérica, as posições ordenadas pelo valor (crescente e
+      decrescente, empates pela posição) e os valores já ordenados. Faixas
+      são resolvidas por busca binária e ordenações sem filtros saem direto
+      da ordem pré-calculada. Valores ausentes (NaN) ficam no fim das duas
+      ordens e fora de qualquer faixa.
+
+    As posições se referem às linhas da tabela; ``table.to_records`` as
+    converte em registros.
+    """
+
+    def __init__(self, table: PokemonTable):
+        self.table = table
+        matriz = table.type_matrix()
+        self.por_tipo: Dict[str, np.ndarray] = {
+            tipo: np.flatnonzero(matriz[:, j])
+            for j, tipo in enumerate(table.vocabulario)
+        }
+        self.por_categoria: Dict[str, np.ndarray] = {
+            categoria: np.flatnonzero(table.categorias == i)
+            for i, categoria in enumerate(CATEGORIAS)
+        }
+
+        self.ordem: Dict[str, np.ndarray] = {}
+        self.ordem_decrescente: Dict[str, np.ndarray] = {}
+        self.ordenados: Dict[str, np.ndarray] = {}
+        for coluna, valores in table.colunas.items():
+            # argsort deixa NaN no fim, tanto em ``valores`` quanto em ``-valores``
+            ordem = np.argsort(valores, kind="stable")
+            self.ordem[coluna] = ordem
+            self.ordem_decrescente[coluna] = np.argsort(-valores, kind="stable")
+            ordenados = valores[ordem]
+            if ordenados.dtype.kind == "f":
+                # Só os valores presentes: a busca binária das faixas não alcança os ausentes
+                ordenados = ordenados[~np.isnan(ordenados)]
+            self.ordenados[coluna] = ordenados
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    @property
+    def colunas(self) -> List[str]:
+        """Colunas numéricas disponíveis para faixas e ordenação."""
+        return list(self.table.colunas)
+
+    def query(
+        self,
+        tipos: Optional[Sequence[str]] = None,
+        todos_os_tipos: bool = False,
+        categorias: Optional[Sequence[str]] = None,
+        minimos: Optional[Dict[str, int]] = None,
+        maximos: Optional[Dict[str, int]] = None,
+        ordenar_por: Optional[str] = None,
+        decrescente: bool = True,
+        limite: Optional[int] = None,
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Seleciona as linhas que atendem a todos os filtros.
+
+        Args:
+            tipos: Tipos aceitos; basta um deles, salvo com ``todos_os_tipos``
+            todos_os_tipos: Exige todos os ``tipos`` no mesmo Pokémon
+            categorias: Categorias aceitas (qualquer uma delas)
+            minimos: Valor mínimo (inclusive) por coluna
+            maximos: Valor máximo (inclusive) por coluna
+            ordenar_por: Coluna de ordenação; sem ela, a ordem é a da tabela
+            decrescente: Ordena do maior para o menor valor
+            limite: Quantidade máxima de linhas retornadas (top-K)
+
+        Returns:
+            (posições das linhas selecionadas, total de linhas que atendem
+            aos filtros antes do limite)
+
+        Raises:
+            ValueError: Tipo, categoria ou atributo desconhecidos
+        """
+        minimos = minimos or {}
+        maximos = maximos or {}
+        self._validar(tipos, categorias, [*minimos, *maximos, *([ordenar_por] if ordenar_por else [])])
+
+        conjuntos = []
+        if tipos:
+            listas = [self.por_tipo[tipo] for tipo in tipos]
+            if todos_os_tipos:
+                conjuntos.extend(listas)
+            else:
+                conjuntos.append(_uniao(listas))
+        if categorias:
+            conjuntos.append(_uniao([self.por_categoria[categoria] for categoria in categorias]))
+        for coluna in dict.fromkeys([*minimos, *maximos]):
+            conjuntos.append(self._faixa(coluna, minimos.get(coluna), maximos.get(coluna)))
+
+        if limite is not None and limite < 0:
+            limite = 0
+
+        if not conjuntos:
+            total = len(self)
+            if ordenar_por is None:
+                return np.arange(total if limite is None else min(limite, total)), total
+            ordem = self.ordem_decrescente[ordenar_por] if decrescente else self.ordem[ordenar_por]
+            return ordem[:limite], total
+
+        posicoes = _intersecao(conjuntos)
+        total = len(posicoes)
+        if ordenar_por is None:
+            return posicoes[:limite], total
+        return self._top(posicoes, ordenar_por, decrescente, limite), total
+
+    def _validar(self, tipos: Optional[Sequence[str]], categorias: Optional[Sequence[str]], colunas: Sequence[str]):
+        """Rejeita nomes que não existem nos índices."""
+        desconhecidos = [tipo for tipo in tipos or [] if tipo not in self.por_tipo]
+        if desconhecidos:
+            raise ValueError(f"Tipos desconhecidos: {', '.join(desconhecidos)}")
+        desconhecidas = [categoria for categoria in categorias or [] if categoria not in self.por_categoria]
+        if desconhecidas:
+            raise ValueError(f"Categorias desconhecidas: {', '.join(desconhecidas)}")
+        desconhecidas = [coluna for coluna in colunas if coluna not in self.ordem]
+        if desconhecidas:
+            raise ValueError(f"Atributos desconhecidos: {', '.join(desconhecidas)}")
+
+    def _faixa(self, coluna: str, minimo: Optional[int], maximo: Optional[int]) -> np.ndarray:
+        """Posições (crescentes) com ``minimo <= valor <= maximo``, por busca binária."""
+        ordenados = self.ordenados[coluna]
+        inicio = 0 if minimo is None else np.searchsorted(ordenados, minimo, side="left")
+        fim = len(ordenados) if maximo is None else np.searchsorted(ordenados, maximo, side="right")
+        if inicio >= fim:
+            return _vazio()
+        return np.sort(self.ordem[coluna][inicio:fim])
+
+    def _top(self, posicoes: np.ndarray, coluna: str, decrescente: bool, limite: Optional[int]) -> np.ndarray:
+        """Ordena as posições pela coluna, mantendo só as ``limite`` primeiras."""
+        chave = self.table[coluna][posicoes]
+        if decrescente:
+            chave = -chave
+        if chave.dtype.kind == "f":
+            # Ausentes por último, nos dois sentidos
+            chave = np.where(np.isnan(chave), np.inf, chave)
+        if limite is not None and limite < len(posicoes):
+            if limite == 0:
+                return _vazio()
+            # Candidatos até o k-ésimo valor; empates no limite seguem a posição
+            corte = np.partition(chave, limite - 1)[limite - 1]
+            candidatos = np.flatnonzero(chave <= corte)
+            posicoes, chave = posicoes[candidatos], chave[candidatos]
+        return posicoes[np.lexsort((posicoes, chave))][:limite]
+
+
+def _vazio() -> np.ndarray:
+    """Conjunto vazio de posições."""
+    return np.empty(0, dtype=np.int64)
+
+
+def _uniao(listas: List[np.ndarray]) -> np.ndarray:
+    """União de listas crescentes de posições, mantendo a ordem crescente."""
+    if len(listas) == 1:
+        return listas[0]
+    return np.unique(np.concatenate(listas))
+
+
+def _intersecao(conjuntos: List[np.ndarray]) -> np.ndarray:
+    """Interseção de listas crescentes de posições, começando pela menor."""
+    conjuntos = sorted(conjuntos, key=len)
+    resultado = conjuntos[0]
+    for conjunto in conjuntos[1:]:
+        if not len(resultado):
+            break
+        resultado = np.intersect1d(resultado, conjunto, assume_unique=True)
+    return resultado
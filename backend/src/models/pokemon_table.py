@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from utils.lazy_imports import lazy_import
+
+# numpy só é carregado quando a primeira tabela é montada
+np = lazy_import("numpy")
+
+# Os 18 tipos oficiais; tipos desconhecidos são acrescentados ao vocabulário
+TIPOS = [
+    "normal", "fire", "water", "grass", "electric", "ice",
+    "fighting", "poison", "ground", "flying", "psychic", "bug",
+    "rock", "ghost", "dragon", "dark", "steel", "fairy",
+]
+
+# "Desconhecido" é a categoria dos Pokémon sem experiência base
+CATEGORIAS = ["Fraco", "Médio", "Forte", "Desconhecido"]
+
+# Colunas numéricas armazenadas como arrays contíguos
+COLUNAS = (
+    "id", "experiencia_base",
+    "hp", "ataque", "defesa", "ataque_especial", "defesa_especial", "velocidade",
+    "altura", "peso",
+)
+
+# Colunas que aceitam valores ausentes (``base_experience`` pode ser null na
+# PokeAPI); são armazenadas como ``float64`` com NaN no lugar de None
+COLUNAS_OPCIONAIS = ("experiencia_base",)
+
+# Limite de tipos representáveis na máscara de bits
+_MAX_TIPOS = 64
+
+def _coluna(registros: Sequence[Dict], coluna: str, n: int) -> np.ndarray:
+    """Array de uma coluna numérica; None vira NaN nas colunas opcionais."""
+    if coluna in COLUNAS_OPCIONAIS:
+        valores = (np.nan if registro[coluna] is None else registro[coluna] for registro in registros)
+        return np.fromiter(valores, dtype=np.float64, count=n)
+    return np.fromiter((registro[coluna] for registro in registros), dtype=np.int64, count=n)
+
+class PokemonTable:
+    """
+    Armazenamento colunar de Pokémon sobre arrays NumPy.
+
+    As colunas numéricas são arrays ``int64`` contíguos (``float64`` com NaN
+    nas colunas de ``COLUNAS_OPCIONAIS``), os tipos são uma
+    máscara de bits (um bit por tipo do vocabulário) e a categoria é um
+    código inteiro sobre ``CATEGORIAS``. Nomes e espécies ficam em listas.
+    """
+
+    def __init__(
+        self,
+        colunas: Dict[str, np.ndarray],
+        nomes: List[str],
+        tipos_bits: np.ndarray,
+        categorias: np.ndarray,
+        vocabulario: Optional[List[str]] = None,
+        especies: Optional[List[str]] = None,
+    ):
+        self.colunas = colunas
+        self.nomes = nomes
+        self.especies = especies if especies is not None else [""] * len(nomes)
+        self.tipos_bits = tipos_bits
+        self.categorias = categorias
+        self.vocabulario = list(vocabulario or TIPOS)
+
+    def __len__(self) -> int:
+        return len(self.nomes)
+
+    def __getitem__(self, coluna: str) -> np.ndarray:
+        return self.colunas[coluna]
+
+    @classmethod
+    def from_records(cls, registros: Iterable[Dict]) -> "PokemonTable":
+        """Constrói a tabela a partir de dicionários no formato de ``_pokemon_to_dict``."""
+        registros = registros if isinstance(registros, Sequence) else list(registros)
+        n = len(registros)
+        vocabulario = list(TIPOS)
+        posicao_tipo = {tipo: i for i, tipo in enumerate(vocabulario)}
+        posicao_categoria = {categoria: i for i, categoria in enumerate(CATEGORIAS)}
+
+        # Uma passada por coluna: o custo por campo numérico é de um fromiter,
+        # não de uma atribuição elemento a elemento em um array NumPy
+        colunas = {coluna: _coluna(registros, coluna, n) for coluna in COLUNAS}
+        nomes = [registro["nome"] for registro in registros]
+        especies = [registro["especie"] for registro in registros]
+        tipos_bits = np.zeros(n, dtype=np.uint64)
+        categorias = np.empty(n, dtype=np.int8)
+
+        for i, registro in enumerate(registros):
+            bits = 0
+            for tipo in registro["tipos"]:
+                posicao = posicao_tipo.get(tipo)
+                if posicao is None:
+                    if len(vocabulario) >= _MAX_TIPOS:
+                        raise ValueError(f"Mais de {_MAX_TIPOS} tipos distintos")
+                    posicao = posicao_tipo[tipo] = len(vocabulario)
+                    vocabulario.append(tipo)
+                bits |= 1 << posicao
+            tipos_bits[i] = bits
+            categorias[i] = posicao_categoria[registro["categoria"]]
+
+        return cls(colunas, nomes, tipos_bits, categorias, vocabulario, especies)
+
+    def type_matrix(self) -> np.ndarray:
+        """Matriz booleana (n, tipos) indicando os tipos de cada Pokémon."""
+        deslocamentos = np.arange(len(self.vocabulario), dtype=np.uint64)
+        return ((self.tipos_bits[:, None] >> deslocamentos) & np.uint64(1)).astype(bool)
+
+    def tipos_de(self, i: int) -> List[str]:
+        """Decodifica os tipos do Pokémon na posição ``i``."""
+        bits = int(self.tipos_bits[i])
+        return [tipo for j, tipo in enumerate(self.vocabulario) if bits >> j & 1]
+
+    def take(self, indices: np.ndarray) -> "PokemonTable":
+        """Retorna uma nova tabela apenas com as linhas indicadas."""
+        indices = np.asarray(indices)
+        return PokemonTable(
+            {coluna: valores[indices] for coluna, valores in self.colunas.items()},
+            [self.nomes[i] for i in indices.tolist()],
+            self.tipos_bits[indices],
+            self.categorias[indices],
+            self.vocabulario,
+            [self.especies[i] for i in indices.tolist()],
+        )
+
+    def to_records(self, indices: Optional[Iterable[int]] = None) -> List[Dict]:
+        """Converte linhas da tabela de volta para dicionários."""
+        if indices is None:
+            indices = np.arange(len(self))
+        indices = np.asarray(list(indices) if not isinstance(indices, np.ndarray) else indices, dtype=np.int64)
+        colunas = {coluna: valores[indices].tolist() for coluna, valores in self.colunas.items()}
+        for coluna in COLUNAS_OPCIONAIS:
+            colunas[coluna] = [None if math.isnan(valor) else int(valor) for valor in colunas[coluna]]
+        registros = []
+        for j, i in enumerate(indices.tolist()):
+            registro = {coluna: colunas[coluna][j] for coluna in COLUNAS}
+            registro["nome"] = self.nomes[i]
+            registro["especie"] = self.especies[i]
+            registro["tipos"] = self.tipos_de(i)
+            registro["categoria"] = CATEGORIAS[self.categorias[i]]
+            registros.append(registro)
+        return registros
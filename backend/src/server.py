@@ -1,17 +1,30 @@
 import mcp.types as types
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 from mcp.server.sse import SseServerTransport
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from dataclasses import fields, replace
+from typing import Iterator, Optional
 import os
-import json
+import re
+import asyncio
 import base64
-import pandas as pd
+import mimetypes
+import time
 from dotenv import load_dotenv
 
-from controllers.data_extractor import DataExtractor
 from controllers.transformer import DataTransformer
-from controllers.reporter import ReportGenerator
+from controllers.reporter import OpcoesGrafico, ReportGenerator
+from controllers.analysis_cache import AnalysisCache
+from controllers.batch_analysis import BatchAnalyzer
+from controllers.query_engine import QueryEngine
+from controllers.cache_warmer import CacheWarmer
+from controllers.exporter import DataExporter
+from controllers.metrics import REGISTRY, observe_stage, record_status, stage, track_tool
+from controllers.serializer import JsonSerializer, campos_invalidos, paginar, selecionar_campos
+from models.pokemon import Pokemon
+from utils.lazy_imports import warmup
+from config import criar_extractor, lock_aquecimento, preparar_cache
 
 load_dotenv()
 
@@ -20,10 +33,63 @@ host = os.getenv("HOST", "0.0.0.0")
 port = int(os.getenv("PORT", "8000"))
 transport = os.getenv("TRANSPORT", "sse")
 
+# Processos do uvicorn; com mais de um, MCP e API de arquivos dividem a porta
+workers = int(os.getenv("WORKERS", "1"))
+
+# Quantidade de Pokémon por bloco na resposta de extrair_dados_pokemon
+stream_chunk_size = int(os.getenv("STREAM_CHUNK_SIZE", "100"))
+
+# Serialização das respostas: orjson quando instalado e saída compacta opcional
+serializer = JsonSerializer(
+    backend=os.getenv("JSON_SERIALIZER", "auto"),
+    compacto=os.getenv("JSON_COMPACT", "false").lower() == "true",
+)
+
+# Resolução, tamanho (polegadas) e formato padrão do gráfico dos relatórios
+opcoes_grafico = OpcoesGrafico.from_tamanho(
+    os.getenv("REPORT_CHART_SIZE", "15x8"),
+    dpi=int(os.getenv("REPORT_CHART_DPI", "150")),
+    formato=os.getenv("REPORT_CHART_FORMAT", "png").lower(),
+)
+
+# Linhas por grupo gravado nas exportações e codec do Parquet
+export_row_group_size = int(os.getenv("EXPORT_ROW_GROUP_SIZE", "500"))
+export_parquet_compression = os.getenv("EXPORT_PARQUET_COMPRESSION", "zstd")
+
+# Campos disponíveis nos registros de Pokémon das respostas
+CAMPOS_POKEMON = [campo.name for campo in fields(Pokemon)]
+
 # Inicializa controladores
-extractor = DataExtractor()
+# Mesma configuração do cache usada por warm_cache.py
+extractor = criar_extractor()
+preparar_cache(extractor)
 transformer = DataTransformer()
-reporter = ReportGenerator()
+reporter = ReportGenerator(
+    max_workers=int(os.getenv("REPORT_WORKERS", "2")),
+    max_bytes=int(os.getenv("REPORT_MAX_MB", "500")) * 1024 * 1024,
+    max_age_hours=float(os.getenv("REPORT_MAX_AGE_HOURS", "168")),
+    opcoes_grafico=opcoes_grafico,
+)
+analysis_cache = AnalysisCache(extractor, max_size=int(os.getenv("ANALYSIS_CACHE_SIZE", "64")))
+# Consultas indexam a listagem completa; QUERY_MAX_POKEMON limita aos primeiros N
+query_engine = QueryEngine(extractor, max_pokemon=int(os.getenv("QUERY_MAX_POKEMON", "0")) or None)
+batch_analyzer = BatchAnalyzer(
+    extractor,
+    transformer,
+    reporter,
+    max_especificacoes=int(os.getenv("BATCH_MAX_SPECS", "20")),
+)
+exporter = DataExporter(
+    extractor,
+    tamanho_grupo=export_row_group_size,
+    compressao_parquet=export_parquet_compression,
+    ao_publicar=reporter.purge,
+)
+
+# Taxas de acerto dos caches são exportadas em /metrics
+REGISTRY.register_cache("pokemon", extractor.cache_stats)
+REGISTRY.register_cache("analysis", analysis_cache.stats)
+REGISTRY.register_cache("graficos", reporter.graficos_stats)
 
 # Inicializa FastAPI
 app = FastAPI()
@@ -31,6 +97,16 @@ app = FastAPI()
 # Caminho base para os relatórios
 REPORTS_BASE_DIR = os.path.join("relatorios")
 
+# Versões antigas do mimetypes não conhecem WebP (formato opcional do gráfico)
+# nem os formatos colunares das exportações
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("application/vnd.apache.parquet", ".parquet")
+mimetypes.add_type("application/vnd.apache.arrow.file", ".arrow")
+mimetypes.add_type("application/zstd", ".zst")
+
+# Tamanho dos blocos lidos ao enviar arquivos
+FILE_CHUNK_SIZE = 64 * 1024
+
 def _file_to_base64(file_path: str) -> str:
     """Converte um arquivo para base64."""
     try:
@@ -39,30 +115,109 @@ def _file_to_base64(file_path: str) -> str:
     except Exception as e:
         return ""
 
-def _csv_to_json(csv_path: str) -> list:
-    """Converte um arquivo CSV para formato JSON."""
-    try:
-        df = pd.read_csv(csv_path)
-        return df.to_dict(orient='records')
-    except Exception as e:
-        return []
+async def _obter_analise(
+    limit: int,
+    offset: int = 0,
+    aguardar_relatorio: bool = True,
+    opcoes_grafico: Optional[OpcoesGrafico] = None,
+) -> dict:
+    """Extrai, transforma e gera relatórios, reaproveitando análises memorizadas.
 
-# Endpoint HTTP para obter arquivo em base64
-@app.get("/api/file/{file_path:path}")
-async def get_file_base64(file_path: str):
-    """Endpoint para obter arquivo em base64.
-    
-    Args:
-        file_path: Caminho relativo do arquivo dentro da pasta relatorios
+    Com ``aguardar_relatorio=False`` os relatórios são gerados em segundo
+    plano e ``relatorio`` traz o ``job_id`` para consulta do status.
+    ``opcoes_grafico`` substitui as opções padrão do gráfico nesta chamada.
+
+    Retorna um dicionário com ``pokemon_data``, ``analise`` e ``relatorio``.
+    """
+    async def calcular() -> dict:
+        with stage("extract"):
+            pokemon_data = await extractor.extract(limit=limit, offset=offset)
+        if pokemon_data["status"] == "error":
+            return {"pokemon_data": pokemon_data, "analise": None, "relatorio": None}
+        with stage("transform"):
+            analise = await transformer.transform(pokemon_data["data"])
+        return {"pokemon_data": pokemon_data, "analise": analise, "relatorio": None}
+
+    entrada = await analysis_cache.get_or_compute(limit, offset, calcular)
+    if entrada["analise"] is not None:
+        # A entrada memorizada é compartilhada; o relatório desta chamada vai
+        # em uma cópia rasa. O gerador pula a escrita quando os arquivos
+        # atuais já são desta análise
+        with stage("report"):
+            relatorio = await reporter.generate(
+                entrada["analise"], aguardar=aguardar_relatorio, opcoes_grafico=opcoes_grafico
+            )
+        entrada = {**entrada, "relatorio": relatorio}
+    return entrada
+
+def _opcoes_grafico(
+    formato: Optional[str] = None,
+    dpi: Optional[int] = None,
+    tamanho: Optional[str] = None,
+) -> OpcoesGrafico:
+    """Aplica os parâmetros informados sobre as opções padrão do gráfico.
+
+    Raises:
+        ValueError: Formato, resolução ou tamanho inválidos
     """
+    padrao = reporter.opcoes_grafico
+    opcoes = OpcoesGrafico.from_tamanho(tamanho) if tamanho else padrao
+    return replace(opcoes, dpi=dpi or padrao.dpi, formato=(formato or padrao.formato).lower())
+
+def _resolver_arquivo(file_path: str) -> str:
+    """Resolve um caminho relativo à pasta relatorios, validando o acesso."""
     # Garante que o arquivo está dentro da pasta relatorios
     full_path = os.path.join(REPORTS_BASE_DIR, file_path)
-    if not os.path.exists(full_path):
+    if not os.path.isfile(full_path):
         raise HTTPException(status_code=404, detail="Arquivo não encontrado")
     
     # Verifica se o arquivo está dentro da pasta relatorios
-    if not os.path.abspath(full_path).startswith(os.path.abspath(REPORTS_BASE_DIR)):
+    base = os.path.abspath(REPORTS_BASE_DIR)
+    if not os.path.abspath(full_path).startswith(base + os.sep):
         raise HTTPException(status_code=403, detail="Acesso negado")
+    return full_path
+
+def _etag(stat: os.stat_result) -> str:
+    """ETag derivado do tamanho e da data de modificação do arquivo."""
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+def _ler_intervalo(full_path: str, inicio: int, fim: int) -> Iterator[bytes]:
+    """Lê o intervalo [inicio, fim] do arquivo em blocos de tamanho fixo."""
+    with open(full_path, 'rb') as file:
+        file.seek(inicio)
+        restante = fim - inicio + 1
+        while restante > 0:
+            bloco = file.read(min(FILE_CHUNK_SIZE, restante))
+            if not bloco:
+                break
+            restante -= len(bloco)
+            yield bloco
+
+def _base64_em_blocos(full_path: str) -> Iterator[bytes]:
+    """Gera o JSON de /api/file codificando o arquivo em base64 por blocos."""
+    yield b'{"status":"success","file":"'
+    with open(full_path, 'rb') as file:
+        while True:
+            # Blocos múltiplos de 3 bytes não geram padding intermediário
+            bloco = file.read(FILE_CHUNK_SIZE - FILE_CHUNK_SIZE % 3)
+            if not bloco:
+                break
+            yield base64.b64encode(bloco)
+    yield b'"}'
+
+# Endpoint HTTP para obter arquivo em base64
+@app.get("/api/file/{file_path:path}")
+async def get_file_base64(file_path: str, stream: bool = False):
+    """Endpoint para obter arquivo em base64.
+    
+    Args:
+        file_path: Caminho relativo do arquivo dentro da pasta relatorios
+        stream: Codifica e envia o arquivo em blocos, com memória constante
+    """
+    full_path = _resolver_arquivo(file_path)
+
+    if stream:
+        return StreamingResponse(_base64_em_blocos(full_path), media_type="application/json")
     
     base64_data = _file_to_base64(full_path)
     if not base64_data:
@@ -73,6 +228,93 @@ async def get_file_base64(file_path: str):
         "file": base64_data
     })
 
+# Endpoint HTTP para download do arquivo em bytes
+@app.get("/api/files/{file_path:path}")
+async def get_file(file_path: str, request: Request):
+    """Endpoint para baixar um arquivo de relatório sem codificação.
+
+    Suporta ETag/If-None-Match e requisições parciais (Range) de um único
+    intervalo. Downloads completos usam sendfile quando o servidor suporta.
+    
+    Args:
+        file_path: Caminho relativo do arquivo dentro da pasta relatorios
+    """
+    full_path = _resolver_arquivo(file_path)
+    stat = os.stat(full_path)
+    etag = _etag(stat)
+    media_type, codificacao = mimetypes.guess_type(full_path)
+    if codificacao == "gzip":
+        # .csv.gz é enviado como o arquivo comprimido, sem Content-Encoding
+        media_type = "application/gzip"
+    media_type = media_type or "application/octet-stream"
+    headers = {"ETag": etag, "Accept-Ranges": "bytes", "Cache-Control": "no-cache"}
+
+    if etag in (request.headers.get("if-none-match") or ""):
+        return Response(status_code=304, headers=headers)
+
+    intervalo = request.headers.get("range")
+    if not intervalo:
+        return FileResponse(full_path, media_type=media_type, headers=headers, stat_result=stat)
+
+    tamanho = stat.st_size
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", intervalo.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        raise HTTPException(status_code=416, detail="Range inválido", headers={"Content-Range": f"bytes */{tamanho}"})
+
+    if match.group(1) == "":
+        # Sufixo: últimos N bytes
+        inicio = max(0, tamanho - int(match.group(2)))
+        fim = tamanho - 1
+    else:
+        inicio = int(match.group(1))
+        fim = min(int(match.group(2)), tamanho - 1) if match.group(2) else tamanho - 1
+    if inicio > fim or inicio >= tamanho:
+        raise HTTPException(status_code=416, detail="Range inválido", headers={"Content-Range": f"bytes */{tamanho}"})
+
+    headers["Content-Range"] = f"bytes {inicio}-{fim}/{tamanho}"
+    headers["Content-Length"] = str(fim - inicio + 1)
+    return StreamingResponse(
+        _ler_intervalo(full_path, inicio, fim),
+        status_code=206,
+        media_type=media_type,
+        headers=headers,
+    )
+
+def _nomes_arquivos(relatorio: dict) -> dict:
+    """Converte os caminhos gerados em nomes relativos à pasta relatorios."""
+    def relativo(path: str) -> str:
+        return os.path.relpath(path, REPORTS_BASE_DIR) if path else ""
+
+    return {
+        "tipos": relativo(relatorio["csv_path"]["tipos"]),
+        "top": relativo(relatorio["csv_path"]["top"]),
+        "grafico": relativo(relatorio["graficos_path"])
+    }
+
+def _status_relatorio(job_id: str) -> dict:
+    """Monta o status de um job de relatório com apenas os nomes dos arquivos."""
+    job = reporter.status(job_id)
+    if job is None:
+        return {"status": "error", "message": "Job não encontrado"}
+    if "arquivos" in job:
+        relatorio = job["arquivos"]
+        job["arquivos"] = _nomes_arquivos(relatorio)
+    return job
+
+@app.get("/metrics")
+async def get_metrics():
+    """Exporta as métricas no formato texto do Prometheus."""
+    return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# Endpoint HTTP para consultar o andamento de um relatório
+@app.get("/api/relatorios/status/{job_id}")
+async def get_report_status(job_id: str):
+    """Endpoint para consultar o status de uma geração de relatórios."""
+    result = _status_relatorio(job_id)
+    if result.get("status") == "error" and "job_id" not in result:
+        raise HTTPException(status_code=404, detail=result["message"])
+    return JSONResponse(result)
+
 # Configura o MCP
 mcp = FastMCP(
     "pokemon-analysis",
@@ -85,8 +327,35 @@ mcp = FastMCP(
 # Configura o transporte SSE
 sse_transport = SseServerTransport(endpoint="/sse")
 
+def _responder(result: dict, compacto: Optional[bool] = None) -> list[types.TextContent]:
+    """Serializa o resultado de uma ferramenta em um único conteúdo de texto."""
+    record_status(result.get("status", ""))
+    with stage("serialize"):
+        texto = serializer.dumps(result, compacto)
+    return [types.TextContent(type="text", text=texto)]
+
+def _erro_campos(campos: Optional[list[str]]) -> Optional[dict]:
+    """Valida os campos pedidos para os registros de Pokémon."""
+    invalidos = campos_invalidos(campos, CAMPOS_POKEMON)
+    if not invalidos:
+        return None
+    return {
+        "status": "error",
+        "message": f"Campos desconhecidos: {', '.join(invalidos)}",
+        "campos_disponiveis": CAMPOS_POKEMON,
+        "data": [],
+    }
+
 @mcp.tool()
-async def extrair_dados_pokemon(limit: int = 100) -> list[types.TextContent]:
+@track_tool
+async def extrair_dados_pokemon(
+    limit: int = 100,
+    offset: int = 0,
+    campos: Optional[list[str]] = None,
+    resumo: bool = False,
+    compacto: Optional[bool] = None,
+    ctx: Context = None,
+) -> list[types.TextContent]:
     """Extrai dados básicos dos Pokémon da PokeAPI.
     
     Retorna uma lista de Pokémon com seus atributos principais:
@@ -94,15 +363,96 @@ async def extrair_dados_pokemon(limit: int = 100) -> list[types.TextContent]:
     - Tipos
     - Estatísticas (HP, Ataque, Defesa)
     - Experiência base
+
+    Os Pokémon saem em ordem crescente de ID. Para limites maiores que o
+    tamanho de bloco, o primeiro conteúdo traz o resumo da extração e os
+    seguintes trazem os Pokémon em blocos consecutivos, na mesma ordem.
     
     Args:
         limit: Número máximo de Pokémon para extrair (padrão: 100)
+        offset: Posição do primeiro Pokémon na listagem, para paginação (padrão: 0)
+        campos: Campos mantidos em cada Pokémon (ex.: ["nome", "tipos"]); todos por padrão
+        resumo: Se True, retorna apenas o resumo da extração, sem os Pokémon
+        compacto: JSON sem indentação; o padrão vem de JSON_COMPACT
     """
-    result = await extractor.extract(limit=limit)
-    return [types.TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
+    erro = _erro_campos(campos)
+    if erro is not None:
+        return _responder(erro, compacto)
+
+    erros = []
+    blocos = []
+    bloco = []
+    total = 0
+
+    async def progresso(concluidos: int, total_lista: int):
+        if ctx is not None:
+            await ctx.report_progress(concluidos, total_lista)
+
+    def serializar_bloco(dados: list) -> str:
+        return serializer.dumps({"bloco": len(blocos) + 1, "data": selecionar_campos(dados, campos)}, compacto)
+
+    # A serialização dos blocos acontece durante a extração; o tempo gasto
+    # nela é descontado da etapa extract e contado em serialize
+    serializacao = 0.0
+    inicio = time.perf_counter()
+    try:
+        # Ordem da listagem (crescente por ID) em todos os blocos, como na API
+        async for registro in extractor.extract_stream(
+            limit=limit, offset=offset, erros=erros, progress_callback=progresso, ordenado=True
+        ):
+            total += 1
+            if resumo:
+                continue
+            # Serializa cada bloco cheio imediatamente para liberar os registros
+            if len(bloco) >= stream_chunk_size:
+                inicio_bloco = time.perf_counter()
+                blocos.append(serializar_bloco(bloco))
+                serializacao += time.perf_counter() - inicio_bloco
+                bloco = []
+            bloco.append(registro)
+    except Exception as e:
+        return _responder({"status": "error", "message": str(e), "data": []}, compacto)
+    finally:
+        observe_stage("extract", time.perf_counter() - inicio - serializacao)
+
+    if total == 0 and erros:
+        result = {"status": "error", "message": "Nenhum Pokémon pôde ser extraído", "erros": erros, "data": []}
+        return _responder(result, compacto)
+
+    result = {
+        "status": "partial" if erros else "success",
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+    }
+    if erros:
+        result["erros"] = erros
+
+    # Resposta que cabe em um bloco mantém o formato de um único documento
+    if resumo or not blocos:
+        if not resumo:
+            result["data"] = selecionar_campos(bloco, campos)
+        return _responder(result, compacto)
+
+    record_status(result["status"])
+    inicio = time.perf_counter()
+    blocos.append(serializar_bloco(bloco))
+    result["blocos"] = len(blocos)
+    conteudos = [types.TextContent(type="text", text=serializer.dumps(result, compacto))]
+    observe_stage("serialize", serializacao + time.perf_counter() - inicio)
+    conteudos.extend(types.TextContent(type="text", text=texto) for texto in blocos)
+    return conteudos
 
 @mcp.tool()
-async def gerar_analise(limit: int = 100) -> list[types.TextContent]:
+@track_tool
+async def gerar_analise(
+    limit: int = 100,
+    campos: Optional[list[str]] = None,
+    resumo: bool = False,
+    pagina: int = 1,
+    tamanho_pagina: Optional[int] = None,
+    compacto: Optional[bool] = None,
+) -> list[types.TextContent]:
     """Gera uma análise completa dos Pokémon.
     
     A análise inclui:
@@ -110,40 +460,64 @@ async def gerar_analise(limit: int = 100) -> list[types.TextContent]:
        - Fraco: Experiência < 50
        - Médio: Experiência entre 50 e 100
        - Forte: Experiência > 100
+       - Desconhecido: sem experiência base na PokeAPI
     
     2. Estatísticas por tipo:
-       - Média de ataque
-       - Média de defesa
-       - Média de HP
+       - Média de ataque, defesa e HP
+       - Média de ataque especial, defesa especial e velocidade
        - Quantidade de Pokémon
     
     3. Top 5 Pokémon por experiência base
+
+    Os Pokémon analisados acompanham a análise em `pokemon_data.data`. Para
+    limites grandes, use `resumo`, `campos` ou `tamanho_pagina` para reduzir
+    a resposta.
     
     Args:
         limit: Número máximo de Pokémon para analisar (padrão: 100)
+        campos: Campos mantidos em cada Pokémon de `pokemon_data.data`; todos por padrão
+        resumo: Se True, retorna apenas a análise, sem a lista de Pokémon
+        pagina: Página de `pokemon_data.data` retornada, a partir de 1 (padrão: 1)
+        tamanho_pagina: Pokémon por página; sem valor, todos são retornados
+        compacto: JSON sem indentação; o padrão vem de JSON_COMPACT
     """
-    # Extrai dados
-    pokemon_data = await extractor.extract(limit=limit)
+    erro = _erro_campos(campos)
+    if erro is not None:
+        return _responder(erro, compacto)
+
+    # Os arquivos são gerados em segundo plano; a análise não depende deles
+    entrada = await _obter_analise(limit, aguardar_relatorio=False)
+    pokemon_data = entrada["pokemon_data"]
     
     if pokemon_data["status"] == "error":
-        return [types.TextContent(type="text", text=json.dumps(pokemon_data, ensure_ascii=False, indent=2))]
-    
-    # Transforma dados
-    analise = await transformer.transform(pokemon_data["data"])
-    
-    # Gera relatório (apenas para salvar os arquivos)
-    await reporter.generate(analise)
+        return _responder(pokemon_data, compacto)
+
+    # A entrada é compartilhada com o cache de análises; monta uma cópia rasa
+    dados = {k: v for k, v in pokemon_data.items() if k != "data"}
+    if not resumo:
+        pagina_dados = paginar(pokemon_data["data"], pagina, tamanho_pagina)
+        pagina_dados["data"] = selecionar_campos(pagina_dados["data"], campos)
+        if tamanho_pagina:
+            dados["paginacao"] = {k: v for k, v in pagina_dados.items() if k != "data"}
+        dados["data"] = pagina_dados["data"]
     
     result = {
         "status": "success",
-        "pokemon_data": pokemon_data,
-        "analise": analise
+        "pokemon_data": dados,
+        "analise": entrada["analise"]
     }
-    
-    return [types.TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
+    return _responder(result, compacto)
 
 @mcp.tool()
-async def gerar_relatorio_csv(limit: int = 100) -> list[types.TextContent]:
+@track_tool
+async def gerar_relatorio_csv(
+    limit: int = 100,
+    aguardar: bool = True,
+    formato_grafico: Optional[str] = None,
+    dpi_grafico: Optional[int] = None,
+    tamanho_grafico: Optional[str] = None,
+    compacto: Optional[bool] = None,
+) -> list[types.TextContent]:
     """Gera relatórios em CSV com análises detalhadas.
     
     Gera dois arquivos CSV:
@@ -155,47 +529,284 @@ async def gerar_relatorio_csv(limit: int = 100) -> list[types.TextContent]:
        - Top 5 Pokémon por experiência
        - Atributos detalhados
     
-    Retorna apenas os nomes dos arquivos gerados.
+    Retorna os nomes dos arquivos gerados, relativos à pasta de relatórios
+    (ex.: `<hash>/analise_tipos.csv`), prontos para uso em /api/file.
     
     Args:
         limit: Número máximo de Pokémon para incluir (padrão: 100)
+        aguardar: Se False, retorna os nomes imediatamente com um `job_id`;
+            a conclusão pode ser consultada com `status_relatorio` (padrão: True)
+        formato_grafico: png, svg ou webp; o padrão vem de REPORT_CHART_FORMAT
+        dpi_grafico: Resolução do gráfico (20 a 600); o padrão vem de REPORT_CHART_DPI
+        tamanho_grafico: Tamanho em polegadas, ex.: "15x8"; o padrão vem de REPORT_CHART_SIZE
+        compacto: JSON sem indentação; o padrão vem de JSON_COMPACT
     """
-    pokemon_data = await extractor.extract(limit=limit)
+    try:
+        opcoes = _opcoes_grafico(formato_grafico, dpi_grafico, tamanho_grafico)
+    except ValueError as e:
+        return _responder({"status": "error", "message": str(e)}, compacto)
+
+    entrada = await _obter_analise(limit, aguardar_relatorio=aguardar, opcoes_grafico=opcoes)
+    pokemon_data = entrada["pokemon_data"]
     
     if pokemon_data["status"] == "error":
-        return [types.TextContent(type="text", text=json.dumps(pokemon_data, ensure_ascii=False, indent=2))]
+        return _responder(pokemon_data, compacto)
     
-    analise = await transformer.transform(pokemon_data["data"])
-    relatorio = await reporter.generate(analise)
+    relatorio = entrada["relatorio"]
     
-    # Extrai apenas os nomes dos arquivos dos caminhos completos
     result = {
         "status": "success",
-        "arquivos": {
-            "tipos": os.path.basename(relatorio["csv_path"]["tipos"]),
-            "top": os.path.basename(relatorio["csv_path"]["top"]),
-            "grafico": os.path.basename(relatorio["graficos_path"])
-        }
+        "arquivos": _nomes_arquivos(relatorio)
     }
+    if "job_id" in relatorio:
+        result["job_id"] = relatorio["job_id"]
     
-    return [types.TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
+    return _responder(result, compacto)
+
+@mcp.tool()
+@track_tool
+async def status_relatorio(job_id: str, compacto: Optional[bool] = None) -> list[types.TextContent]:
+    """Consulta o andamento de uma geração de relatórios disparada sem aguardar.
+    
+    Status possíveis: em_andamento, concluido, erro, cancelado.
+    
+    Args:
+        job_id: Identificador retornado por gerar_relatorio_csv
+        compacto: JSON sem indentação; o padrão vem de JSON_COMPACT
+    """
+    return _responder(_status_relatorio(job_id), compacto)
+
+@mcp.tool()
+@track_tool
+async def consultar_pokemon(
+    tipos: Optional[list[str]] = None,
+    todos_os_tipos: bool = False,
+    categorias: Optional[list[str]] = None,
+    minimos: Optional[dict[str, int]] = None,
+    maximos: Optional[dict[str, int]] = None,
+    ordenar_por: Optional[str] = None,
+    decrescente: bool = True,
+    limite: int = 20,
+    campos: Optional[list[str]] = None,
+    compacto: Optional[bool] = None,
+) -> list[types.TextContent]:
+    """Consulta os Pokémon com filtros, ordenação e top-K, sem trazer a listagem inteira.
+
+    Exemplo: tipos de fogo com ataque acima de 100, do mais forte ao mais
+    fraco: `tipos=["fire"], minimos={"ataque": 101}, ordenar_por="ataque"`.
+
+    Atributos numéricos para filtros e ordenação: id, experiencia_base, hp,
+    ataque, defesa, ataque_especial, defesa_especial, velocidade, altura
+    (decímetros) e peso (hectogramas). Categorias: Fraco, Médio, Forte e
+    Desconhecido (sem experiência base). Tipos em inglês, como na PokeAPI
+    (fire, water, grass...).
+
+    Args:
+        tipos: Tipos aceitos; basta o Pokémon ter um deles
+        todos_os_tipos: Se True, o Pokémon precisa ter todos os `tipos`
+        categorias: Categorias aceitas (ex.: ["Forte"])
+        minimos: Valor mínimo (inclusive) por atributo (ex.: {"ataque": 101})
+        maximos: Valor máximo (inclusive) por atributo (ex.: {"defesa": 50})
+        ordenar_por: Atributo usado na ordenação; sem ele, a ordem é por ID
+        decrescente: Ordena do maior para o menor valor (padrão: True)
+        limite: Quantidade máxima de Pokémon retornados (padrão: 20)
+        campos: Campos mantidos em cada Pokémon (ex.: ["nome", "ataque"]); todos por padrão
+        compacto: JSON sem indentação; o padrão vem de JSON_COMPACT
+    """
+    erro = _erro_campos(campos)
+    if erro is not None:
+        return _responder(erro, compacto)
+
+    try:
+        with stage("index"):
+            await query_engine.get_index()
+        with stage("query"):
+            result = await query_engine.query(
+                tipos=tipos,
+                todos_os_tipos=todos_os_tipos,
+                categorias=categorias,
+                minimos=minimos,
+                maximos=maximos,
+                ordenar_por=ordenar_por,
+                decrescente=decrescente,
+                limite=limite,
+            )
+    except ValueError as e:
+        # Filtro inválido: informa os valores aceitos
+        return _responder({"status": "error", "message": str(e), **query_engine.opcoes(), "data": []}, compacto)
+    except Exception as e:
+        return _responder({"status": "error", "message": str(e), "data": []}, compacto)
+
+    result["data"] = selecionar_campos(result["data"], campos)
+    return _responder(result, compacto)
+
+@mcp.tool()
+@track_tool
+async def gerar_analises_em_lote(
+    especificacoes: list[dict],
+    gerar_relatorios: bool = False,
+    aguardar: bool = True,
+    compacto: Optional[bool] = None,
+) -> list[types.TextContent]:
+    """Gera várias análises em uma única chamada, buscando cada Pokémon uma só vez.
+
+    Use no lugar de várias chamadas seguidas de gerar_analise (ex.: uma
+    análise por geração). Cada especificação aceita:
+    - nome: Rótulo da análise na resposta (padrão: analise_<n>)
+    - limit / offset: Janela da listagem da PokeAPI (padrão: 100 / 0)
+    - tipos, todos_os_tipos, categorias, minimos, maximos: Filtros, como em
+      consultar_pokemon
+
+    Exemplo, 1ª e 2ª gerações e os Pokémon de fogo da 1ª:
+    `[{"nome": "gen1", "limit": 151}, {"nome": "gen2", "limit": 100, "offset": 151},
+    {"nome": "fogo_gen1", "limit": 151, "tipos": ["fire"]}]`
+
+    A resposta traz em `resultados` a análise de cada especificação (no
+    formato de gerar_analise) e em `combinado` a análise da união dos
+    Pokémon selecionados.
+
+    Args:
+        especificacoes: Lista de especificações de análise
+        gerar_relatorios: Se True, gera os CSVs e o gráfico de cada análise,
+            em paralelo; os nomes dos arquivos vêm em `arquivos`
+        aguardar: Se False, os relatórios continuam em segundo plano e cada
+            resultado traz um `job_id` para status_relatorio (padrão: True)
+        compacto: JSON sem indentação; o padrão vem de JSON_COMPACT
+    """
+    try:
+        especificacoes = batch_analyzer.normalizar(especificacoes)
+        result = await batch_analyzer.analyze(especificacoes, gerar_relatorios=gerar_relatorios, aguardar=aguardar)
+    except Exception as e:
+        # Inclui especificações inválidas (ValueError)
+        return _responder({"status": "error", "message": str(e)}, compacto)
+
+    for resultado in result.get("resultados", []):
+        relatorio = resultado.pop("relatorio", None)
+        if relatorio is not None:
+            resultado["arquivos"] = _nomes_arquivos(relatorio)
+            if "job_id" in relatorio:
+                resultado["job_id"] = relatorio["job_id"]
+    return _responder(result, compacto)
+
+@mcp.tool()
+@track_tool
+async def exportar_dados(
+    limit: int = 100,
+    offset: int = 0,
+    formato: Optional[str] = None,
+    compacto: Optional[bool] = None,
+) -> list[types.TextContent]:
+    """Exporta os dados completos de cada Pokémon e as agregações para análise externa.
+
+    Gera três arquivos no formato escolhido: `pokemon` (uma linha por
+    Pokémon, com todos os atributos), `tipos` (médias e quantidade por tipo)
+    e `top` (ranking de experiência). As linhas de `pokemon` seguem a ordem
+    por ID. Os nomes retornados em `arquivos` servem para download em
+    /api/files e para leitura com ler_exportacao.
+
+    Formatos: parquet, arrow (Arrow IPC), csv, csv.gz e csv.zst. Parquet e
+    Arrow exigem o pacote pyarrow; csv.zst exige zstandard.
+
+    Args:
+        limit: Número máximo de Pokémon exportados (padrão: 100)
+        offset: Posição do primeiro Pokémon na listagem (padrão: 0)
+        formato: Formato dos arquivos; o padrão é parquet, ou csv.gz sem pyarrow
+        compacto: JSON sem indentação; o padrão vem de JSON_COMPACT
+    """
+    try:
+        result = await exporter.export(limit=limit, offset=offset, formato=formato)
+    except Exception as e:
+        # Inclui formato ou janela inválidos (ValueError) e falhas na listagem
+        return _responder({"status": "error", "message": str(e)}, compacto)
+
+    if "arquivos" in result:
+        result["arquivos"] = {
+            nome: os.path.relpath(path, REPORTS_BASE_DIR) for nome, path in result["arquivos"].items()
+        }
+    return _responder(result, compacto)
+
+@mcp.tool()
+@track_tool
+async def ler_exportacao(
+    arquivo: str,
+    colunas: Optional[list[str]] = None,
+    offset: int = 0,
+    limite: int = 100,
+    compacto: Optional[bool] = None,
+) -> list[types.TextContent]:
+    """Lê uma faixa de linhas de um arquivo gerado por exportar_dados.
+
+    Só a faixa pedida é lida: Arrow é mapeado em memória, no Parquet são
+    lidos apenas os grupos e colunas necessários e o CSV é percorrido até o
+    fim da faixa. `mais` indica se há linhas depois da faixa.
+
+    Args:
+        arquivo: Nome retornado em `arquivos` por exportar_dados
+        colunas: Colunas retornadas; sem valor, todas
+        offset: Primeira linha retornada (padrão: 0)
+        limite: Quantidade máxima de linhas, até 1000 (padrão: 100)
+        compacto: JSON sem indentação; o padrão vem de JSON_COMPACT
+    """
+    try:
+        with stage("query"):
+            result = await asyncio.to_thread(
+                exporter.read, os.path.join(REPORTS_BASE_DIR, arquivo), colunas, offset, limite
+            )
+    except ValueError as e:
+        return _responder({"status": "error", "message": str(e)}, compacto)
+    result["arquivo"] = arquivo
+    return _responder(result, compacto)
+
+# Com vários workers, apenas o processo que obtiver este lock aquece o cache
+_lock_aquecimento = lock_aquecimento(extractor)
+
+def iniciar_servicos() -> Optional[asyncio.Task]:
+    """Pré-carrega módulos e inicia o aquecimento do cache, conforme configurado."""
+    # numpy/pandas/matplotlib carregam no primeiro uso; o pré-carregamento
+    # troca um início mais lento por uma primeira análise sem esse custo
+    if os.getenv("WARMUP_IMPORTS", "false").lower() in ("1", "true", "yes"):
+        warmup()
+
+    # Mantém o cache local sincronizado com a PokeAPI em segundo plano
+    if os.getenv("CACHE_WARMUP", "false").lower() in ("1", "true", "yes"):
+        if not _lock_aquecimento.try_acquire():
+            return None
+        intervalo = float(os.getenv("CACHE_WARMUP_INTERVAL_HOURS", "1")) * 3600
+        return asyncio.create_task(CacheWarmer(extractor).run_periodic(intervalo))
+    return None
+
+async def encerrar_servicos(aquecimento: Optional[asyncio.Task]):
+    """Interrompe o aquecimento e libera as conexões e processos do worker."""
+    if aquecimento is not None:
+        aquecimento.cancel()
+        _lock_aquecimento.release()
+    await extractor.close()
+    reporter.close()
 
 async def main():
-    if transport == "sse":
-        await mcp.run_sse_async()
-    else:
-        await mcp.run_stdio_async()
+    aquecimento = iniciar_servicos()
+    try:
+        if transport == "sse":
+            await mcp.run_sse_async()
+        else:
+            await mcp.run_stdio_async()
+    finally:
+        await encerrar_servicos(aquecimento)
 
 if __name__ == "__main__":
-    import asyncio
     import uvicorn
-    
-    # Inicia o servidor FastAPI em uma thread separada
-    import threading
-    def run_fastapi():
-        uvicorn.run(app, host=host, port=port + 1)
-    
-    threading.Thread(target=run_fastapi, daemon=True).start()
-    
-    # Inicia o servidor MCP
-    asyncio.run(main())
\ No newline at end of file
+
+    if transport == "sse" and workers > 1:
+        # MCP (/sse, /messages/) e API de arquivos na mesma porta, em vários processos
+        src_dir = os.path.dirname(os.path.abspath(__file__))
+        uvicorn.run("asgi:app", host=host, port=port, workers=workers, app_dir=src_dir)
+    else:
+        # Inicia o servidor FastAPI em uma thread separada
+        import threading
+        def run_fastapi():
+            uvicorn.run(app, host=host, port=port + 1)
+
+        threading.Thread(target=run_fastapi, daemon=True).start()
+
+        # Inicia o servidor MCP
+        asyncio.run(main())
@@ -0,0 +1,56 @@
+import importlib
+import importlib.util
+import logging
+import sys
+import time
+from types import ModuleType
+from typing import Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Dependências pesadas de análise e gráficos, carregadas sob demanda
+HEAVY_MODULES = ("numpy", "pandas", "matplotlib.pyplot")
+
+
+def lazy_import(nome: str) -> ModuleType:
+    """
+    Retorna o módulo ``nome`` sem executá-lo.
+
+    O módulo é registrado em ``sys.modules`` e só é de fato carregado no
+    primeiro acesso a um atributo (ex.: ``np.zeros``). Se já estiver
+    carregado, é retornado diretamente.
+    """
+    if nome in sys.modules:
+        return sys.modules[nome]
+
+    spec = importlib.util.find_spec(nome)
+    if spec is None:
+        raise ModuleNotFoundError(f"Módulo não encontrado: {nome}", name=nome)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[nome] = module
+    loader.exec_module(module)
+    return module
+
+
+def warmup(modulos: Iterable[str] = HEAVY_MODULES) -> Dict[str, float]:
+    """
+    Carrega antecipadamente os módulos indicados.
+
+    Útil para tirar o custo de importação da primeira requisição. Retorna o
+    tempo de carga de cada módulo, em milissegundos.
+    """
+    tempos = {}
+    for nome in modulos:
+        inicio = time.perf_counter()
+        if nome.startswith("matplotlib"):
+            # O backend sem interface precisa ser escolhido antes do pyplot
+            importlib.import_module("matplotlib").use("Agg")
+        module = importlib.import_module(nome)
+        # Acessar um atributo força a execução de módulos carregados com lazy_import
+        getattr(module, "__version__", None)
+        tempos[nome] = round((time.perf_counter() - inicio) * 1000, 1)
+    logger.info(f"Módulos pré-carregados: {tempos}")
+    return tempos
@@ -0,0 +1,49 @@
+"""
+Sincroniza todos os Pokémon da PokeAPI para o cache local.
+
+Uso:
+    python src/warm_cache.py [--periodico HORAS]
+
+Pode ser interrompido a qualquer momento: a próxima execução retoma a
+partir das entradas que ainda faltam ou estão perto de expirar.
+"""
+import argparse
+import asyncio
+import json
+import logging
+
+from dotenv import load_dotenv
+
+from controllers.cache_warmer import CacheWarmer
+from config import criar_extractor, lock_aquecimento, preparar_cache
+
+load_dotenv()
+
+async def main(periodico: float = 0):
+    # Mesma configuração e mesmos locks do servidor, que pode estar rodando
+    extractor = criar_extractor()
+    preparar_cache(extractor)
+    lock = lock_aquecimento(extractor)
+    try:
+        # Um servidor com CACHE_WARMUP segura o lock enquanto estiver no ar
+        if not lock.try_acquire():
+            logging.warning("Outro processo já está aquecendo o cache; nada a fazer")
+            return
+        try:
+            warmer = CacheWarmer(extractor)
+            if periodico:
+                await warmer.run_periodic(periodico * 3600)
+            else:
+                print(json.dumps(await warmer.run(), ensure_ascii=False, indent=2))
+        finally:
+            lock.release()
+    finally:
+        await extractor.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--periodico", type=float, default=0, help="Repete a sincronização a cada N horas")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.periodico))
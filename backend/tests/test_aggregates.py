@@ -0,0 +1,64 @@
+"""Paridade entre o AggregateState incremental e o DataTransformer vetorizado."""
+import asyncio
+import random
+
+from controllers.aggregates import AggregateState
+from controllers.transformer import DataTransformer
+from models.pokemon import Pokemon
+
+TIPOS = ["normal", "fire", "water", "grass", "electric", "psychic"]
+
+
+def _registros(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    registros = []
+    for i in range(1, n + 1):
+        pokemon = Pokemon(
+            id=i, nome=f"p{i}", experiencia_base=rng.choice([30, 60, 150, 150]),
+            tipos=rng.sample(TIPOS, rng.randint(1, 2)), hp=rng.randint(10, 255),
+            ataque=rng.randint(5, 190), defesa=rng.randint(5, 230), ataque_especial=rng.randint(10, 194),
+            defesa_especial=rng.randint(20, 230), velocidade=rng.randint(5, 180),
+            altura=rng.randint(1, 200), peso=rng.randint(1, 9999), especie=f"p{i}",
+        )
+        registros.append({
+            "id": pokemon.id, "nome": pokemon.nome, "experiencia_base": pokemon.experiencia_base,
+            "tipos": pokemon.tipos, "hp": pokemon.hp, "ataque": pokemon.ataque, "defesa": pokemon.defesa,
+            "ataque_especial": pokemon.ataque_especial, "defesa_especial": pokemon.defesa_especial,
+            "velocidade": pokemon.velocidade, "altura": pokemon.altura, "peso": pokemon.peso,
+            "especie": pokemon.especie, "categoria": pokemon.categoria,
+        })
+    return registros
+
+
+def _com_ordem(analise: dict) -> dict:
+    """Compara também a ordem da distribuição de categorias."""
+    estatisticas = analise["estatisticas"]
+    return {**analise, "ordem_categorias": list(estatisticas["distribuicao_categorias"])}
+
+
+def test_incremental_igual_ao_vetorizado():
+    registros = _registros(300)
+    esperado = asyncio.run(DataTransformer().transform(registros))
+
+    estado = AggregateState()
+    for registro in registros:
+        estado.add(registro)
+    assert _com_ordem(estado.finalize()) == _com_ordem(esperado)
+
+    # Partições combinadas com merge chegam ao mesmo resultado
+    particoes = [AggregateState().update(registros[i::3]) for i in range(3)]
+    combinado = particoes[0].merge(particoes[1]).merge(particoes[2])
+    assert _com_ordem(combinado.finalize()) == _com_ordem(esperado)
+
+
+def test_empate_de_categorias_segue_ordem_de_categorias():
+    # Um Pokémon de cada categoria, inseridos na ordem inversa de CATEGORIAS
+    registros = [r for r in _registros(200) if r["categoria"] in ("Forte", "Médio", "Fraco")]
+    por_categoria = {}
+    for registro in registros:
+        por_categoria.setdefault(registro["categoria"], registro)
+    amostra = [por_categoria["Forte"], por_categoria["Médio"], por_categoria["Fraco"]]
+
+    incremental = AggregateState().update(amostra).finalize()["estatisticas"]["distribuicao_categorias"]
+    vetorizado = asyncio.run(DataTransformer().transform(amostra))["estatisticas"]["distribuicao_categorias"]
+    assert list(incremental) == list(vetorizado) == ["Fraco", "Médio", "Forte"]
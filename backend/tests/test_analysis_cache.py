@@ -0,0 +1,53 @@
+"""Testes da invalidação do cache de análises pelas versões dos Pokémon."""
+import asyncio
+from datetime import timedelta
+
+from controllers.analysis_cache import AnalysisCache
+
+
+class ExtratorFalso:
+    """Extrator mínimo: janela de IDs e versões por Pokémon."""
+
+    def __init__(self):
+        self.cache_expiry = timedelta(hours=1)
+        self.ids = list(range(1, 21))
+        self.versoes = {}
+
+    async def window_ids(self, limit, offset=0):
+        return self.ids[offset:offset + limit]
+
+    def versao(self, ids):
+        return max((self.versoes.get(i, 0) for i in ids), default=0)
+
+
+def _cenario(passos):
+    extractor = ExtratorFalso()
+    cache = AnalysisCache(extractor)
+    calculos = []
+
+    async def executar():
+        async def compute():
+            calculos.append(1)
+            return {"pokemon_data": {"status": "success"}, "analise": {}, "relatorio": None}
+        for passo in passos:
+            passo(extractor)
+            await cache.get_or_compute(10, 0, compute)
+
+    asyncio.run(executar())
+    return len(calculos)
+
+
+def test_reaproveita_sem_mudancas():
+    assert _cenario([lambda e: None] * 3) == 1
+
+
+def test_mudanca_fora_da_janela_nao_invalida():
+    assert _cenario([lambda e: None, lambda e: e.versoes.update({15: 1})]) == 1
+
+
+def test_mudanca_na_janela_invalida():
+    assert _cenario([lambda e: None, lambda e: e.versoes.update({3: 1}), lambda e: None]) == 2
+
+
+def test_troca_do_indice_invalida():
+    assert _cenario([lambda e: None, lambda e: e.ids.insert(0, 0)]) == 2
@@ -0,0 +1,26 @@
+"""Testes da validação de especificações do BatchAnalyzer."""
+import pytest
+
+from controllers.batch_analysis import BatchAnalyzer
+
+
+@pytest.mark.parametrize("especificacao", [
+    {"limit": True},
+    {"limit": 0},
+    {"limit": 1.5},
+    {"offset": False},
+    {"offset": -1},
+    {"offset": "0"},
+])
+def test_normalizar_recusa_limit_offset_invalidos(especificacao):
+    analyzer = BatchAnalyzer(extractor=None, transformer=None)
+    with pytest.raises(ValueError, match="Especificação 0"):
+        analyzer.normalizar([especificacao])
+
+
+def test_normalizar_preenche_padroes():
+    analyzer = BatchAnalyzer(extractor=None, transformer=None)
+    [normalizada] = analyzer.normalizar([{"limit": 10, "offset": 5}])
+    assert normalizada["limit"] == 10
+    assert normalizada["offset"] == 5
+    assert normalizada["nome"] == "analise_1"
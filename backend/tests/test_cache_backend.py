@@ -0,0 +1,97 @@
+"""Testes dos backends de cache persistente."""
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from controllers.cache_backend import CacheBackend, JsonFileCacheBackend, SQLiteCacheBackend
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+# Processo que grava ``n`` chaves com prefixo próprio, uma transação por chave
+_GRAVADOR = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from controllers.cache_backend import SQLiteCacheBackend
+backend = SQLiteCacheBackend(sys.argv[2], ttl=60)
+for i in range(int(sys.argv[4])):
+    backend.set_many([(f"{sys.argv[3]}_{i}", {"i": i})])
+backend.close()
+"""
+
+
+def test_interface_e_abstrata():
+    with pytest.raises(TypeError):
+        CacheBackend(60)
+
+
+def test_gravacao_aguarda_lock_de_escrita_de_outra_conexao(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    backend = SQLiteCacheBackend(db_path, ttl=60)
+
+    outra = sqlite3.connect(db_path, isolation_level=None)
+    outra.execute("BEGIN IMMEDIATE")
+    erros = []
+
+    def gravar():
+        try:
+            backend.set_many([("k", {"v": 1})])
+        except Exception as e:
+            erros.append(e)
+
+    inicio = time.monotonic()
+    gravador = threading.Thread(target=gravar)
+    gravador.start()
+    time.sleep(0.3)
+    # Ainda bloqueado pela transação da outra conexão
+    assert gravador.is_alive()
+    outra.execute("COMMIT")
+    gravador.join(5)
+
+    assert not erros
+    assert time.monotonic() - inicio >= 0.3
+    assert backend.get("k") == {"v": 1}
+    outra.close()
+    backend.close()
+
+
+def test_processos_gravando_ao_mesmo_tempo(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    SQLiteCacheBackend(db_path, ttl=60).close()
+
+    processos = [
+        subprocess.Popen([sys.executable, "-c", _GRAVADOR, SRC, db_path, f"p{n}", "200"])
+        for n in range(4)
+    ]
+    assert [p.wait(60) for p in processos] == [0] * 4
+
+    backend = SQLiteCacheBackend(db_path, ttl=60)
+    chaves = [f"p{n}_{i}" for n in range(4) for i in range(200)]
+    assert len(backend.get_many(chaves)) == len(chaves)
+    backend.close()
+
+
+@pytest.mark.parametrize("tipo", ["sqlite", "json"])
+def test_purge_expired_respeita_tolerancia(tmp_path, tipo):
+    if tipo == "sqlite":
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), ttl=10)
+    else:
+        backend = JsonFileCacheBackend(str(tmp_path), ttl=10)
+    backend.set_many([("recente", {"v": 1}), ("vencida", {"v": 2}), ("antiga", {"v": 3})])
+
+    # Expirada há 5 s e há 100 s
+    agora = time.time()
+    if tipo == "sqlite":
+        backend._conn.execute("UPDATE cache SET expires_at = ? WHERE key = 'vencida'", (agora - 5,))
+        backend._conn.execute("UPDATE cache SET expires_at = ? WHERE key = 'antiga'", (agora - 100,))
+    else:
+        os.utime(backend._path("vencida"), (agora - 15, agora - 15))
+        os.utime(backend._path("antiga"), (agora - 110, agora - 110))
+
+    assert backend.purge_expired(tolerancia=50) == 1
+    assert set(backend.expires_at_many(["recente", "vencida", "antiga"])) == {"recente", "vencida"}
+    backend.close()
@@ -0,0 +1,88 @@
+"""Testes do aquecimento do cache pela API pública do extrator."""
+import asyncio
+
+from controllers.cache_warmer import CacheWarmer
+from config import criar_extractor
+from controllers.data_extractor import DataExtractor
+from test_extract_stream import _dados_api
+
+TOTAL = 30
+
+
+def test_aquecimento_condicional_e_geracao_por_lote(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    extractor = DataExtractor()
+    requisicoes = []
+
+    async def listing():
+        return [{"name": f"p{i}", "url": f"https://pokeapi.co/api/v2/pokemon/{i}/"} for i in range(1, TOTAL + 1)]
+
+    async def buscar(session, url, headers=None):
+        requisicoes.append(headers)
+        if headers and headers.get("If-None-Match") == "v1":
+            return 304, None, {}
+        return 200, _dados_api(int(url.split('/')[-2])), {"ETag": "v1"}
+
+    monkeypatch.setattr(extractor, "full_listing", listing)
+    monkeypatch.setattr(extractor, "_fetch", buscar)
+    warmer = CacheWarmer(extractor, batch_size=10)
+
+    async def cenario():
+        primeira = await warmer.run()
+        geracao = extractor.generation
+        segunda = await warmer.run()
+        segunda["requisicoes"] = len(requisicoes)
+        # Todas perto de expirar: revalidação condicional, sem mudanças
+        warmer.refresh_margin = 2
+        terceira = await warmer.run()
+        await extractor.close()
+        return primeira, geracao, segunda, terceira
+
+    primeira, geracao, segunda, terceira = asyncio.run(cenario())
+    assert primeira["atualizados"] == TOTAL
+    # Uma geração por lote com mudanças, não uma por Pokémon
+    assert geracao == 3
+    assert segunda["ignorados"] == TOTAL and segunda["requisicoes"] == TOTAL
+    assert terceira["nao_modificados"] == TOTAL
+    assert all(h == {"If-None-Match": "v1"} for h in requisicoes[TOTAL:])
+    assert extractor.generation == geracao
+
+
+def test_warm_cache_usa_configuracao_e_lock_do_servidor(tmp_path, monkeypatch):
+    import warm_cache
+    from config import lock_aquecimento
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("CACHE_HARD_EXPIRY_HOURS", "500")
+    monkeypatch.setenv("CACHE_STALE_WHILE_REVALIDATE", "false")
+    monkeypatch.setenv("WORKERS", "4")
+    criados = []
+
+    def criar():
+        criados.append(criar_extractor())
+        return criados[-1]
+
+    monkeypatch.setattr(warm_cache, "criar_extractor", criar)
+    sincronizou = []
+
+    async def run(self):
+        sincronizou.append(self.extractor)
+        return {}
+
+    monkeypatch.setattr(CacheWarmer, "run", run)
+
+    # Com o lock do aquecimento em outro dono (ex.: o servidor), nada é sincronizado
+    lock = lock_aquecimento(DataExtractor())
+    assert lock.try_acquire()
+    try:
+        asyncio.run(warm_cache.main())
+    finally:
+        lock.release()
+    assert sincronizou == []
+
+    asyncio.run(warm_cache.main())
+    extractor = criados[-1]
+    assert sincronizou == [extractor]
+    assert extractor.hard_expiry.total_seconds() == 500 * 3600
+    assert not extractor.stale_while_revalidate
+    assert extractor.lock_dir is not None
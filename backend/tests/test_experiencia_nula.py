@@ -0,0 +1,97 @@
+"""Testes de Pokémon com ``base_experience`` null na PokeAPI."""
+import asyncio
+import math
+
+from controllers.aggregates import AggregateState
+from controllers.data_extractor import DataExtractor
+from controllers.transformer import DataTransformer
+from models.pokemon_query import PokemonQueryIndex
+from models.pokemon_table import PokemonTable
+
+# Experiência base por ID; None como na resposta da PokeAPI
+EXPERIENCIAS = {1: 64, 2: None, 3: 240, 4: 40, 5: None, 6: 240}
+
+
+def _dados_api(pokemon_id: int, experiencia) -> dict:
+    return {
+        "id": pokemon_id,
+        "name": f"p{pokemon_id}",
+        "base_experience": experiencia,
+        "types": [{"type": {"name": "fire" if pokemon_id % 2 else "water"}}],
+        "height": 1,
+        "weight": 1,
+        "species": {"name": f"p{pokemon_id}"},
+        "stats": [
+            {"stat": {"name": nome}, "base_stat": 10 * pokemon_id}
+            for nome in ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+        ],
+    }
+
+
+def _registros(tmp_path, monkeypatch) -> list:
+    monkeypatch.chdir(tmp_path)
+    extractor = DataExtractor()
+    return [
+        extractor._pokemon_to_dict(extractor._create_pokemon_object(_dados_api(pokemon_id, experiencia)))
+        for pokemon_id, experiencia in EXPERIENCIAS.items()
+    ]
+
+
+def test_categoria_sem_experiencia(tmp_path, monkeypatch):
+    registros = _registros(tmp_path, monkeypatch)
+
+    assert registros[1]["experiencia_base"] is None
+    assert registros[1]["categoria"] == "Desconhecido"
+    assert [r["categoria"] for r in registros] == ["Médio", "Desconhecido", "Forte", "Fraco", "Desconhecido", "Forte"]
+
+
+def test_tabela_preserva_ausentes(tmp_path, monkeypatch):
+    registros = _registros(tmp_path, monkeypatch)
+    table = PokemonTable.from_records(registros)
+
+    assert math.isnan(table["experiencia_base"][1])
+    assert table.to_records() == registros
+
+
+def test_transform_ignora_ausentes_no_ranking(tmp_path, monkeypatch):
+    registros = _registros(tmp_path, monkeypatch)
+    transformer = DataTransformer()
+
+    analise = asyncio.run(transformer.transform(registros))
+    assert analise["top_experiencia"] == [
+        {"nome": "P3", "experiencia_base": 240},
+        {"nome": "P6", "experiencia_base": 240},
+        {"nome": "P1", "experiencia_base": 64},
+        {"nome": "P4", "experiencia_base": 40},
+    ]
+    assert analise["estatisticas"]["distribuicao_categorias"]["Desconhecido"] == 2
+    assert analise == AggregateState().update(registros).finalize()
+
+    # Em lote: os ausentes também ficam fora de cada subconjunto
+    table = PokemonTable.from_records(registros)
+    membros = table.type_matrix()[:, [table.vocabulario.index("water")]].T
+    lote = transformer.transform_many(table, membros)
+    assert lote[0]["top_experiencia"] == [
+        {"nome": "P6", "experiencia_base": 240},
+        {"nome": "P4", "experiencia_base": 40},
+    ]
+
+
+def test_consulta_deixa_ausentes_por_ultimo(tmp_path, monkeypatch):
+    registros = _registros(tmp_path, monkeypatch)
+    index = PokemonQueryIndex(PokemonTable.from_records(registros))
+
+    for decrescente in (True, False):
+        posicoes, total = index.query(ordenar_por="experiencia_base", decrescente=decrescente)
+        assert total == 6
+        assert posicoes[-2:].tolist() == [1, 4]
+
+    posicoes, _ = index.query(tipos=["water"], ordenar_por="experiencia_base", limite=2)
+    assert posicoes.tolist() == [5, 3]
+
+    posicoes, total = index.query(minimos={"experiencia_base": 50})
+    assert posicoes.tolist() == [0, 2, 5]
+    assert total == 3
+
+    posicoes, _ = index.query(categorias=["Desconhecido"])
+    assert posicoes.tolist() == [1, 4]
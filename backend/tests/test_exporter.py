@@ -0,0 +1,93 @@
+"""Testes da publicação, leitura e remoção das exportações."""
+import asyncio
+import os
+
+import pytest
+
+from controllers.exporter import DataExporter, _Escritor
+from controllers.reporter import ReportGenerator
+
+
+def _registro(pokemon_id: int, ataque: int = 10) -> dict:
+    return {
+        "id": pokemon_id, "nome": f"P{pokemon_id}", "experiencia_base": 50, "tipos": ["normal"],
+        "hp": 10, "ataque": ataque, "defesa": 10, "ataque_especial": 10, "defesa_especial": 10,
+        "velocidade": 10, "altura": 1, "peso": 1, "especie": f"p{pokemon_id}", "categoria": "Médio",
+    }
+
+
+class ExtratorFalso:
+    """Entrega os registros fora de ordem, salvo com ``ordenado``."""
+
+    def __init__(self, ataque: int = 10):
+        self.ataque = ataque
+
+    async def extract_stream(self, limit=100, offset=0, erros=None, progress_callback=None, ordenado=False):
+        ids = range(offset + 1, offset + limit + 1)
+        for pokemon_id in (ids if ordenado else reversed(ids)):
+            yield _registro(pokemon_id, self.ataque)
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    return DataExporter(ExtratorFalso(), output_dir=str(tmp_path / "exportacoes"), tamanho_grupo=2)
+
+
+def test_linhas_em_ordem_por_id(exporter):
+    resultado = asyncio.run(exporter.export(5, formato="csv"))
+    linhas = exporter.read(resultado["arquivos"]["pokemon"], colunas=["id"])["data"]
+    assert [linha["id"] for linha in linhas] == [1, 2, 3, 4, 5]
+
+
+def test_exportacao_publicada_nao_e_regravada(exporter):
+    primeira = asyncio.run(exporter.export(5, formato="csv"))
+    path = primeira["arquivos"]["pokemon"]
+    inode = os.stat(path).st_ino
+
+    segunda = asyncio.run(exporter.export(5, formato="csv"))
+    assert segunda["arquivos"] == primeira["arquivos"]
+    assert os.stat(path).st_ino == inode
+
+    # Outro conteúdo vai para outro diretório; o anterior continua intacto
+    exporter.extractor = ExtratorFalso(ataque=20)
+    terceira = asyncio.run(exporter.export(5, formato="csv"))
+    assert os.path.dirname(terceira["arquivos"]["pokemon"]) != os.path.dirname(path)
+    assert os.stat(path).st_ino == inode
+    # Nenhum diretório em preparo fica para trás
+    assert not [nome for nome in os.listdir(exporter.output_dir) if nome.startswith(".")]
+
+
+def test_leitura_recusa_caminho_fora_das_exportacoes(exporter, tmp_path):
+    resultado = asyncio.run(exporter.export(3, formato="csv"))
+    fora = tmp_path / "fora.csv"
+    fora.write_text("id\n1\n")
+
+    caminhos = [
+        os.path.join(exporter.output_dir, "..", "fora.csv"),
+        os.path.join(os.path.dirname(resultado["arquivos"]["pokemon"]), "..", "..", "fora.csv"),
+        str(fora),
+    ]
+    for path in caminhos:
+        with pytest.raises(ValueError, match="não encontrado"):
+            exporter.read(path)
+
+
+def test_exportacoes_entram_na_remocao_de_antigos(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    reporter = ReportGenerator(max_bytes=0)
+    exporter = DataExporter(
+        ExtratorFalso(), output_dir=os.path.join("relatorios", "exportacoes"), ao_publicar=reporter.purge
+    )
+
+    primeira = asyncio.run(exporter.export(3, formato="csv"))
+    exporter.extractor = ExtratorFalso(ataque=20)
+    segunda = asyncio.run(exporter.export(3, formato="csv"))
+
+    # Sem espaço disponível, só a exportação recém-publicada é mantida
+    assert not os.path.exists(primeira["arquivos"]["pokemon"])
+    assert os.path.exists(segunda["arquivos"]["pokemon"])
+
+
+def test_escritor_base_e_abstrato(tmp_path):
+    with pytest.raises(TypeError):
+        _Escritor(str(tmp_path / "x.csv"), [("id", "int")])
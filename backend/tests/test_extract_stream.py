@@ -0,0 +1,118 @@
+"""Testes da ordem de entrega de ``DataExtractor.extract_stream``."""
+import asyncio
+
+import pytest
+
+from controllers.data_extractor import DataExtractor
+from models.pokemon import Pokemon
+
+# Atraso de cada ID: os de ID menor terminam por último
+ATRASOS = {1: 0.05, 2: 0.04, 3: 0.0, 4: 0.02, 5: 0.01}
+
+
+def _pokemon(pokemon_id: int) -> Pokemon:
+    return Pokemon(
+        id=pokemon_id, nome=f"p{pokemon_id}", experiencia_base=50, tipos=["normal"],
+        hp=10, ataque=10, defesa=10, ataque_especial=10, defesa_especial=10, velocidade=10,
+        altura=1, peso=1, especie=f"p{pokemon_id}",
+    )
+
+
+@pytest.fixture
+def extractor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    extractor = DataExtractor()
+
+    async def listar(session, limit, offset):
+        ids = list(ATRASOS)[offset:offset + limit]
+        return {"count": len(ATRASOS), "results": [
+            {"name": f"p{i}", "url": f"https://pokeapi.co/api/v2/pokemon/{i}/"} for i in ids
+        ]}
+
+    async def obter(session, url):
+        pokemon_id = int(url.split('/')[-2])
+        await asyncio.sleep(ATRASOS[pokemon_id])
+        if pokemon_id == 2:
+            raise RuntimeError("falhou")
+        return _pokemon(pokemon_id)
+
+    monkeypatch.setattr(extractor, "_get_pokemon_list", listar)
+    monkeypatch.setattr(extractor, "_get_pokemon", obter)
+    monkeypatch.setattr(extractor, "_prefetch", lambda results: None)
+    yield extractor
+    asyncio.run(extractor.close())
+
+
+def _coletar(extractor, **kwargs):
+    async def cenario():
+        erros = []
+        ids = [r["id"] async for r in extractor.extract_stream(len(ATRASOS), erros=erros, **kwargs)]
+        return ids, erros
+    return asyncio.run(cenario())
+
+
+def test_ordem_de_conclusao_por_padrao(extractor):
+    ids, erros = _coletar(extractor)
+    assert ids == [3, 5, 4, 1]
+    assert [e["nome"] for e in erros] == ["p2"]
+
+
+def test_ordenado_entrega_na_ordem_da_listagem(extractor):
+    ids, erros = _coletar(extractor, ordenado=True)
+    assert ids == [1, 3, 4, 5]
+    assert [e["nome"] for e in erros] == ["p2"]
+
+
+def test_extract_retorna_ordenado(extractor):
+    result = asyncio.run(extractor.extract(len(ATRASOS)))
+    assert result["status"] == "partial"
+    assert [p["id"] for p in result["data"]] == [1, 3, 4, 5]
+
+
+def _dados_api(pokemon_id: int, peso: int = 1) -> dict:
+    stats = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+    return {
+        "id": pokemon_id, "name": f"p{pokemon_id}", "base_experience": 50,
+        "types": [{"type": {"name": "normal"}}], "height": 1, "weight": peso,
+        "species": {"name": f"p{pokemon_id}"},
+        "stats": [{"base_stat": 10, "stat": {"name": nome}} for nome in stats],
+    }
+
+
+def test_geracao_avanca_uma_vez_por_extracao_com_mudancas(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    extractor = DataExtractor()
+    pesos = {i: 1 for i in range(1, 11)}
+
+    async def listar(session, limit, offset):
+        return {"count": 10, "results": [
+            {"name": f"p{i}", "url": f"https://pokeapi.co/api/v2/pokemon/{i}/"} for i in range(1, 11)
+        ]}
+
+    async def buscar(session, url, headers=None):
+        pokemon_id = int(url.split('/')[-2])
+        return 200, _dados_api(pokemon_id, pesos[pokemon_id]), {}
+
+    monkeypatch.setattr(extractor, "_get_pokemon_list", listar)
+    monkeypatch.setattr(extractor, "_fetch", buscar)
+
+    async def cenario():
+        await extractor.extract(10)
+        primeira = extractor.generation
+        # Tudo em cache: nenhuma mudança
+        await extractor.extract(10)
+        segunda = extractor.generation
+        # Memória e cache persistente vencidos; só o Pokémon 3 mudou na API
+        extractor.memory_cache.clear()
+        extractor.cache._conn.execute("UPDATE cache SET expires_at = 0")
+        pesos[3] = 99
+        await extractor.extract(10)
+        await extractor.close()
+        return primeira, segunda, extractor.generation
+
+    primeira, segunda, terceira = asyncio.run(cenario())
+    assert primeira == 1
+    assert segunda == 1
+    assert terceira == 2
+    assert extractor.versao([3]) == 2
+    assert extractor.versao([1, 2, 4, 5]) == 1
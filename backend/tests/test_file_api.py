@@ -0,0 +1,70 @@
+"""Testes do download de relatórios em /api/files (ETag e Range)."""
+import pytest
+from fastapi.testclient import TestClient
+
+CONTEUDO = bytes(range(256)) * 4
+TAMANHO = len(CONTEUDO)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    import server
+
+    destino = tmp_path / "relatorios" / "abc"
+    destino.mkdir(parents=True)
+    (destino / "tipos.csv").write_bytes(CONTEUDO)
+    with TestClient(server.app) as client:
+        yield client
+
+
+def test_download_completo_com_etag(client):
+    resposta = client.get("/api/files/abc/tipos.csv")
+    assert resposta.status_code == 200
+    assert resposta.content == CONTEUDO
+    assert resposta.headers["accept-ranges"] == "bytes"
+    assert resposta.headers["etag"]
+
+
+def test_if_none_match_retorna_304(client):
+    etag = client.get("/api/files/abc/tipos.csv").headers["etag"]
+
+    resposta = client.get("/api/files/abc/tipos.csv", headers={"If-None-Match": etag})
+    assert resposta.status_code == 304
+    assert resposta.content == b""
+    assert resposta.headers["etag"] == etag
+
+    # Em uma lista de ETags também vale; uma ETag diferente recebe o arquivo
+    assert client.get("/api/files/abc/tipos.csv", headers={"If-None-Match": f'"x", {etag}'}).status_code == 304
+    assert client.get("/api/files/abc/tipos.csv", headers={"If-None-Match": '"x"'}).status_code == 200
+
+
+@pytest.mark.parametrize("intervalo, inicio, fim", [
+    ("bytes=10-19", 10, 19),
+    # Sufixo: os últimos N bytes
+    ("bytes=-100", TAMANHO - 100, TAMANHO - 1),
+    ("bytes=-5000", 0, TAMANHO - 1),
+    # Sem fim: até o último byte
+    ("bytes=1000-", 1000, TAMANHO - 1),
+    # Fim além do tamanho é limitado ao último byte
+    ("bytes=1020-5000", 1020, TAMANHO - 1),
+])
+def test_range_retorna_206(client, intervalo, inicio, fim):
+    resposta = client.get("/api/files/abc/tipos.csv", headers={"Range": intervalo})
+    assert resposta.status_code == 206
+    assert resposta.content == CONTEUDO[inicio:fim + 1]
+    assert resposta.headers["content-range"] == f"bytes {inicio}-{fim}/{TAMANHO}"
+    assert resposta.headers["content-length"] == str(fim - inicio + 1)
+
+
+@pytest.mark.parametrize("intervalo", ["bytes=1024-", "bytes=2000-3000", "bytes=20-10", "bytes=-", "itens=0-10"])
+def test_range_insatisfazivel_retorna_416(client, intervalo):
+    resposta = client.get("/api/files/abc/tipos.csv", headers={"Range": intervalo})
+    assert resposta.status_code == 416
+    assert resposta.headers["content-range"] == f"bytes */{TAMANHO}"
+
+
+def test_arquivo_fora_de_relatorios(client, tmp_path):
+    (tmp_path / "fora.csv").write_bytes(CONTEUDO)
+    assert client.get("/api/files/abc/nao_existe.csv").status_code == 404
+    assert client.get("/api/files/..%2Ffora.csv").status_code == 403
@@ -0,0 +1,95 @@
+"""Testes do FileLock entre processos."""
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+
+from controllers.file_lock import FileLock
+
+# Sem fcntl (fora de POSIX) o FileLock é um no-op
+pytest.importorskip("fcntl")
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+# Processo que obtém o lock, avisa pela saída padrão e o segura até ler uma linha
+_DONO = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from controllers.file_lock import FileLock
+with FileLock(sys.argv[2]):
+    print("ok", flush=True)
+    sys.stdin.readline()
+"""
+
+# Processo que soma 1 a um contador em arquivo ``n`` vezes, cada vez sob o lock
+_CONTADOR = """
+import sys, time
+sys.path.insert(0, sys.argv[1])
+from controllers.file_lock import FileLock
+for _ in range(int(sys.argv[4])):
+    with FileLock(sys.argv[2]):
+        with open(sys.argv[3]) as f:
+            valor = int(f.read())
+        time.sleep(0.001)
+        with open(sys.argv[3], "w") as f:
+            f.write(str(valor + 1))
+"""
+
+
+def _iniciar_dono(lock_path: str) -> subprocess.Popen:
+    dono = subprocess.Popen(
+        [sys.executable, "-c", _DONO, SRC, lock_path],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+    )
+    assert dono.stdout.readline().strip() == "ok"
+    return dono
+
+
+def test_lock_de_outro_processo_bloqueia_ate_ser_liberado(tmp_path):
+    lock_path = str(tmp_path / "x.lock")
+    dono = _iniciar_dono(lock_path)
+    try:
+        lock = FileLock(lock_path, timeout=0.2)
+        assert lock.locked_elsewhere()
+        assert not lock.try_acquire()
+        with pytest.raises(TimeoutError):
+            asyncio.run(lock.acquire_async())
+
+        dono.stdin.write("\n")
+        dono.stdin.flush()
+        assert dono.wait(10) == 0
+
+        lock.timeout = 10
+        asyncio.run(lock.acquire_async())
+        lock.release()
+    finally:
+        dono.kill()
+        dono.wait()
+
+
+def test_lock_de_processo_morto_e_liberado(tmp_path):
+    lock_path = str(tmp_path / "x.lock")
+    dono = _iniciar_dono(lock_path)
+    dono.kill()
+    dono.wait()
+
+    lock = FileLock(lock_path)
+    assert not lock.locked_elsewhere()
+    assert lock.try_acquire()
+    lock.release()
+
+
+def test_processos_se_excluem_mutuamente(tmp_path):
+    lock_path = str(tmp_path / "x.lock")
+    contador = tmp_path / "contador"
+    contador.write_text("0")
+
+    processos = [
+        subprocess.Popen([sys.executable, "-c", _CONTADOR, SRC, lock_path, str(contador), "50"])
+        for _ in range(4)
+    ]
+    assert [p.wait(60) for p in processos] == [0] * 4
+    # Sem exclusão mútua, leituras e gravações intercaladas perderiam somas
+    assert contador.read_text() == "200"
@@ -0,0 +1,82 @@
+"""Testes da coalescência de cargas (single-flight) do MemoryCache."""
+import asyncio
+
+import pytest
+
+from controllers.memory_cache import MemoryCache
+
+
+def test_carga_unica_para_chamadores_concorrentes():
+    async def cenario():
+        cache = MemoryCache()
+        chamadas = 0
+        liberar = asyncio.Event()
+
+        async def loader():
+            nonlocal chamadas
+            chamadas += 1
+            await liberar.wait()
+            return {"id": 1}
+
+        tarefas = [asyncio.ensure_future(cache.get_or_load(1, loader)) for _ in range(5)]
+        await asyncio.sleep(0)
+        liberar.set()
+        resultados = await asyncio.gather(*tarefas)
+        return cache, chamadas, resultados
+
+    cache, chamadas, resultados = asyncio.run(cenario())
+    assert chamadas == 1
+    assert resultados == [{"id": 1}] * 5
+    assert cache.coalesced == 4
+    assert 1 in cache
+
+
+def test_cancelar_quem_iniciou_nao_afeta_os_demais():
+    async def cenario():
+        cache = MemoryCache()
+        iniciou = asyncio.Event()
+        liberar = asyncio.Event()
+
+        async def loader():
+            iniciou.set()
+            await liberar.wait()
+            return "valor"
+
+        dono = asyncio.ensure_future(cache.get_or_load("k", loader))
+        await iniciou.wait()
+        aguardando = asyncio.ensure_future(cache.get_or_load("k", loader))
+        await asyncio.sleep(0)
+
+        dono.cancel()
+        await asyncio.sleep(0)
+        liberar.set()
+
+        with pytest.raises(asyncio.CancelledError):
+            await dono
+        return cache, await aguardando
+
+    cache, valor = asyncio.run(cenario())
+    assert valor == "valor"
+    # A carga terminou e foi armazenada mesmo com o dono cancelado
+    assert cache.get("k") == "valor"
+    assert not cache._inflight
+
+
+def test_erro_do_carregador_chega_a_todos_e_nao_e_armazenado():
+    async def cenario():
+        cache = MemoryCache()
+        liberar = asyncio.Event()
+
+        async def loader():
+            await liberar.wait()
+            raise ValueError("falhou")
+
+        tarefas = [asyncio.ensure_future(cache.get_or_load("k", loader)) for _ in range(3)]
+        await asyncio.sleep(0)
+        liberar.set()
+        return cache, await asyncio.gather(*tarefas, return_exceptions=True)
+
+    cache, resultados = asyncio.run(cenario())
+    assert all(isinstance(r, ValueError) for r in resultados)
+    assert "k" not in cache
+    assert not cache._inflight
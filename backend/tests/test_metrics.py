@@ -0,0 +1,56 @@
+"""Testes das métricas das ferramentas MCP."""
+import asyncio
+
+import pytest
+
+from controllers.metrics import TOOL_REQUESTS, _Metric, record_status, track_tool
+
+
+def _chamadas(ferramenta: str, outcome: str) -> float:
+    return TOOL_REQUESTS._valores.get((ferramenta, outcome), 0)
+
+
+def test_metrica_base_e_abstrata():
+    with pytest.raises(TypeError):
+        _Metric("x", "y")
+
+
+@pytest.mark.parametrize("status,outcome", [
+    ("success", "ok"), ("partial", "partial"), ("error", "error"), (None, "ok"),
+])
+def test_outcome_vem_do_status_da_resposta(status, outcome):
+    @track_tool
+    async def ferramenta_teste():
+        if status is not None:
+            record_status(status)
+        return []
+
+    antes = _chamadas("ferramenta_teste", outcome)
+    asyncio.run(ferramenta_teste())
+    assert _chamadas("ferramenta_teste", outcome) == antes + 1
+
+
+def test_excecao_conta_como_exception():
+    @track_tool
+    async def ferramenta_falha():
+        record_status("success")
+        raise RuntimeError("falhou")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(ferramenta_falha())
+    assert _chamadas("ferramenta_falha", "exception") == 1
+    assert _chamadas("ferramenta_falha", "ok") == 0
+
+
+def test_rotulos_fixos_em_todas_as_series():
+    from controllers.metrics import MetricsRegistry
+
+    registry = MetricsRegistry()
+    registry.counter("teste_total", "Teste", ("tool",)).inc(tool="a")
+    registry.histogram("teste_seconds", "Teste", buckets=(1.0,)).observe(0.5)
+    registry.set_constant_labels(worker="123")
+
+    series = [linha for linha in registry.render().splitlines() if not linha.startswith("#")]
+    assert 'teste_total{worker="123",tool="a"} 1' in series
+    assert 'teste_seconds_bucket{worker="123",le="1"} 1' in series
+    assert all('worker="123"' in linha for linha in series)
@@ -0,0 +1,105 @@
+"""Testes da reconstrução do índice de consultas após extrações parciais."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from controllers import query_engine as query_engine_module
+from controllers.query_engine import QueryEngine
+
+
+def _registro(pokemon_id: int) -> dict:
+    return {
+        "id": pokemon_id, "nome": f"P{pokemon_id}", "experiencia_base": 50, "tipos": ["normal"],
+        "hp": 10, "ataque": 10, "defesa": 10, "ataque_especial": 10, "defesa_especial": 10,
+        "velocidade": 10, "altura": 1, "peso": 1, "especie": f"p{pokemon_id}", "categoria": "Médio",
+    }
+
+
+class ExtratorFalso:
+    """Os IDs em ``falhando`` entram em ``erros`` em vez de ``data``."""
+
+    def __init__(self, total: int = 4):
+        self.total = total
+        self.generation = 0
+        self.falhando = set()
+        self.extracoes = 0
+
+    async def total_pokemon(self):
+        return self.total
+
+    async def extract(self, limit=100, offset=0):
+        self.extracoes += 1
+        ids = range(offset + 1, offset + limit + 1)
+        data = [_registro(pokemon_id) for pokemon_id in ids if pokemon_id not in self.falhando]
+        erros = [{"id": pokemon_id, "erro": "timeout"} for pokemon_id in ids if pokemon_id in self.falhando]
+        result = {"status": "partial" if erros else "success", "data": data}
+        if erros:
+            result["erros"] = erros
+        return result
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    agora = SimpleNamespace(valor=1000.0)
+    monkeypatch.setattr(query_engine_module, "time", SimpleNamespace(monotonic=lambda: agora.valor))
+    return agora
+
+
+def test_indice_parcial_e_reconstruido_com_espera_crescente(relogio):
+    extractor = ExtratorFalso()
+    extractor.falhando = {2, 3}
+    engine = QueryEngine(extractor, espera_erros=30, espera_erros_max=50)
+
+    async def consultar():
+        return await engine.query()
+
+    parcial = asyncio.run(consultar())
+    assert parcial["status"] == "partial"
+    assert [erro["id"] for erro in parcial["erros"]] == [2, 3]
+
+    # Antes da espera o índice parcial é reaproveitado
+    relogio.valor += 29
+    asyncio.run(consultar())
+    assert extractor.extracoes == 1
+
+    # Vencida a espera, é reconstruído; a falha persiste e a espera dobra (até o limite)
+    extractor.falhando = {3}
+    relogio.valor += 2
+    resultado = asyncio.run(consultar())
+    assert extractor.extracoes == 2
+    assert resultado["indexados"] == 3
+    relogio.valor += 49
+    asyncio.run(consultar())
+    assert extractor.extracoes == 2
+
+    extractor.falhando = set()
+    relogio.valor += 2
+    completo = asyncio.run(consultar())
+    assert extractor.extracoes == 3
+    assert completo["status"] == "success"
+    assert "erros" not in completo
+    assert [registro["id"] for registro in completo["data"]] == [1, 2, 3, 4]
+
+    # Completo, o índice só muda com a geração do cache
+    relogio.valor += 3600
+    asyncio.run(consultar())
+    assert extractor.extracoes == 3
+    extractor.generation += 1
+    asyncio.run(consultar())
+    assert extractor.extracoes == 4
+
+
+def test_espera_volta_ao_inicio_depois_de_um_indice_completo(relogio):
+    extractor = ExtratorFalso()
+    engine = QueryEngine(extractor, espera_erros=30)
+
+    for _ in range(2):
+        extractor.falhando = {1}
+        extractor.generation += 1
+        asyncio.run(engine.get_index())
+        assert engine._espera == 30
+        extractor.falhando = set()
+        relogio.valor += 30
+        asyncio.run(engine.get_index())
+        assert engine._espera == 0
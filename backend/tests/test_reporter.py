@@ -0,0 +1,151 @@
+"""Testes do gerador de relatórios."""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+
+from controllers import reporter as reporter_module
+from controllers.reporter import OpcoesGrafico, ReportGenerator
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+ANALISE = {
+    "tipos_analise": {
+        "fire": {"ataque": 80.0, "defesa": 60.0, "hp": 70.0,
+                 "ataque_especial": 90.0, "defesa_especial": 65.0, "velocidade": 85.0},
+        "water": {"ataque": 70.0, "defesa": 75.0, "hp": 80.0,
+                  "ataque_especial": 75.0, "defesa_especial": 70.0, "velocidade": 65.0},
+    },
+    "top_experiencia": [{"nome": "p1", "experiencia_base": 200}],
+}
+
+
+def test_grafico_renderizado_em_processo_sem_fork(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    reporter = ReportGenerator(max_workers=1)
+
+    async def cenario():
+        # Uma thread ativa no processo, como no servidor
+        parar = threading.Event()
+        thread = threading.Thread(target=parar.wait)
+        thread.start()
+        try:
+            return await reporter.generate(ANALISE)
+        finally:
+            parar.set()
+            thread.join()
+
+    try:
+        resultado = asyncio.run(cenario())
+        assert reporter._pool._mp_context.get_start_method() != "fork"
+    finally:
+        reporter.close()
+
+    assert os.path.getsize(resultado["graficos_path"]) > 0
+    assert os.path.getsize(resultado["csv_path"]["tipos"]) > 0
+
+
+# Script principal que gera um relatório; se um worker do pool o reexecutar
+# como __mp_main__, a inicialização de módulo deixa um marcador ao seu lado
+_PRINCIPAL = """
+import asyncio, json, os, sys
+sys.path.insert(0, {src!r})
+if __name__ != "__main__":
+    open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "importado"), "w").write(__name__)
+
+from controllers.reporter import ReportGenerator
+
+if __name__ == "__main__":
+    reporter = ReportGenerator(max_workers=1)
+    try:
+        resultado = asyncio.run(reporter.generate(json.loads(sys.argv[1])))
+    finally:
+        reporter.close()
+    print(resultado["graficos_path"])
+"""
+
+
+def test_worker_do_pool_nao_importa_o_principal(tmp_path):
+    script = tmp_path / "principal.py"
+    script.write_text(_PRINCIPAL.format(src=os.path.abspath(SRC)))
+
+    processo = subprocess.run(
+        [sys.executable, str(script), json.dumps(ANALISE)],
+        cwd=tmp_path, capture_output=True, text=True, timeout=120,
+    )
+    assert processo.returncode == 0, processo.stderr
+    assert os.path.getsize(tmp_path / processo.stdout.strip()) > 0
+    assert not (tmp_path / "importado").exists()
+
+
+def test_job_de_analise_pronta_respeita_limite(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(reporter_module, "_MAX_JOBS", 2)
+    reporter = ReportGenerator(max_workers=1)
+    try:
+        asyncio.run(reporter.generate(ANALISE))
+        reporter._jobs.update((j, {"job_id": j, "status": "concluido"}) for j in ("a", "b"))
+
+        # Artefatos prontos: o job já concluído passa pelo mesmo limite
+        job_id = asyncio.run(reporter.generate(ANALISE, aguardar=False))["job_id"]
+    finally:
+        reporter.close()
+
+    assert list(reporter._jobs) == ["b", job_id]
+    assert reporter.status(job_id)["status"] == "concluido"
+
+
+def test_cache_de_graficos_reaproveita_e_invalida(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    opcoes = OpcoesGrafico.from_tamanho("4x3", dpi=40)
+    reporter = ReportGenerator(max_workers=1, opcoes_grafico=opcoes)
+    outro_top = {**ANALISE, "top_experiencia": [{"nome": "p2", "experiencia_base": 100}]}
+    outras_medias = {**ANALISE, "tipos_analise": {
+        **ANALISE["tipos_analise"], "fire": {**ANALISE["tipos_analise"]["fire"], "ataque": 81.0},
+    }}
+
+    async def cenario():
+        primeiro = await reporter.generate(ANALISE)
+        # Mesmas médias por tipo em outra análise: o gráfico vem do cache
+        mesmo_grafico = await reporter.generate(outro_top)
+        stats_reuso = dict(reporter.graficos_stats())
+        # Médias ou opções diferentes renderizam outro gráfico
+        await reporter.generate(outras_medias)
+        await reporter.generate(ANALISE, opcoes_grafico=OpcoesGrafico.from_tamanho("4x3", dpi=50))
+        return primeiro, mesmo_grafico, stats_reuso
+
+    try:
+        primeiro, mesmo_grafico, stats_reuso = asyncio.run(cenario())
+    finally:
+        reporter.close()
+
+    assert os.path.dirname(primeiro["graficos_path"]) != os.path.dirname(mesmo_grafico["graficos_path"])
+    assert os.stat(primeiro["graficos_path"]).st_ino == os.stat(mesmo_grafico["graficos_path"]).st_ino
+    assert (stats_reuso["misses"], stats_reuso["hits"], stats_reuso["size"]) == (1, 1, 1)
+
+    stats = reporter.graficos_stats()
+    assert (stats["misses"], stats["hits"], stats["size"]) == (3, 1, 3)
+    assert stats["hit_ratio"] == 0.25
+
+
+def test_grafico_removido_do_cache_e_renderizado_de_novo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    reporter = ReportGenerator(max_workers=1, opcoes_grafico=OpcoesGrafico.from_tamanho("4x3", dpi=40))
+    outro_top = {**ANALISE, "top_experiencia": [{"nome": "p2", "experiencia_base": 100}]}
+    graficos = os.path.join(reporter.output_dir, "graficos")
+
+    async def cenario():
+        await reporter.generate(ANALISE)
+        for nome in os.listdir(graficos):
+            os.remove(os.path.join(graficos, nome))
+        return await reporter.generate(outro_top)
+
+    try:
+        resultado = asyncio.run(cenario())
+    finally:
+        reporter.close()
+
+    assert os.path.getsize(resultado["graficos_path"]) > 0
+    assert (reporter.graficos_stats()["misses"], reporter.graficos_stats()["hits"]) == (2, 0)
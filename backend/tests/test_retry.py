@@ -0,0 +1,102 @@
+"""Testes do retry com backoff do DataExtractor contra uma PokeAPI local."""
+import asyncio
+import math
+import time
+
+import pytest
+from aiohttp import web
+
+from controllers.data_extractor import DataExtractor
+
+
+def _detalhe(pokemon_id: int) -> dict:
+    return {
+        "id": pokemon_id,
+        "name": f"p{pokemon_id}",
+        "base_experience": 50,
+        "types": [{"type": {"name": "normal"}}],
+        "height": 1,
+        "weight": 1,
+        "species": {"name": f"p{pokemon_id}"},
+        "stats": [
+            {"stat": {"name": nome}, "base_stat": 10}
+            for nome in ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+        ],
+    }
+
+
+class PokeAPIInstavel:
+    """
+    PokeAPI local: o Pokémon 1 responde 429 (Retry-After de uma hora) antes
+    de 200 e o Pokémon 2 responde sempre 500.
+    """
+
+    def __init__(self):
+        self.requisicoes = {1: 0, 2: 0}
+
+    async def listar(self, request: web.Request) -> web.Response:
+        base = f"{request.scheme}://{request.host}/api/v2"
+        return web.json_response({"count": 2, "results": [
+            {"name": f"p{i}", "url": f"{base}/pokemon/{i}/"} for i in (1, 2)
+        ]})
+
+    async def detalhe(self, request: web.Request) -> web.Response:
+        pokemon_id = int(request.match_info["id"])
+        self.requisicoes[pokemon_id] += 1
+        if pokemon_id == 1 and self.requisicoes[1] == 1:
+            return web.Response(status=429, headers={"Retry-After": "3600"})
+        if pokemon_id == 2:
+            return web.Response(status=500)
+        return web.json_response(_detalhe(pokemon_id))
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/v2/pokemon", self.listar)
+        app.router.add_get("/api/v2/pokemon/{id}/", self.detalhe)
+        return app
+
+
+@pytest.fixture
+def extractor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return DataExtractor(max_retries=2, backoff_base=0.01, max_backoff=0.05)
+
+
+def test_retry_after_limitado_e_falha_parcial(extractor):
+    api = PokeAPIInstavel()
+
+    async def cenario():
+        runner = web.AppRunner(api.app())
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        porta = runner.addresses[0][1]
+        extractor.base_url = f"http://127.0.0.1:{porta}/api/v2"
+        try:
+            return await extractor.extract(limit=2)
+        finally:
+            await extractor.close()
+            await runner.cleanup()
+
+    inicio = time.monotonic()
+    resultado = asyncio.run(cenario())
+
+    # O Retry-After de uma hora foi limitado a max_backoff
+    assert time.monotonic() - inicio < 5
+    assert api.requisicoes == {1: 2, 2: 3}
+    assert resultado["status"] == "partial"
+    assert [registro["id"] for registro in resultado["data"]] == [1]
+    assert len(resultado["erros"]) == 1
+
+
+@pytest.mark.parametrize("retry_after", ["-5", "nan", "inf", "Wed, 21 Oct 2015 07:28:00 GMT"])
+def test_retry_after_invalido_usa_backoff(extractor, retry_after):
+    espera = extractor._backoff_delay(0, retry_after)
+    assert math.isfinite(espera)
+    assert 0 <= espera <= extractor.max_backoff
+
+
+def test_backoff_limitado(extractor):
+    assert extractor._backoff_delay(0, "3600") == extractor.max_backoff
+    assert extractor._backoff_delay(0, "0.01") == 0.01
+    assert extractor._backoff_delay(20) == extractor.max_backoff
@@ -0,0 +1,84 @@
+"""Testes da serialização e da seleção de campos e paginação das respostas."""
+import json
+
+import pytest
+
+from controllers.serializer import JsonSerializer, campos_invalidos, paginar, selecionar_campos
+
+REGISTROS = [{"id": i, "nome": f"p{i}", "tipos": ["normal"], "hp": 10 * i} for i in range(1, 8)]
+
+
+def test_campos_invalidos():
+    disponiveis = ["id", "nome", "tipos", "hp"]
+    assert campos_invalidos(None, disponiveis) == []
+    assert campos_invalidos([], disponiveis) == []
+    assert campos_invalidos(["nome", "id"], disponiveis) == []
+    # Na ordem pedida, sem interromper no primeiro
+    assert campos_invalidos(["peso", "id", "cor"], disponiveis) == ["peso", "cor"]
+
+
+def test_selecionar_campos_na_ordem_pedida():
+    assert selecionar_campos(REGISTROS, None) is REGISTROS
+    assert selecionar_campos(REGISTROS, []) is REGISTROS
+
+    selecionados = selecionar_campos(REGISTROS[:2], ["nome", "id"])
+    assert selecionados == [{"nome": "p1", "id": 1}, {"nome": "p2", "id": 2}]
+    assert [list(registro) for registro in selecionados] == [["nome", "id"], ["nome", "id"]]
+    # Os registros originais não são alterados
+    assert list(REGISTROS[0]) == ["id", "nome", "tipos", "hp"]
+
+
+def test_selecionar_campos_ignora_ausentes_no_registro():
+    registros = [{"id": 1, "nome": "p1"}, {"id": 2}]
+    assert selecionar_campos(registros, ["id", "nome"]) == [{"id": 1, "nome": "p1"}, {"id": 2}]
+
+
+@pytest.mark.parametrize("pagina, esperada, ids", [
+    (1, 1, [1, 2, 3]),
+    (2, 2, [4, 5, 6]),
+    # Última página incompleta
+    (3, 3, [7]),
+    # Fora dos limites: ajustada para a primeira ou a última página
+    (0, 1, [1, 2, 3]),
+    (-4, 1, [1, 2, 3]),
+    (99, 3, [7]),
+])
+def test_paginar_limites(pagina, esperada, ids):
+    resultado = paginar(REGISTROS, pagina, 3)
+    assert resultado["pagina"] == esperada
+    assert resultado["tamanho_pagina"] == 3
+    assert resultado["total_paginas"] == 3
+    assert [registro["id"] for registro in resultado["data"]] == ids
+
+
+@pytest.mark.parametrize("tamanho_pagina", [None, 0, -1])
+def test_paginar_sem_tamanho_retorna_tudo(tamanho_pagina):
+    resultado = paginar(REGISTROS, 5, tamanho_pagina)
+    assert resultado == {"pagina": 1, "tamanho_pagina": 7, "total_paginas": 1, "data": REGISTROS}
+
+
+def test_paginar_lista_vazia():
+    assert paginar([], 3, 10) == {"pagina": 1, "tamanho_pagina": 10, "total_paginas": 1, "data": []}
+
+
+def test_paginas_exatas():
+    resultado = paginar(REGISTROS[:6], 2, 3)
+    assert resultado["total_paginas"] == 2
+    assert [registro["id"] for registro in resultado["data"]] == [4, 5, 6]
+
+
+@pytest.mark.parametrize("backend", ["json", "auto"])
+def test_dumps_compacto_e_sem_escapar_acentos(backend):
+    serializer = JsonSerializer(backend=backend)
+    objeto = {"nome": "Pokémon", "tipos": ["água"]}
+
+    compacto = serializer.dumps(objeto, compacto=True)
+    assert compacto == '{"nome":"Pokémon","tipos":["água"]}'
+    indentado = serializer.dumps(objeto)
+    assert "\n" in indentado and "Pokémon" in indentado
+    assert json.loads(indentado) == objeto
+
+
+def test_backend_desconhecido():
+    with pytest.raises(ValueError):
+        JsonSerializer(backend="yaml")
@@ -0,0 +1,93 @@
+"""Testes do repasse de mensagens do MCP entre workers."""
+import asyncio
+import json
+import os
+
+import anyio
+from mcp.server.sse import SseServerTransport
+
+from controllers.session_relay import SessionRelay
+
+PING = {"jsonrpc": "2.0", "id": 1, "method": "ping"}
+
+
+async def _post(relay: SessionRelay, session_id: str, corpo: dict):
+    """Faz ``POST /messages/`` na aplicação ASGI do relay e retorna (status, corpo)."""
+    body = json.dumps(corpo).encode()
+    scope = {
+        "type": "http", "method": "POST", "path": "/messages/", "raw_path": b"/messages/",
+        "query_string": f"session_id={session_id}".encode(),
+        "headers": [(b"content-type", b"application/json")],
+    }
+    resposta = {"status": None, "body": b""}
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            resposta["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            resposta["body"] += message.get("body", b"")
+
+    await relay.handle_post_message(scope, receive, send)
+    return resposta["status"], resposta["body"]
+
+
+def test_mensagem_repassada_ao_worker_dono(tmp_path):
+    async def cenario():
+        dono = SessionRelay(SseServerTransport("/messages/"), str(tmp_path), nome="dono")
+        outro = SessionRelay(SseServerTransport("/messages/"), str(tmp_path), nome="outro")
+        await dono.start()
+        await outro.start()
+
+        enviados = asyncio.Queue()
+        desconectar = asyncio.Event()
+
+        async def receive():
+            await desconectar.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            await enviados.put(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/sse", "query_string": b"", "headers": []}
+        resultado = {}
+        recebida = asyncio.Event()
+        try:
+            with anyio.fail_after(10):
+                async with anyio.create_task_group() as tg:
+                    async def sessao():
+                        async with dono.connect(scope, receive, send) as (leitura, _escrita):
+                            resultado["mensagem"] = await leitura.receive()
+                            recebida.set()
+                            await anyio.sleep_forever()
+
+                    tg.start_soon(sessao)
+
+                    # Evento endpoint com o ID da sessão, já registrada no disco
+                    session_id = None
+                    while session_id is None:
+                        message = await enviados.get()
+                        corpo = message.get("body", b"").decode()
+                        if "session_id=" in corpo:
+                            session_id = corpo.split("session_id=")[1].split()[0]
+                    resultado["registrada"] = os.path.exists(tmp_path / "sessions" / session_id)
+
+                    resultado["desconhecida"] = await _post(outro, "0" * 32, PING)
+                    resultado["repasse"] = await _post(outro, session_id, PING)
+                    await recebida.wait()
+                    tg.cancel_scope.cancel()
+        finally:
+            desconectar.set()
+            await outro.stop()
+            await dono.stop()
+        resultado["removida"] = not os.path.exists(tmp_path / "sessions" / session_id)
+        return resultado
+
+    resultado = asyncio.run(cenario())
+    assert resultado["registrada"]
+    assert resultado["desconhecida"][0] == 404
+    assert resultado["repasse"] == (202, b"Accepted")
+    assert resultado["mensagem"].model_dump(exclude_none=True)["id"] == 1
+    assert resultado["removida"]
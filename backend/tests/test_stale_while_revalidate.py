@@ -0,0 +1,68 @@
+"""Testes do stale-while-revalidate na leitura de detalhes do DataExtractor."""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from controllers import memory_cache as memory_cache_module
+from controllers.data_extractor import _STALE_RETRY, DataExtractor
+from test_extract_stream import _pokemon
+
+URL = "https://pokeapi.co/api/v2/pokemon/1/"
+
+
+@pytest.fixture
+def extractor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    extractor = DataExtractor(stale_while_revalidate=True)
+    # Entrada já expirada no cache persistente, ainda dentro de hard_expiry
+    ttl = extractor.cache.ttl
+    extractor.cache.ttl = -60
+    extractor.cache.set("pokemon_details_1", {**_pokemon(1).to_record(), "etag": "v1"})
+    extractor.cache.ttl = ttl
+    return extractor
+
+
+def _avancar_memoria(monkeypatch, segundos: float):
+    """Adianta o relógio da camada em memória."""
+    monotonic = time.monotonic
+    monkeypatch.setattr(memory_cache_module, "time", SimpleNamespace(monotonic=lambda: monotonic() + segundos))
+
+
+def test_stale_fica_pouco_tempo_na_memoria_e_revalidacao_e_retentada(extractor, monkeypatch):
+    respostas = []
+
+    async def buscar(session, url, headers=None):
+        respostas.append(headers)
+        if len(respostas) == 1:
+            raise RuntimeError("PokeAPI indisponível")
+        return 304, None, {}
+
+    monkeypatch.setattr(extractor, "_fetch", buscar)
+
+    async def obter():
+        pokemon = await extractor._get_pokemon(None, URL)
+        await asyncio.gather(*extractor._revalidando.values())
+        return pokemon
+
+    async def cenario():
+        primeiro = await obter()
+        # Dentro de _STALE_RETRY a memória responde, sem nova revalidação
+        em_memoria = await obter()
+        _avancar_memoria(monkeypatch, _STALE_RETRY + 1)
+        segundo = await obter()
+        await extractor.close()
+        return primeiro, em_memoria, segundo
+
+    primeiro, em_memoria, segundo = asyncio.run(cenario())
+
+    assert primeiro == em_memoria == segundo == _pokemon(1)
+    # A revalidação que falhou foi retentada quando a entrada curta expirou
+    assert respostas == [{"If-None-Match": "v1"}, {"If-None-Match": "v1"}]
+    assert extractor.stale_stats["stale_served"] == 2
+    assert extractor.stale_stats["revalidation_errors"] == 1
+    # Revalidada (304), a entrada volta a valer pelo TTL normal
+    assert "1" in extractor.memory_cache
+    _avancar_memoria(monkeypatch, 2 * _STALE_RETRY)
+    assert "1" in extractor.memory_cache